@@ -0,0 +1,241 @@
+"""
+Uygulama Önbelleği (Cache)
+============================
+Hesaplaması pahalı, kullanıcıya özel yanıtlar (ör: portföy özeti) için
+byte tabanlı anahtar/değer önbelleği.
+
+Anahtarlar kullanıcının veri sürümünü ve piyasa fiyat sürümünü içerir
+(ör: "portfolio_summary:12:57:3"); veri veya fiyatlar değiştiğinde yeni
+sürüm yeni bir anahtara karşılık gelir. Yazma işlemleri ayrıca eski sürümün kaydını siler
+(write-through invalidation), böylece bellek boşa tutulmaz.
+
+Backend'ler (CACHE_BACKEND):
+    memory : Süreç içi LRU (varsayılan). Kayıt sayısı ve toplam byte
+             sınırını aşınca en az kullanılan kayıtlar atılır.
+    redis  : Birden fazla worker'ın paylaştığı Redis (`redis` paketi
+             ve REDIS_URL gerekir).
+"""
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import orjson
+
+from app.config import settings
+from app.logger import get_logger
+from app.metrics import REGISTRY
+
+try:  # Opsiyonel: paylaşımlı önbellek için Redis
+    import redis
+except ImportError:  # pragma: no cover - ortama bağlı
+    redis = None
+
+logger = get_logger(__name__)
+
+CACHE_REQUESTS_TOTAL = REGISTRY.counter(
+    "cache_requests_total",
+    "Önbellek okumaları (hit / miss)",
+    ("cache", "result"),
+)
+
+
+# ===========================================================================
+# BACKEND'LER
+# ===========================================================================
+
+class CacheBackend:
+    """Önbellek backend arayüzü: değerler her zaman bytes'tır."""
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:  # pragma: no cover - alt sınıflar uygular
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def clear(self) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    Kayıt sayısı ve toplam boyut sınırlı, süreç içi LRU önbellek.
+
+    Endpointler thread havuzunda çalıştığından işlemler kilitle korunur;
+    kilit altında sadece sözlük işlemleri yapılır.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        # Tek başına sınırı aşan değerler önbelleğe alınmaz
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+            self._entries[key] = value
+            self.size_bytes += len(value)
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+
+class RedisCache(CacheBackend):
+    """
+    Worker'lar arasında paylaşılan Redis önbelleği.
+
+    Bellek sınırı ve tahliye Redis tarafında (maxmemory / allkeys-lru)
+    yapılandırılır; kayıtlar ayrıca CACHE_TTL_SECONDS sonunda silinir.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "finans_takip:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis için `redis` paketi kurulmalıdır.")
+        self._client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(self.prefix + key, value, ex=self.ttl_seconds or None)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+@lru_cache
+def get_cache() -> CacheBackend:
+    """
+    Ayarlara göre önbellek backend'ini oluşturur (süreç başına bir kez).
+
+    Returns:
+        CacheBackend nesnesi
+    """
+    if settings.CACHE_BACKEND == "redis":
+        logger.info("🗄️  Önbellek: Redis")
+        return RedisCache(settings.REDIS_URL, settings.CACHE_TTL_SECONDS)
+    return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES)
+
+
+# ===========================================================================
+# ANAHTARLAR
+# ===========================================================================
+
+def summary_key(user_id: int, data_version: int, price_epoch: int = 0) -> str:
+    """Portföy özeti önbellek anahtarı (veri ve fiyat sürümüne bağlı)."""
+    return f"portfolio_summary:{user_id}:{data_version}:{price_epoch}"
+
+
+def latest_summary_key(user_id: int) -> str:
+    """
+    Kullanıcının en son hesaplanan portföy özeti (sürümden bağımsız).
+
+    Yazma işlemlerinde silinmez; stale-while-revalidate için kullanılır.
+    """
+    return f"portfolio_summary_latest:{user_id}"
+
+
+def dashboard_key(
+    user_id: int, data_version: int, price_epoch: int, recent: int, chart_points: int
+) -> str:
+    """Dashboard yanıtı önbellek anahtarı (veri/fiyat sürümü ve parametrelere bağlı)."""
+    return f"dashboard:{user_id}:{data_version}:{price_epoch}:{recent}:{chart_points}"
+
+
+def latest_dashboard_key(user_id: int, recent: int, chart_points: int) -> str:
+    """Kullanıcının en son hesaplanan dashboard yanıtı (sürümden bağımsız)."""
+    return f"dashboard_latest:{user_id}:{recent}:{chart_points}"
+
+
+def cache_get(key: str, cache_name: str) -> Optional[bytes]:
+    """Önbellekten okur ve hit/miss metriğini günceller."""
+    value = get_cache().get(key)
+    CACHE_REQUESTS_TOTAL.inc((cache_name, "miss" if value is None else "hit"))
+    return value
+
+
+# ===========================================================================
+# STALE-WHILE-REVALIDATE
+# ===========================================================================
+# "latest" kayıtları: sürümler + hesaplanma zamanı + JSON. Yazma işlemlerinde
+# silinmez; bayat yanıt kabul eden istemcilere güncel yanıt arka planda
+# hesaplanırken sunulur.
+
+# (veri sürümü, fiyat sürümü, hesaplanma zamanı)
+_LATEST_HEADER = struct.Struct("!qqd")
+
+
+def set_latest(key: str, data_version: int, price_epoch: int, payload: bytes) -> None:
+    """Sürümlerden bağımsız "en son hesaplanan" kaydını yazar."""
+    get_cache().set(key, _LATEST_HEADER.pack(data_version, price_epoch, time.time()) + payload)
+
+
+def get_stale(
+    key: str, data_version: int, price_epoch: int, max_stale: float
+) -> Optional[Tuple[bytes, float]]:
+    """
+    Önceki veri/fiyat sürümüne ait, max_stale saniyeden yeni JSON nesnesini
+    `stale: true` işaretiyle döndürür.
+
+    Returns:
+        (JSON bytes, yaş saniye) veya None
+    """
+    value = get_cache().get(key)
+    if value is None:
+        return None
+    version, epoch, computed_at = _LATEST_HEADER.unpack_from(value)
+    age = max(0.0, time.time() - computed_at)
+    if version > data_version or epoch > price_epoch or age > max_stale:
+        return None
+    if (version, epoch) == (data_version, price_epoch):
+        return None
+    content = orjson.loads(value[_LATEST_HEADER.size:])
+    content["stale"] = True
+    return orjson.dumps(content), age
@@ -0,0 +1,262 @@
+"""
+Yanıt Sıkıştırma (Compression)
+================================
+Accept-Encoding başlığına göre Brotli, zstd veya gzip ile yanıt sıkıştıran
+ASGI middleware.
+
+- Brotli (`brotli`) ve zstd (`zstandard`) paketleri opsiyoneldir; kurulu
+  değillerse sadece gzip kullanılır.
+- Sadece sıkıştırılabilir içerik tipleri (JSON, metin, CSV vb.) sıkıştırılır;
+  resim/zip gibi zaten sıkıştırılmış içerikler ve SSE akışları olduğu gibi geçer.
+- Tek parça yanıtlar COMPRESSION_MIN_SIZE byte'tan küçükse sıkıştırılmaz.
+- StreamingResponse yanıtları parça parça (flush ederek) sıkıştırılır;
+  istemci veriyi akış bitmeden almaya devam eder.
+- Sıkıştırılan yanıtların ETag'i zayıflatılır (W/"..."): sıkıştırılmış ve
+  ham gövde farklı byte dizileridir, aynı güçlü doğrulayıcıyı paylaşamaz.
+  If-None-Match zayıf karşılaştırma kullandığından koşullu GET etkilenmez.
+  304 yanıtları `Vary: Accept-Encoding` ile döner; istemci zayıf ETag ile
+  doğruladıysa (elindeki sıkıştırılmış temsil) 304'ün ETag'i de zayıftır.
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+
+try:  # Opsiyonel: Brotli
+    import brotli
+except ImportError:  # pragma: no cover - ortama bağlı
+    brotli = None
+
+try:  # Opsiyonel: Zstandard
+    import zstandard
+except ImportError:  # pragma: no cover - ortama bağlı
+    zstandard = None
+
+
+# Sıkıştırılabilir içerik tipleri (öneki eşleşenler)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+# Bu tipler asla sıkıştırılmaz (SSE olayları anında iletilmelidir)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> List[str]:
+    """Sunucunun desteklediği kodlamalar (tercih sırasına göre)."""
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Accept-Encoding başlığına göre kullanılacak kodlamayı seçer.
+
+    q=0 ile reddedilen kodlamalar seçilmez. Eşit kalitede sunucunun tercih
+    sırası (br > zstd > gzip) kullanılır.
+    """
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[token.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """İçerik tipi sıkıştırmaya uygun mu?"""
+    content_type = content_type.lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+# ===========================================================================
+# KODLAYICILAR (ENCODERS)
+# ===========================================================================
+
+class _StreamEncoder:
+    """Parça parça sıkıştırma: her parça flush edilerek hemen gönderilebilir."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(
+                level=settings.COMPRESSION_ZSTD_LEVEL
+            ).compressobj()
+        else:
+            # wbits=31: gzip başlığıyla deflate
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_body(encoding: str, body: bytes) -> bytes:
+    """Tek parça gövdeyi sıkıştırır."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+# ===========================================================================
+# MIDDLEWARE
+# ===========================================================================
+
+def _mark_encoded(headers: MutableHeaders, weaken: bool = True) -> None:
+    """Kodlamaya göre değişen yanıt: ETag zayıflatılır, Vary eklenir."""
+    etag = headers.get("etag")
+    if weaken and etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+    headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """Accept-Encoding ile anlaşarak yanıtları sıkıştıran ASGI middleware."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+        self.supported = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.supported) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        # Zayıf ETag ile doğrulayan istemcinin elinde sıkıştırılmış temsil vardır
+        responder.weak_validator = (
+            request_headers.get("if-none-match", "").lstrip().startswith("W/")
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Tek bir yanıtın başlık ve gövde mesajlarını sıkıştırarak iletir."""
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.passthrough = False
+        self.encoder: Optional[_StreamEncoder] = None
+        self.weak_validator = False
+
+    async def send(self, message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Gövdenin ilk parçası gelene kadar başlıkları beklet
+            self.start_message = message
+            if message["status"] == 304:
+                # Gövdesiz; istemcinin elindeki (sıkıştırılmış) temsili doğrular
+                _mark_encoded(MutableHeaders(raw=message["headers"]), self.weak_validator)
+                self.passthrough = True
+                return
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body:
+                # Tek parça yanıt: eşik altındaysa sıkıştırma
+                if len(body) < self.minimum_size:
+                    self.passthrough = True
+                    await self._flush_start()
+                    await self._send(message)
+                    return
+                compressed = compress_body(self.encoding, body)
+                headers = MutableHeaders(raw=self.start_message["headers"])
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(compressed))
+                _mark_encoded(headers)
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Akış (StreamingResponse): parça parça sıkıştır
+            self.encoder = _StreamEncoder(self.encoding)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            _mark_encoded(headers)
+            if "content-length" in headers:
+                del headers["content-length"]
+            await self._flush_start()
+
+        chunk = self.encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self._send(self.start_message)
+            self.start_message = None
@@ -39,6 +39,76 @@ class Settings:
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
+    # Şema Yönetimi
+    # true ise başlangıçta bekleyen migration'lar otomatik uygulanır.
+    # Production'da `python -m app.migrations` ayrı bir adım olarak çalıştırılmalıdır.
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "false").lower() == "true"
+
+    # Logging
+    # Varsayılan seviye: production'da INFO, diğer ortamlarda DEBUG
+    LOG_LEVEL: str = os.getenv(
+        "LOG_LEVEL",
+        "INFO" if os.getenv("ENVIRONMENT", "development") == "production" else "DEBUG",
+    ).upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()          # text / json
+    LOG_ROTATION: str = os.getenv("LOG_ROTATION", "size").lower()      # size / time
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    # Gürültülü logger'lar için örnekleme: "logger.adi=0.1,diger.logger=0.5"
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
+
+    # Yanıt Sıkıştırma (gzip, varsa Brotli / zstd)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # byte
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # İstek Profilleme (ikisi de kapalıysa profilleme middleware'i eklenmez)
+    # PROFILE_SAMPLE_RATE: Rastgele profillenecek isteklerin oranı (0.0 - 1.0)
+    # PROFILE_ADMIN_TOKEN: `X-Profile-Token` başlığıyla istek bazında profilleme
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_ADMIN_TOKEN: str = os.getenv("PROFILE_ADMIN_TOKEN", "")
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+    # Önbellek (portföy özeti vb.)
+    # memory: süreç içi LRU / redis: worker'lar arasında paylaşımlı
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))  # Sadece redis
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Stale-while-revalidate: `Cache-Control: max-stale` gönderen istemcilere
+    # en fazla bu kadar (saniye) eski özet/dashboard sunulabilir (0: kapalı)
+    SUMMARY_MAX_STALE_SECONDS: int = int(os.getenv("SUMMARY_MAX_STALE_SECONDS", "300"))
+
+    # Toplu İstek (POST /api/batch)
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+    # Değişiklik olayları (GET /api/events): ping aralığı (saniye)
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+    # Piyasa fiyatları: süreç içi fiyat önbelleğinin veritabanındaki fiyat
+    # sürümünü (epoch) en fazla bu aralıkla (saniye) kontrol etmesi
+    PRICE_CACHE_TTL_SECONDS: float = float(os.getenv("PRICE_CACHE_TTL_SECONDS", "5"))
+
+    # Gün içi fiyat akışı (python -m app.services.tick_service)
+    TICK_QUEUE_SIZE: int = int(os.getenv("TICK_QUEUE_SIZE", "64"))                # tick grubu
+    TICK_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("TICK_FLUSH_INTERVAL_SECONDS", "5"))
+    TICK_MAX_PENDING_BARS: int = int(os.getenv("TICK_MAX_PENDING_BARS", "50000"))
+
+    # Sütunsal fiyat geçmişi deposu (python -m app.history_store)
+    PRICE_HISTORY_DIR: str = os.getenv("PRICE_HISTORY_DIR", "data/price_history")
+
+    # Günlük portföy anlık görüntüleri: yazma işleminden bu kadar saniye
+    # sonra (yeni yazmalar süreyi uzatır) eksik günler oluşturulur; 0 ise
+    # sadece gece çalışan komutla (python -m app.services.snapshot_service build)
+    SNAPSHOT_DEBOUNCE_SECONDS: float = float(os.getenv("SNAPSHOT_DEBOUNCE_SECONDS", "60"))
+
+    # Risk analizi: beta için karşılaştırma endeksi (fiyat geçmişi deposundaki kod)
+    RISK_BENCHMARK_SYMBOL: str = os.getenv("RISK_BENCHMARK_SYMBOL", "XU100").upper()
+
     def __init__(self):
         """Settings validasyonu"""
         # Production'da SECRET_KEY zorunlu
@@ -6,6 +6,7 @@ Tüm veritabanı işlemleri bu modül üzerinden yönetilir.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.config import settings
@@ -46,6 +47,27 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+# ---------------------------------------------------------------------------
+# Toplu Upsert
+# ---------------------------------------------------------------------------
+def dialect_insert(db, table):
+    """
+    Oturumun veritabanına uygun, ON CONFLICT destekli INSERT ifadesi.
+
+    PostgreSQL ve SQLite `insert(...).on_conflict_do_update(...)` ile
+    aynı upsert sözdizimini destekler.
+
+    Kullanım:
+        statement = dialect_insert(db, Model.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=[...], set_={"col": statement.excluded.col},
+        )
+        db.execute(statement, rows)
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+
 # ---------------------------------------------------------------------------
 # Dependency: Veritabanı Oturumu
 # ---------------------------------------------------------------------------
@@ -0,0 +1,117 @@
+"""
+Olay Yayını (Pub/Sub)
+=======================
+Kullanıcının işlemleri değiştiğinde açık istemcilere küçük bir değişiklik
+olayı iletir (GET /api/events, Server-Sent Events).
+
+- Yazma işlemleri (thread havuzunda) `hub.publish(...)` çağırır; olay her
+  abonenin event loop'una `call_soon_threadsafe` ile aktarılır.
+- Her abonenin sınırlı bir kuyruğu vardır. Kuyruk dolarsa (yavaş istemci)
+  bekleyen olaylar atılır ve tek bir "resync" olayı gönderilir; istemci bu
+  durumda verisini baştan yükler.
+- Hub süreç içidir: birden fazla worker çalıştırıldığında her istemci
+  bağlı olduğu worker'daki yazmaları alır.
+"""
+
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+from app.metrics import REGISTRY
+
+# Abone başına bekleyen en fazla olay
+DEFAULT_QUEUE_SIZE = 100
+
+EVENT_SUBSCRIBERS = REGISTRY.gauge(
+    "event_stream_subscribers",
+    "Açık olay akışı (SSE) bağlantıları",
+)
+EVENTS_PUBLISHED_TOTAL = REGISTRY.counter(
+    "events_published_total",
+    "Yayınlanan değişiklik olayları",
+    ("type",),
+)
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """Tek bir istemci bağlantısının olay kuyruğu."""
+
+    def __init__(self, hub: "EventHub", user_id: int, queue_size: int):
+        self.hub = hub
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=queue_size)
+
+    def _deliver(self, event: dict) -> None:
+        """Olayı kuyruğa ekler (abonenin event loop'unda çalışır)."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Yavaş istemci: birikmiş olaylar yerine tek bir resync gönder
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self, timeout: float) -> dict:
+        """Sıradaki olayı bekler; süre dolarsa asyncio.TimeoutError."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """Kullanıcı bazında abonelikleri tutan süreç içi yayın merkezi."""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """
+        Kullanıcının olaylarına abone olur (event loop içinden çağrılmalı).
+
+        Returns:
+            Subscription nesnesi (bağlantı kapanınca close() çağrılmalı)
+        """
+        subscription = Subscription(self, user_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, []).append(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id, [])
+            if subscription not in subscriptions:
+                return
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+        EVENT_SUBSCRIBERS.dec()
+
+    def subscriber_count(self, user_id: int) -> int:
+        return len(self._subscribers.get(user_id, ()))
+
+    def publish(self, user_id: int, event: dict) -> None:
+        """
+        Olayı kullanıcının tüm açık bağlantılarına iletir.
+
+        Herhangi bir thread'den çağrılabilir; abone yoksa hiçbir şey yapmaz.
+        """
+        with self._lock:
+            subscriptions: Tuple[Subscription, ...] = tuple(self._subscribers.get(user_id, ()))
+        EVENTS_PUBLISHED_TOTAL.inc((event.get("type", ""),))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Event loop kapanmış (uygulama kapanıyor)
+                self.unsubscribe(subscription)
+
+
+# Uygulama genelinde paylaşılan hub
+hub = EventHub()
@@ -0,0 +1,545 @@
+"""
+Fiyat Geçmişi Deposu (Sütunsal, Memory-Mapped)
+================================================
+Yıllara yayılan günlük fiyat geçmişini ORM yerine hisse başına sabit
+genişlikli ikili sütun dosyalarında tutar ve `numpy.memmap` ile okur.
+Grafikler ve risk hesapları tarih aralığı dilimlerini kopyalamadan
+(zero-copy) alır; sadece dokunulan sayfalar diskten okunur.
+
+Dizin yapısı (PRICE_HISTORY_DIR):
+    THYAO/
+        date.i8     int64   1970-01-01'den beri gün (artan, benzersiz)
+        open.f8     float64
+        high.f8     float64
+        low.f8      float64
+        close.f8    float64
+        volume.f8   float64
+        index.i8    int64   (ay numarası, ilk satır) çiftleri - seyrek tarih indeksi
+        tail/       sırası bozuk veya düzeltme kayıtları (aynı sütunlar)
+    .generation     her yazımda artan sayaç (önbellek anahtarları ve ETag için)
+
+- Ana segment sadece sona eklenir. Yeni kayıtların hepsi son tarihten
+  sonraysa doğrudan ana segmente yazılır (günlük ekleme).
+- Geçmişe dönük veya mevcut bir günü düzelten kayıtlar `tail/` segmentine
+  eklenir. Tail boş değilken okumalar iki segmenti birleştirir (kopya).
+- `compact()` tail'i ana segmentle birleştirir (aynı gün için son yazılan
+  geçerlidir), dosyaları yeni bir dizinde yazıp yerine koyar ve indeksi
+  yeniden oluşturur.
+
+Tek yazıcı varsayılır (CLI / alım süreci); okuyucular birden fazla
+süreçte çalışabilir. Yarım kalmış bir ekleme sonrası satır sayısı en kısa
+sütundan belirlenir.
+
+Çalıştırma:
+    python -m app.history_store import-csv gecmis.csv   # date,stock_symbol,open,high,low,close,volume
+    python -m app.history_store import-bars             # price_bars tablosundaki 1d çubukları
+    python -m app.history_store compact                 # tüm hisselerin tail'lerini birleştir
+"""
+
+import csv
+import os
+import shutil
+import sys
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+DATE_COLUMN = "date"
+VALUE_COLUMNS = ("open", "high", "low", "close", "volume")
+_DTYPES = {DATE_COLUMN: np.dtype("<i8"), **{name: np.dtype("<f8") for name in VALUE_COLUMNS}}
+_SUFFIX = {"i": ".i8", "f": ".f8"}
+_INDEX_FILE = "index.i8"
+_TAIL_DIR = "tail"
+_GENERATION_FILE = ".generation"
+
+# Sütun adı -> dizi (tarih sütunu datetime64[D] olarak)
+Columns = Dict[str, np.ndarray]
+
+
+def _column_file(directory: Path, name: str) -> Path:
+    return directory / (name + _SUFFIX[_DTYPES[name].kind])
+
+
+def _to_days(values) -> np.ndarray:
+    """date / datetime64 / ISO metin dizisini gün sayısına (int64) çevirir."""
+    return np.asarray(values, dtype="datetime64[D]").astype("<i8")
+
+
+def _month_of(days: np.ndarray) -> np.ndarray:
+    """Gün sayılarından ay numarası (1970-01 = 0)."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype("<i8")
+
+
+def _build_index(days: np.ndarray, offset: int = 0) -> np.ndarray:
+    """Sıralı günlerden (ay, ilk satır) çiftleri."""
+    if not len(days):
+        return np.empty((0, 2), dtype="<i8")
+    months = _month_of(days)
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    return np.column_stack([months[starts], starts + offset]).astype("<i8")
+
+
+class _Segment:
+    """Bir dizindeki sütun dosyalarının memmap görünümü."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.rows = self._row_count()
+        self.columns: Dict[str, np.ndarray] = {}
+        if self.rows:
+            for name in _DTYPES:
+                self.columns[name] = np.memmap(
+                    _column_file(directory, name), dtype=_DTYPES[name], mode="r", shape=(self.rows,)
+                )
+
+    def _row_count(self) -> int:
+        counts = []
+        for name, dtype in _DTYPES.items():
+            path = _column_file(self.directory, name)
+            counts.append(path.stat().st_size // dtype.itemsize if path.exists() else 0)
+        # Yarım kalmış eklemeye karşı en kısa sütun esas alınır
+        return min(counts)
+
+    def signature(self) -> int:
+        return self._row_count()
+
+
+class PriceHistoryStore:
+    """
+    Hisse başına sütunsal fiyat geçmişi.
+
+    Args:
+        root: Depo dizini
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._write_lock = threading.Lock()
+        # hisse -> (ana segment, tail segment, indeks)
+        self._open: Dict[str, Tuple[_Segment, _Segment, np.ndarray]] = {}
+
+    # -----------------------------------------------------------------------
+    # Okuma
+    # -----------------------------------------------------------------------
+
+    def symbols(self) -> List[str]:
+        """Depodaki hisse kodları."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def generation(self) -> int:
+        """Depo sürümü: her ekleme ve birleştirmede artar."""
+        try:
+            return int((self.root / _GENERATION_FILE).read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _bump_generation(self) -> None:
+        path = self.root / _GENERATION_FILE
+        staging = path.with_suffix(".tmp")
+        staging.write_text(str(self.generation() + 1))
+        os.replace(staging, path)
+
+    def _segments(self, symbol: str) -> Tuple[_Segment, _Segment, np.ndarray]:
+        """Açık memmap'leri döndürür; dosyalar büyümüşse yeniden açar."""
+        directory = self.root / symbol
+        cached = self._open.get(symbol)
+        if cached is not None:
+            main, tail, _ = cached
+            if main.signature() == main.rows and tail.signature() == tail.rows:
+                return cached
+        main = _Segment(directory)
+        tail = _Segment(directory / _TAIL_DIR)
+        index_path = directory / _INDEX_FILE
+        index = (
+            np.fromfile(index_path, dtype="<i8").reshape(-1, 2)
+            if index_path.exists() else _build_index(np.empty(0, dtype="<i8"))
+        )
+        if main.rows:
+            days = main.columns[DATE_COLUMN]
+            last_month = _month_of(days[-1:])[0]
+            if not len(index) or index[-1, 1] >= main.rows or index[-1, 0] != last_month:
+                # İndeks eksik (yarım kalmış ekleme): bellekte yeniden oluştur
+                index = _build_index(np.asarray(days))
+        self._open[symbol] = (main, tail, index)
+        return main, tail, index
+
+    def _row_range(
+        self, days: np.ndarray, index: np.ndarray, start: Optional[int], end: Optional[int]
+    ) -> Tuple[int, int]:
+        """
+        [start, end] günlerinin ana segmentteki satır aralığı.
+
+        Seyrek indeks aramayı ilgili aylara daraltır; ikili arama sadece o
+        satırlara (ve onların sayfalarına) dokunur.
+        """
+        total = len(days)
+        months, offsets = index[:, 0], index[:, 1]
+
+        def window(day: int) -> Tuple[int, int]:
+            month = int(_month_of(np.array([day]))[0])
+            position = int(np.searchsorted(months, month, side="left"))
+            if position < len(months) and months[position] == month:
+                following = int(offsets[position + 1]) if position + 1 < len(offsets) else total
+                return int(offsets[position]), following
+            # Ay depoda yok: aralık sonraki ayın ilk satırında başlar/biter
+            boundary = int(offsets[position]) if position < len(offsets) else total
+            return boundary, boundary
+
+        first, last = 0, total
+        if start is not None:
+            low, high = window(start)
+            first = low + int(np.searchsorted(days[low:high], start, side="left"))
+        if end is not None:
+            low, high = window(end)
+            last = low + int(np.searchsorted(days[low:high], end, side="right"))
+        return first, max(first, last)
+
+    def read(
+        self, symbol: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Columns:
+        """
+        Hissenin [start, end] aralığındaki geçmişi.
+
+        Tail boşsa dönen diziler memmap dilimleridir (kopya yok, salt
+        okunur); değilse iki segment birleştirilip kopyalanır.
+
+        Args:
+            symbol: Hisse kodu
+            start: İlk gün (dahil, None: baştan)
+            end: Son gün (dahil, None: sona kadar)
+
+        Returns:
+            {"date": datetime64[D], "open", "high", "low", "close", "volume"}
+        """
+        symbol = symbol.upper()
+        if not (self.root / symbol).exists():
+            return _empty_columns()
+        main, tail, index = self._segments(symbol)
+        start_day = int(_to_days([start])[0]) if start is not None else None
+        end_day = int(_to_days([end])[0]) if end is not None else None
+
+        if main.rows:
+            first, last = self._row_range(main.columns[DATE_COLUMN], index, start_day, end_day)
+            result = {name: column[first:last] for name, column in main.columns.items()}
+        else:
+            result = {name: np.empty(0, dtype=dtype) for name, dtype in _DTYPES.items()}
+
+        if tail.rows:
+            days = tail.columns[DATE_COLUMN]
+            mask = np.ones(tail.rows, dtype=bool)
+            if start_day is not None:
+                mask &= days >= start_day
+            if end_day is not None:
+                mask &= days <= end_day
+            if mask.any():
+                result = _merge(result, {name: col[mask] for name, col in tail.columns.items()})
+
+        result[DATE_COLUMN] = result[DATE_COLUMN].view("datetime64[D]")
+        return result
+
+    def aligned_closes(
+        self, symbols: Sequence[str], start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Birden fazla hissenin kapanışları ortak gün ekseninde.
+
+        Eksen, hisselerden en az birinin kapanışı olan günlerdir. Bir hissenin
+        o gün kapanışı yoksa önceki kapanışı taşınır; ilk kapanışından önce NaN.
+
+        Returns:
+            (günler datetime64[D], (gün x hisse) kapanış matrisi)
+        """
+        return align_closes([self.closes(symbol, start, end) for symbol in symbols])
+
+    def closes(
+        self, symbol: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Hissenin [start, end] aralığındaki kapanışı olan günler ve kapanışlar."""
+        history = self.read(symbol, start, end)
+        valid = ~np.isnan(history["close"])
+        return history[DATE_COLUMN][valid], np.asarray(history["close"][valid])
+
+    def last_date(self, symbol: str) -> Optional[date]:
+        """Hissenin en son günü (yoksa None)."""
+        dates = self.read(symbol)[DATE_COLUMN]
+        return dates[-1].item() if len(dates) else None
+
+    # -----------------------------------------------------------------------
+    # Yazma
+    # -----------------------------------------------------------------------
+
+    def append(self, symbol: str, dates: Sequence, values: Mapping[str, Sequence[float]]) -> int:
+        """
+        Kayıtları ekler.
+
+        Tüm kayıtlar ana segmentin son gününden sonraysa (ve tail boşsa)
+        doğrudan ana segmente, değilse tail'e yazılır.
+
+        Args:
+            symbol: Hisse kodu
+            dates: Günler (date, datetime64 veya "YYYY-MM-DD")
+            values: VALUE_COLUMNS sütunları (eksik sütunlar NaN)
+
+        Returns:
+            Eklenen satır sayısı
+        """
+        symbol = symbol.upper()
+        days = _to_days(dates)
+        if not len(days):
+            return 0
+        columns = {DATE_COLUMN: days}
+        for name in VALUE_COLUMNS:
+            column = values.get(name)
+            columns[name] = (
+                np.full(len(days), np.nan) if column is None
+                else np.asarray(column, dtype="<f8")
+            )
+            if len(columns[name]) != len(days):
+                raise ValueError(f"'{name}' sütunu {len(days)} satır olmalı")
+
+        with self._write_lock:
+            directory = self.root / symbol
+            directory.mkdir(parents=True, exist_ok=True)
+            main, tail, index = self._segments(symbol)
+            last_day = main.columns[DATE_COLUMN][-1] if main.rows else None
+            ordered = bool(np.all(days[1:] > days[:-1]))
+
+            if not tail.rows and ordered and (last_day is None or days[0] > last_day):
+                _write_columns(directory, columns)
+                new_index = _build_index(days, offset=main.rows)
+                if len(index) and len(new_index) and new_index[0, 0] == index[-1, 0]:
+                    new_index = new_index[1:]  # Ay zaten indekste
+                with (directory / _INDEX_FILE).open("ab") as handle:
+                    handle.write(new_index.tobytes())
+            else:
+                (directory / _TAIL_DIR).mkdir(exist_ok=True)
+                _write_columns(directory / _TAIL_DIR, columns)
+            self._open.pop(symbol, None)
+            self._bump_generation()
+        return len(days)
+
+    def compact(self, symbol: str) -> int:
+        """
+        Tail'i ana segmentle birleştirir ve hisse dizinini yeniden yazar.
+
+        Yeni dosyalar geçici bir dizinde oluşturulur ve dizin yer
+        değiştirilerek yerine konur; açık memmap'ler eski dosyaları
+        okumaya devam eder.
+
+        Returns:
+            Birleştirilen tail satırı sayısı (0: iş yapılmadı)
+        """
+        symbol = symbol.upper()
+        with self._write_lock:
+            directory = self.root / symbol
+            if not directory.exists():
+                return 0
+            main, tail, _ = self._segments(symbol)
+            if not tail.rows:
+                return 0
+            merged = _merge(
+                {name: np.asarray(col) for name, col in main.columns.items()} if main.rows
+                else {name: np.empty(0, dtype=dtype) for name, dtype in _DTYPES.items()},
+                {name: np.asarray(col) for name, col in tail.columns.items()},
+            )
+
+            staging = self.root / f".{symbol}.compact"
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir(parents=True)
+            _write_columns(staging, merged)
+            _build_index(merged[DATE_COLUMN]).tofile(staging / _INDEX_FILE)
+
+            retired = self.root / f".{symbol}.old"
+            shutil.rmtree(retired, ignore_errors=True)
+            os.replace(directory, retired)
+            os.replace(staging, directory)
+            shutil.rmtree(retired, ignore_errors=True)
+            self._open.pop(symbol, None)
+            self._bump_generation()
+
+        logger.info(f"🗜️  {symbol}: {tail.rows} satır birleştirildi ({len(merged[DATE_COLUMN])} gün)")
+        return tail.rows
+
+    def compact_all(self) -> int:
+        """Tüm hisseleri birleştirir; birleştirilen toplam satırı döndürür."""
+        return sum(self.compact(symbol) for symbol in self.symbols())
+
+
+def align_closes(series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (günler, kapanışlar) serilerini ortak gün ekseninde matrise dizer.
+
+    Eksen, serilerden en az birinde bulunan günlerdir; eksik günlerde
+    önceki kapanış taşınır, serinin ilk gününden önce NaN.
+    """
+    days = (
+        np.unique(np.concatenate([dates for dates, _ in series]))
+        if series else np.empty(0, dtype="datetime64[D]")
+    )
+    matrix = np.full((len(days), len(series)), np.nan)
+    for column, (dates, closes) in enumerate(series):
+        position = np.searchsorted(dates, days, side="right") - 1
+        found = position >= 0
+        matrix[found, column] = closes[position[found]]
+    return days, matrix
+
+
+def _empty_columns() -> Columns:
+    columns = {name: np.empty(0, dtype=dtype) for name, dtype in _DTYPES.items()}
+    columns[DATE_COLUMN] = columns[DATE_COLUMN].view("datetime64[D]")
+    return columns
+
+
+def _write_columns(directory: Path, columns: Mapping[str, np.ndarray]) -> None:
+    """Sütunları dosyaların sonuna ekler (tarih sütunu en son yazılır)."""
+    for name in VALUE_COLUMNS + (DATE_COLUMN,):
+        with _column_file(directory, name).open("ab") as handle:
+            handle.write(np.ascontiguousarray(columns[name], dtype=_DTYPES[name]).tobytes())
+
+
+def _merge(older: Mapping[str, np.ndarray], newer: Mapping[str, np.ndarray]) -> Columns:
+    """
+    İki kayıt kümesini güne göre sıralar; aynı gün için `newer` ve onun
+    içinde en son yazılan kayıt geçerlidir.
+    """
+    days = np.concatenate([
+        np.asarray(older[DATE_COLUMN]).view("<i8"), np.asarray(newer[DATE_COLUMN]).view("<i8")
+    ])
+    # Ters çevrilmiş sırada ilk görülen = en son yazılan
+    reversed_days = days[::-1]
+    _, first = np.unique(reversed_days, return_index=True)
+    keep = len(days) - 1 - first          # np.unique günleri artan sırada verir
+    return {
+        name: np.concatenate([np.asarray(older[name]), np.asarray(newer[name])])[keep]
+        .astype(_DTYPES[name], copy=False)
+        for name in _DTYPES
+    }
+
+
+# Uygulama genelinde paylaşılan depo
+history_store = PriceHistoryStore(Path(settings.PRICE_HISTORY_DIR))
+
+
+# ===========================================================================
+# İÇE AKTARMA
+# ===========================================================================
+
+def import_csv(store: PriceHistoryStore, path: Path) -> int:
+    """
+    date,stock_symbol,open,high,low,close,volume CSV dosyasını ekler.
+
+    Returns:
+        Eklenen satır sayısı
+    """
+    rows: Dict[str, List[dict]] = {}
+    with path.open(newline="", encoding="utf-8-sig") as feed:
+        for record in csv.DictReader(feed):
+            rows.setdefault(record["stock_symbol"].strip().upper(), []).append(record)
+
+    total = 0
+    for symbol, records in rows.items():
+        records.sort(key=lambda record: record["date"])
+        total += store.append(
+            symbol,
+            [record["date"] for record in records],
+            {
+                name: [float(record[name]) if record.get(name) else np.nan for record in records]
+                for name in VALUE_COLUMNS
+            },
+        )
+    return total
+
+
+def import_daily_bars(store: PriceHistoryStore, db, now: Optional[datetime] = None) -> int:
+    """
+    price_bars tablosundaki 1d çubuklarından, depodaki son günden sonraki
+    günleri ekler.
+
+    Kapanış seansı henüz bitmemiş günün çubuğu kısmidir ve atlanır (bir
+    sonraki içe aktarmada eklenir). Depodaki son gün, çubuğu o günden sonra
+    değiştiyse (geç gelen tick'ler) tekrar yazılır; ana segmentteki bir günü
+    düzelttiğinden tail'e eklenir ve `compact()` ile birleşir.
+
+    Args:
+        store: Fiyat geçmişi deposu
+        db: Veritabanı oturumu
+        now: Şu an (varsayılan: UTC saat)
+
+    Returns:
+        Eklenen satır sayısı
+    """
+    from app.models.price_bar import BarInterval, PriceBar
+    from app.services.tick_service import MARKET_CLOSE_SECONDS, MARKET_UTC_OFFSET_SECONDS
+
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is not None:
+        now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    # Çubuk başlangıcı İstanbul gece yarısıdır (UTC 21:00, önceki gün)
+    offset = np.timedelta64(MARKET_UTC_OFFSET_SECONDS, "s")
+    # Bu andan önce başlayan çubukların günü kapanmıştır
+    closed_before = np.datetime64(now, "s") - np.timedelta64(MARKET_CLOSE_SECONDS, "s")
+
+    total = 0
+    symbols = [s for (s,) in db.query(PriceBar.stock_symbol).distinct()]
+    for symbol in symbols:
+        bars = (
+            db.query(PriceBar)
+            .filter(PriceBar.stock_symbol == symbol, PriceBar.interval == BarInterval.DAY)
+            .order_by(PriceBar.bucket_start)
+            .all()
+        )
+        history = store.read(symbol)
+        last = history[DATE_COLUMN][-1] if len(history[DATE_COLUMN]) else None
+        stored_last = {name: history[name][-1] for name in VALUE_COLUMNS} if last is not None else {}
+
+        new = []
+        for bar in bars:
+            start = np.datetime64(bar.bucket_start, "s")
+            if start > closed_before:
+                continue  # Gün henüz kapanmadı
+            day = (start + offset).astype("datetime64[D]")
+            if last is None or day > last:
+                new.append((day, bar))
+            elif day == last and any(
+                not np.isclose(getattr(bar, name), stored_last[name], equal_nan=True)
+                for name in VALUE_COLUMNS
+            ):
+                new.append((day, bar))  # Son gün değişti: düzeltme
+        if new:
+            total += store.append(symbol, [day for day, _ in new], {
+                name: [getattr(bar, name) for _, bar in new] for name in VALUE_COLUMNS
+            })
+    return total
+
+
+def main(argv: List[str]) -> int:
+    """Komut satırı giriş noktası."""
+    command = argv[0] if argv else ""
+    if command == "import-csv" and len(argv) > 1:
+        count = import_csv(history_store, Path(argv[1]))
+    elif command == "import-bars":
+        from app.database import SessionLocal
+
+        with SessionLocal() as db:
+            count = import_daily_bars(history_store, db)
+    elif command == "compact":
+        count = history_store.compact_all()
+    else:
+        print("Kullanım: python -m app.history_store import-csv <dosya> | import-bars | compact")
+        return 2
+    print(f"✅ {count} satır işlendi ({history_store.root})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
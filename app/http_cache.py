@@ -0,0 +1,98 @@
+"""
+HTTP Önbellek Yardımcıları (ETag / Conditional GET)
+=====================================================
+Kullanıcının veri sürümünden (users.data_version) güçlü ETag'ler üretir
+ve If-None-Match başlığını, herhangi bir veri sorgusu çalışmadan önce
+yanıtlar.
+
+Veri sürümü portfolio_service içindeki her yazma işleminde artar; bu
+nedenle sürüm değişmediyse yanıt da değişmemiştir.
+
+İstemci `Cache-Control: max-stale[=saniye]` göndererek, sunucu tarafında
+hesaplanmakta olan güncel yanıt yerine önceki sürümün önbellekteki
+yanıtını kabul ettiğini bildirebilir (stale-while-revalidate).
+
+Kullanım (endpoint içinde):
+    etag = make_etag(current_user, "portfolio_summary")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    ...
+    return ORJSONResponse(content, headers=etag_headers(etag))
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+# Yanıt kullanıcıya özeldir; istemci her seferinde doğrulama yapmalıdır
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(user, *parts) -> str:
+    """
+    Kullanıcı, veri sürümü ve temsil parçalarından güçlü bir ETag üretir.
+
+    Args:
+        user: Mevcut kullanıcı (id ve data_version alanları)
+        *parts: Yanıtı belirleyen diğer değerler (ör: endpoint adı, sayfa no)
+
+    Returns:
+        Tırnak içinde ETag değeri, ör: "12-57-3f9a1c0b2d4e"
+    """
+    representation = "|".join(str(part) for part in parts)
+    digest = hashlib.blake2s(representation.encode("utf-8"), digest_size=6).hexdigest()
+    return f'"{user.id}-{user.data_version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu?"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    # If-None-Match zayıf karşılaştırma kullanır (W/ öneki yok sayılır)
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """200 yanıtlarına eklenecek önbellek başlıkları."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    İstemcinin elindeki sürüm güncelse 304 yanıtı döndürür.
+
+    Returns:
+        304 Response veya None (yanıt üretilmeli)
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    return None
+
+
+def requested_max_stale(request: Request, limit: float) -> float:
+    """
+    İstemcinin kabul ettiği en fazla bayatlık süresi (saniye).
+
+    `Cache-Control: max-stale=N` → min(N, limit), değersiz `max-stale` →
+    limit; başlık yoksa 0 (sadece güncel yanıt).
+
+    Args:
+        request: Gelen istek
+        limit: Sunucunun izin verdiği en fazla bayatlık (saniye)
+    """
+    for directive in request.headers.get("cache-control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name != "max-stale":
+            continue
+        if not value:
+            return limit
+        try:
+            return max(0.0, min(float(value.strip('"')), limit))
+        except ValueError:
+            return 0.0
+    return 0.0
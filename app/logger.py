@@ -2,19 +2,39 @@
 Logging Konfigürasyonu
 ========================
 Uygulamada tüm event'ler bu logger üzerinden kaydedilir.
+
+Kayıtlar istek thread'inde diske yazılmaz: "finans_takip" logger'ına
+yalnızca bir QueueHandler bağlıdır. Konsol ve dosya handler'ları arka
+plandaki QueueListener thread'inde çalışır. Import yan etkisizdir: thread
+`start_logging()` ile (uygulama lifespan'i veya ilk log kaydı) başlar,
+`stop_logging()` ile durur.
+
+Ayarlar (.env):
+    LOG_LEVEL        : DEBUG / INFO / WARNING ... (varsayılan: production'da INFO)
+    LOG_FORMAT       : text / json (json: her satır bir JSON nesnesi)
+    LOG_ROTATION     : size / time (boyut veya gece yarısı rotasyonu)
+    LOG_MAX_BYTES    : size rotasyonunda dosya başına en fazla byte
+    LOG_BACKUP_COUNT : Saklanacak eski dosya sayısı
+    LOG_SAMPLING     : Gürültülü logger'lar için örnekleme oranları
+                       (ör: "finans_takip.app.routers.transaction=0.1")
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, List, Optional
 
-# Log dosyası dizinini oluştur
-logs_dir = Path(__file__).parent.parent / "logs"
-logs_dir.mkdir(exist_ok=True)
+from app.config import settings
 
-# Logger oluştur
-logger = logging.getLogger("finans_takip")
-logger.setLevel(logging.DEBUG)
+# Log dosyası dizini (ilk log kaydında oluşturulur)
+logs_dir = Path(__file__).parent.parent / "logs"
 
 # Format: [ZAMAN] [LEVEL] [MODULE] - MESAJ
 formatter = logging.Formatter(
@@ -22,32 +42,208 @@ formatter = logging.Formatter(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-# Console Handler (stdout) - UTF-8 encoding for emoji support
-try:
-    # Windows compatibility: Use UTF-8 for console
-    import io
-    if sys.platform == 'win32':
-        console_handler = logging.StreamHandler(io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8'))
-    else:
-        console_handler = logging.StreamHandler(sys.stdout)
-except:
-    console_handler = logging.StreamHandler(sys.stdout)
-
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
-# File Handler (logs/app.log)
-file_handler = logging.FileHandler(logs_dir / "app.log", encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Hata logları için ayrı dosya (logs/errors.log)
-error_handler = logging.FileHandler(logs_dir / "errors.log", encoding="utf-8")
-error_handler.setLevel(logging.ERROR)
-error_handler.setFormatter(formatter)
-logger.addHandler(error_handler)
+
+# ===========================================================================
+# FORMATTER VE FİLTRELER
+# ===========================================================================
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık bir JSON nesnesine çevirir (JSON lines)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Gürültülü logger'ların kayıtlarının sadece bir kısmını geçirir.
+
+    WARNING ve üstü seviyeler her zaman geçer; örnekleme yalnızca
+    DEBUG/INFO kayıtlarına uygulanır. En uzun eşleşen logger adı kullanılır.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Uzun önekler önce denensin (ör: a.b.c, a.b'den önce)
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + "."):
+                return random.random() < rate
+        return True
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """"logger=oran,logger2=oran" formatındaki ayarı sözlüğe çevirir."""
+    rates: Dict[str, float] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+# ===========================================================================
+# HANDLER'LAR
+# ===========================================================================
+
+def _lazy_open(handler: logging.FileHandler):
+    """Dosyayı açmadan önce dizini oluşturur."""
+    Path(handler.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+    return logging.FileHandler._open(handler)
+
+
+class _LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Boyuta göre dönen ve dosyayı ilk kayıt yazılırken açan handler.
+
+    Import sırasında dizin oluşturma veya dosya açma yapılmaz.
+    """
+
+    def _open(self):
+        return _lazy_open(self)
+
+
+class _LazyTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Gece yarısı dönen ve dosyayı ilk kayıt yazılırken açan handler."""
+
+    def _open(self):
+        return _lazy_open(self)
+
+
+def _file_handler(filename: str) -> logging.Handler:
+    """Ayarlara göre boyut veya zaman tabanlı rotasyonlu dosya handler'ı."""
+    path = logs_dir / filename
+    if settings.LOG_ROTATION == "time":
+        return _LazyTimedRotatingFileHandler(
+            path, when="midnight", backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8", delay=True,
+        )
+    return _LazyRotatingFileHandler(
+        path, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8", delay=True,
+    )
+
+
+def _console_handler() -> logging.Handler:
+    """stdout handler - UTF-8 encoding for emoji support."""
+    try:
+        # Windows compatibility: Use UTF-8 for console
+        import io
+        if sys.platform == 'win32':
+            return logging.StreamHandler(io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8'))
+        return logging.StreamHandler(sys.stdout)
+    except Exception:
+        return logging.StreamHandler(sys.stdout)
+
+
+def build_handlers(log_format: str = "text") -> List[logging.Handler]:
+    """
+    Konsol, uygulama ve hata dosyası handler'larını oluşturur.
+
+    Args:
+        log_format: "text" veya "json"
+
+    Returns:
+        [konsol (INFO+), logs/app.log (tümü), logs/errors.log (ERROR+)]
+    """
+    active_formatter = JsonFormatter() if log_format == "json" else formatter
+
+    console_handler = _console_handler()
+    console_handler.setLevel(logging.INFO)
+
+    file_handler = _file_handler("app.log")
+    file_handler.setLevel(logging.DEBUG)
+
+    # Hata logları için ayrı dosya (logs/errors.log)
+    error_handler = _file_handler("errors.log")
+    error_handler.setLevel(logging.ERROR)
+
+    handlers = [console_handler, file_handler, error_handler]
+    for handler in handlers:
+        handler.setFormatter(active_formatter)
+    return handlers
+
+
+# ===========================================================================
+# KUYRUK TABANLI PIPELINE
+# ===========================================================================
+
+# Logger oluştur
+logger = logging.getLogger("finans_takip")
+logger.setLevel(settings.LOG_LEVEL)
+
+# İstek thread'i sadece kuyruğa ekler; yazma işi listener thread'indedir
+log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+# Listener import sırasında başlatılmaz: uygulama başlarken (lifespan) ya da
+# ilk log kaydında başlar, kapanışta durdurulur.
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+_atexit_registered = False
+
+
+def start_logging() -> logging.handlers.QueueListener:
+    """
+    Konsol/dosya handler'larını kuran QueueListener thread'ini başlatır.
+
+    Birden fazla çağrılabilir; listener zaten çalışıyorsa aynısını döndürür.
+    """
+    global _listener, _atexit_registered
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(
+                log_queue, *build_handlers(settings.LOG_FORMAT), respect_handler_level=True
+            )
+            _listener.start()
+            if not _atexit_registered:
+                atexit.register(stop_logging)
+                _atexit_registered = True
+        return _listener
+
+
+def stop_logging() -> None:
+    """Kuyruktaki kayıtları yazar, listener'ı durdurur ve handler'ları kapatır."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı kuyruğa ekler; listener henüz başlamadıysa başlatır."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        super().enqueue(record)
+        if _listener is None:
+            start_logging()
+
+
+queue_handler = _LazyQueueHandler(log_queue)
+if settings.LOG_SAMPLING:
+    queue_handler.addFilter(SamplingFilter(parse_sampling(settings.LOG_SAMPLING)))
+logger.addHandler(queue_handler)
 
 
 def get_logger(name: str) -> logging.Logger:
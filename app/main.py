@@ -2,9 +2,10 @@
 Finans Takip - Portföy Yönetim Sistemi
 ========================================
 Ana uygulama dosyası. FastAPI uygulamasını oluşturur,
-router'ları bağlar ve veritabanı tablolarını başlatır.
+router'ları bağlar ve başlangıçta şema sürümünü kontrol eder.
 
 Çalıştırma:
+    python -m app.migrations           # Şemayı oluştur/güncelle
     uvicorn app.main:app --reload --port 8000
 
 Swagger UI:
@@ -14,36 +15,63 @@ ReDoc:
     http://localhost:8000/redoc
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 
 from app.config import settings
-from app.database import engine, Base
-from app.logger import get_logger
-
-# Modelleri import et (tabloların oluşturulması için gerekli)
-from app.models.user import User          # noqa: F401
-from app.models.transaction import Transaction  # noqa: F401
+from app.logger import get_logger, start_logging, stop_logging
+from app.compression import CompressionMiddleware, available_encodings
+from app.metrics import CONTENT_TYPE_LATEST, REGISTRY, MetricsMiddleware
+from app import profiling
 
 # Router'ları import et
-from app.routers import auth, transaction
+from app.routers import auth, batch, dashboard, events, portfolio, transaction
 
 # Logger
 logger = get_logger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Veritabanı Tablolarını Oluştur
+# Uygulama Yaşam Döngüsü (Lifespan)
 # ---------------------------------------------------------------------------
-# Not: Production'da Alembic migration kullanılmalıdır.
-# Bu yöntem sadece geliştirme ortamı için uygundur.
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Veritabanı tabloları başarıyla oluşturuldu/kontrol edildi.")
-except Exception as e:
-    logger.error(f"❌ Veritabanı tablolarını oluştururken hata: {e}")
+# Not: Tablolar import sırasında oluşturulmaz. Şema yönetimi açık bir
+# migration adımıdır (`python -m app.migrations`); burada yalnızca ucuz bir
+# sürüm kontrolü yapılır.
+def _check_schema() -> None:
+    """Veritabanı şema sürümünü kontrol eder (gerekirse migration uygular)."""
+    from app.database import engine
+    from app.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+    try:
+        current = get_schema_version(engine)
+        if current == SCHEMA_VERSION:
+            logger.info(f"✅ Veritabanı şeması güncel (v{current}).")
+        elif settings.AUTO_MIGRATE:
+            current = run_migrations(engine)
+            logger.info(f"✅ Veritabanı şeması güncellendi (v{current}).")
+        else:
+            logger.error(
+                f"❌ Veritabanı şeması güncel değil (v{current}, beklenen v{SCHEMA_VERSION}). "
+                "Lütfen `python -m app.migrations` komutunu çalıştırın."
+            )
+    except Exception as e:
+        logger.error(f"❌ Veritabanı şema kontrolü başarısız: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Başlangıç ve kapanış işlemleri."""
+    start_logging()
+    logger.info(f"🚀 Uygulamada başlatıldı: {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info(f"📦 Ortam: {settings.ENVIRONMENT}")
+    _check_schema()
+    yield
+    # Kuyruktaki log kayıtlarını yaz ve listener thread'ini durdur
+    stop_logging()
 
 
 # ---------------------------------------------------------------------------
@@ -53,11 +81,11 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     docs_url="/docs",      # Swagger UI
     redoc_url="/redoc",    # ReDoc
+    lifespan=lifespan,
+    # Yanıtlar stdlib json yerine orjson ile kodlanır
+    default_response_class=ORJSONResponse,
 )
 
-logger.info(f"🚀 Uygulamada başlatıldı: {settings.APP_NAME} v{settings.APP_VERSION}")
-logger.info(f"📦 Ortam: {settings.ENVIRONMENT}")
-
 
 # ---------------------------------------------------------------------------
 # CORS Middleware
@@ -72,11 +100,39 @@ app.add_middleware(
 logger.debug("📋 CORS ayarları: origins=ALL (*)")
 
 
+# ---------------------------------------------------------------------------
+# Yanıt Sıkıştırma (Accept-Encoding: br / zstd / gzip)
+# ---------------------------------------------------------------------------
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+    logger.debug(f"🗜️  Sıkıştırma açık: {', '.join(available_encodings())}")
+
+
+# ---------------------------------------------------------------------------
+# Profilleme Middleware (sadece ayarlardan açıldıysa eklenir)
+# ---------------------------------------------------------------------------
+if profiling.is_enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+    logger.info(
+        f"🔬 İstek profilleme açık (örnekleme oranı: {settings.PROFILE_SAMPLE_RATE})"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Metrik Middleware (en dışta: tüm katmanların süresini ölçer)
+# ---------------------------------------------------------------------------
+app.add_middleware(MetricsMiddleware)
+
+
 # ---------------------------------------------------------------------------
 # Router'ları Bağla
 # ---------------------------------------------------------------------------
 app.include_router(auth.router)
 app.include_router(transaction.router)
+app.include_router(dashboard.router)
+app.include_router(batch.router)
+app.include_router(events.router)
+app.include_router(portfolio.router)
 logger.info("✅ Router'lar başarıyla bağlandı.")
 
 
@@ -125,6 +181,17 @@ def health_check():
     }
 
 
+@app.get(
+    "/metrics",
+    tags=["Genel"],
+    summary="Prometheus metrikleri",
+    response_class=PlainTextResponse,
+)
+def metrics():
+    """İstek sayısı, gecikme histogramı ve durum kodlarını Prometheus formatında döndürür."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 # ---------------------------------------------------------------------------
 # Global Exception Handler'lar
 # ---------------------------------------------------------------------------
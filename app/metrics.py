@@ -0,0 +1,284 @@
+"""
+Metrik Toplama (Prometheus)
+=============================
+İstek sayısı, gecikme histogramı, durum kodları ve eşzamanlı istek
+sayısını route şablonu bazında (ör: /api/transactions/{transaction_id})
+toplar ve Prometheus metin formatında sunar.
+
+Sıcak yolda (hot path) kilit kullanılmaz: her metrik değerlerini thread
+başına ayrı bir "shard" içinde tutar. Bir shard'a yalnızca kendi thread'i
+yazar; okuma (/metrics) sırasında tüm shard'lar toplanır.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus metin formatı sürümü
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Gecikme histogramı sınırları (saniye)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Eşleşmeyen yollar için tek bir etiket (kardinalite patlamasını önler)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    """Prometheus etiket değerini kaçışlar."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    """Etiketleri {name="value",...} formatına çevirir."""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    """Sayıyı Prometheus formatında yazar (tam sayılar ondalıksız)."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ===========================================================================
+# METRİK TİPLERİ
+# ===========================================================================
+
+class _Metric:
+    """Thread başına shard tutan metrik temel sınıfı."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # thread id -> {etiket değerleri -> değer}
+        self._shards: Dict[int, dict] = {}
+
+    def _shard(self) -> dict:
+        """Çağıran thread'in shard'ını döndürür (yoksa oluşturur)."""
+        tid = threading.get_ident()
+        shard = self._shards.get(tid)
+        if shard is None:
+            # dict.setdefault atomiktir; aynı thread için tek shard oluşur
+            shard = self._shards.setdefault(tid, {})
+        return shard
+
+    def _snapshot(self) -> Iterable[dict]:
+        """Tüm shard'ların anlık kopyası."""
+        return [dict(shard) for shard in list(self._shards.values())]
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def render(self) -> List[str]:  # pragma: no cover - alt sınıflar uygular
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç."""
+
+    type_name = "counter"
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        """Etiket bazında toplam değerler."""
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, value in sorted(self.values().items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            )
+        return lines
+
+
+class Gauge(Counter):
+    """Artıp azalabilen değer (ör: işlenmekte olan istek sayısı)."""
+
+    type_name = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Kova (bucket) tabanlı dağılım; p99 gibi yüzdelikler bundan hesaplanır."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [kova sayaçları (+Inf dahil), toplam, adet]
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def render(self) -> List[str]:
+        merged: Dict[LabelValues, list] = {}
+        for shard in self._snapshot():
+            for labels, (counts, total, count) in shard.items():
+                entry = merged.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+        lines = self._header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, (counts, total, count) in sorted(merged.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_number(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+# ===========================================================================
+# KAYIT (REGISTRY)
+# ===========================================================================
+
+class MetricsRegistry:
+    """Metrikleri tutar ve Prometheus metin formatında dışa aktarır."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrik zaten kayıtlı: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Uygulama genelinde tek registry
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "http_requests_total",
+    "Toplam HTTP istek sayısı.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP istek süresi (saniye).",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "Şu anda işlenmekte olan HTTP istek sayısı.",
+    ("method",),
+)
+
+
+# ===========================================================================
+# MIDDLEWARE
+# ===========================================================================
+
+def route_template(scope: dict) -> str:
+    """
+    İsteğin eşleştiği route şablonunu döndürür (ham path değil).
+
+    FastAPI, eşleşen route nesnesini scope["route"] içine yazar.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Her HTTP isteği için sayaç, gecikme ve durum kodu kaydeden ASGI middleware.
+
+    Saf ASGI olarak yazılmıştır; BaseHTTPMiddleware'in ek görev/kuyruk
+    maliyetini taşımaz.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc((method,))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec((method,))
+            route = route_template(scope)
+            HTTP_REQUESTS_TOTAL.inc((method, route, str(status_code)))
+            HTTP_REQUEST_DURATION.observe((method, route), elapsed)
@@ -0,0 +1,247 @@
+"""
+Veritabanı Şema Yönetimi (Migrations)
+=======================================
+Şema oluşturma ve güncelleme işlemlerini uygulama başlangıcından ayırır.
+Her worker yalnızca `schema_version` tablosundan tek bir satır okuyarak
+şemanın güncel olup olmadığını kontrol eder; tabloları yansıtma (reflect)
+ve oluşturma işi açık bir migration adımında yapılır.
+
+Çalıştırma:
+    python -m app.migrations            # Bekleyen adımları uygula
+    python -m app.migrations --check    # Sadece sürümü kontrol et
+"""
+
+import sys
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import Base
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Sürüm Tablosu
+# ---------------------------------------------------------------------------
+# Base.metadata'dan ayrı tutulur; böylece testlerdeki create_all/drop_all
+# çağrıları bu tabloya dokunmaz.
+_version_metadata = MetaData()
+
+schema_version_table = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# ===========================================================================
+# MIGRATION ADIMLARI
+# ===========================================================================
+# Her adım idempotent olmalıdır: kısmen uygulanmış bir şemada tekrar
+# çalıştırıldığında hata vermemelidir.
+
+def _create_base_schema(conn: Connection) -> None:
+    """İlk şema: users ve transactions tabloları."""
+    # Modelleri import et (Base.metadata'ya kaydolmaları için gerekli)
+    from app.models.user import User                # noqa: F401
+    from app.models.transaction import Transaction  # noqa: F401
+
+    Base.metadata.tables["users"].create(bind=conn, checkfirst=True)
+    Base.metadata.tables["transactions"].create(bind=conn, checkfirst=True)
+
+
+def _add_user_data_version(conn: Connection) -> None:
+    """users.data_version: ETag ve önbellek için kullanıcı veri sürümü."""
+    columns = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "data_version" not in columns:
+        conn.execute(text(
+            "ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"
+        ))
+
+
+def _add_transaction_changes(conn: Connection) -> None:
+    """
+    transaction_changes: değişiklik akışı (GET /api/transactions/changes).
+
+    Mevcut işlemler için "insert" kayıtları oluşturulur. Her kullanıcının
+    işlemlerine veri sürümünün üzerinden artan sıra numaraları verilir ve
+    veri sürümü son numaraya çekilir; böylece numaralar benzersiz kalır.
+    """
+    from app.models.transaction_change import ChangeOp, TransactionChange
+
+    table = TransactionChange.__table__
+    table.create(bind=conn, checkfirst=True)
+    if not inspect(conn).has_table("transactions"):
+        return
+
+    pending = conn.execute(text(
+        "SELECT t.id, t.user_id FROM transactions t "
+        "WHERE NOT EXISTS (SELECT 1 FROM transaction_changes c "
+        "WHERE c.user_id = t.user_id AND c.transaction_id = t.id) "
+        "ORDER BY t.user_id, t.id"
+    )).all()
+    versions = dict(conn.execute(text("SELECT id, data_version FROM users")).all())
+
+    rows = []
+    for transaction_id, user_id in pending:
+        versions[user_id] += 1
+        rows.append({
+            "user_id": user_id,
+            "transaction_id": transaction_id,
+            "seq": versions[user_id],
+            "op": ChangeOp.INSERT,
+        })
+    if not rows:
+        return
+
+    conn.execute(table.insert(), rows)
+    touched = {row["user_id"] for row in rows}
+    conn.execute(
+        text("UPDATE users SET data_version = :version WHERE id = :id"),
+        [{"id": user_id, "version": versions[user_id]} for user_id in touched],
+    )
+
+
+def _add_instrument_prices(conn: Connection) -> None:
+    """instrument_prices ve price_epoch tabloları (piyasa fiyatları)."""
+    from app.models.instrument_price import InstrumentPrice, PriceEpoch
+
+    InstrumentPrice.__table__.create(bind=conn, checkfirst=True)
+    PriceEpoch.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_price_bars(conn: Connection) -> None:
+    """price_bars: gün içi fiyat akışının OHLCV çubukları."""
+    from app.models.price_bar import PriceBar
+
+    PriceBar.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_portfolio_snapshots(conn: Connection) -> None:
+    """portfolio_snapshots: günlük pozisyon / maliyet anlık görüntüleri."""
+    from app.models.portfolio_snapshot import PortfolioSnapshot
+    PortfolioSnapshot.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_transaction_date_index(conn: Connection) -> None:
+    """transactions(user_id, transaction_date): tarih aralığı taramaları için."""
+    from app.models.transaction import Transaction
+    if not inspect(conn).has_table("transactions"):
+        return
+    for index in Transaction.__table__.indexes:
+        if index.name == "ix_transactions_user_date":
+            index.create(bind=conn, checkfirst=True)
+
+
+def _add_price_bar_times(conn: Connection) -> None:
+    """price_bars.open_time / close_time: sırasız tick'lerin birleştirilmesi için."""
+    inspector = inspect(conn)
+    if not inspector.has_table("price_bars"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("price_bars")}
+    for name in ("open_time", "close_time"):
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE price_bars ADD COLUMN {name} TIMESTAMP"))
+
+
+# (sürüm, açıklama, fonksiyon) - sürümler artan sırada olmalıdır
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Temel şema (users, transactions)", _create_base_schema),
+    (2, "users.data_version sütunu", _add_user_data_version),
+    (3, "transaction_changes tablosu (değişiklik akışı)", _add_transaction_changes),
+    (4, "instrument_prices ve price_epoch tabloları", _add_instrument_prices),
+    (5, "price_bars tablosu (OHLCV çubukları)", _add_price_bars),
+    (6, "portfolio_snapshots tablosu (günlük anlık görüntüler)", _add_portfolio_snapshots),
+    (7, "transactions (user_id, transaction_date) indeksi", _add_transaction_date_index),
+    (8, "price_bars open_time / close_time sütunları", _add_price_bar_times),
+]
+
+# Uygulamanın beklediği şema sürümü
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ===========================================================================
+# SÜRÜM KONTROLÜ VE UYGULAMA
+# ===========================================================================
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Veritabanındaki mevcut şema sürümünü döndürür.
+
+    Tek bir indeksli sorgu çalıştırır; tablo yoksa 0 döner.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Uygulanmış en yüksek migration sürümü
+    """
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version_table.name):
+            return 0
+        version = conn.execute(
+            select(schema_version_table.c.version)
+            .order_by(schema_version_table.c.version.desc())
+            .limit(1)
+        ).scalar()
+    return version or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Bekleyen migration adımlarını sırayla uygular.
+
+    Her adım kendi transaction'ı içinde çalışır ve başarıyla
+    tamamlandığında `schema_version` tablosuna kaydedilir.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Migration sonrası şema sürümü
+    """
+    _version_metadata.create_all(bind=engine)
+    current = get_schema_version(engine)
+
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+
+        logger.info(f"🛠️  Migration uygulanıyor: v{version} - {description}")
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(
+                schema_version_table.insert().values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        current = version
+
+    return current
+
+
+def main(argv: List[str]) -> int:
+    """Komut satırı giriş noktası."""
+    from app.database import engine
+
+    if "--check" in argv:
+        current = get_schema_version(engine)
+        print(f"Şema sürümü: {current} (beklenen: {SCHEMA_VERSION})")
+        return 0 if current == SCHEMA_VERSION else 1
+
+    version = run_migrations(engine)
+    print(f"✅ Şema güncel: v{version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""
+InstrumentPrice (Piyasa Fiyatı) Modeli
+========================================
+Her hisse senedinin son fiyatını ve önceki kapanışını tutar.
+
+Fiyatlar toplu olarak yüklenir (python -m app.services.price_service).
+Her yükleme tek satırlık `price_epoch` tablosundaki sayacı bir artırır ve
+yüklediği satırlara bu değeri yazar; süreç içi fiyat önbelleği sadece
+sayacı okuyarak yeni fiyat olup olmadığını anlar ve sadece değişen
+satırları yeniden okur.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+
+from app.database import Base
+
+
+class InstrumentPrice(Base):
+    """
+    Fiyat tablosu.
+
+    Alanlar:
+        stock_symbol   : Hisse kodu (birincil anahtar, büyük harf)
+        stock_name     : Hisse adı (opsiyonel)
+        last_price     : Son fiyat (TL)
+        previous_close : Önceki günün kapanış fiyatı (TL, opsiyonel)
+        price_time     : Fiyatın zamanı (kaynağın verdiği)
+        epoch          : Satırı yazan yüklemenin sürümü
+        updated_at     : Satırın veritabanına yazıldığı zaman
+    """
+    __tablename__ = "instrument_prices"
+    __table_args__ = (
+        Index("ix_instrument_prices_epoch", "epoch"),
+    )
+
+    stock_symbol = Column(String(20), primary_key=True)
+    stock_name = Column(String(200), nullable=True)
+    last_price = Column(Float, nullable=False)
+    previous_close = Column(Float, nullable=True)
+    price_time = Column(DateTime, nullable=True)
+    epoch = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return (
+            f"<InstrumentPrice(symbol='{self.stock_symbol}', "
+            f"last_price={self.last_price}, epoch={self.epoch})>"
+        )
+
+
+class PriceEpoch(Base):
+    """
+    Fiyat sürümü sayacı (tek satır, id=1).
+
+    Yüklemeler sayacı UPDATE ... RETURNING ile artırır; satır kilidi
+    eşzamanlı yüklemeleri sıraya sokar, böylece sürümler benzersiz olur.
+    """
+    __tablename__ = "price_epoch"
+
+    id = Column(Integer, primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,48 @@
+"""
+PortfolioSnapshot (Günlük Portföy Anlık Görüntüsü) Modeli
+===========================================================
+Kullanıcının bir gün sonundaki hisse bazlı pozisyon ve maliyet durumunu
+tutar. Geçmiş bir tarihteki portföy, tüm işlemleri baştan oynatmak yerine
+o tarihten önceki en yakın anlık görüntüden başlanarak hesaplanır.
+
+Sadece işlem yapılan günler için satır yazılır (arada durum değişmez).
+Bir işlem eklendiğinde, güncellendiğinde veya silindiğinde işlemin
+gününden itibaren anlık görüntüler aynı transaction içinde silinir ve
+snapshot_service tarafından yeniden oluşturulur.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, LargeBinary
+
+from app.database import Base
+
+
+class PortfolioSnapshot(Base):
+    """
+    Anlık görüntü tablosu.
+
+    Alanlar:
+        user_id           : Portföyün sahibi
+        snapshot_date     : Gün (o günün sonundaki durum, UTC)
+        data_version      : Oluşturulduğu andaki kullanıcı veri sürümü
+        transaction_count : O güne kadarki işlem sayısı
+        positions         : Hisse bazlı durum (JSON, bkz. snapshot_service.Position)
+        created_at        : Oluşturulma zamanı
+    """
+    __tablename__ = "portfolio_snapshots"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    snapshot_date = Column(Date, primary_key=True)
+    data_version = Column(Integer, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+    positions = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return (
+            f"<PortfolioSnapshot(user_id={self.user_id}, "
+            f"snapshot_date={self.snapshot_date}, transaction_count={self.transaction_count})>"
+        )
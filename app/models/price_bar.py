@@ -0,0 +1,61 @@
+"""
+PriceBar (OHLCV Mum) Modeli
+=============================
+Gün içi fiyat akışından (tick) üretilen açılış/en yüksek/en düşük/kapanış
+ve hacim çubukları. Ham tick'ler saklanmaz; tick_service bunları bellekte
+1 dakikalık, 1 saatlik ve 1 günlük çubuklara toplar ve toplu olarak yazar.
+
+Aynı çubuk birden fazla yazımda güncellenebilir: yeni yazım mevcut
+çubukla birleştirilir (open en erken, close en geç zamanlı tick'in fiyatı
+olur, high/low genişler, volume ve tick_count toplanır). Tick'ler geç veya
+sırasız gelebileceğinden open/close zamanları da saklanır.
+"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from app.database import Base
+
+
+class BarInterval:
+    """Çubuk aralıkları."""
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+
+class PriceBar(Base):
+    """
+    Fiyat çubuğu tablosu.
+
+    Alanlar:
+        stock_symbol : Hisse kodu
+        interval     : Çubuk aralığı (1m / 1h / 1d)
+        bucket_start : Çubuğun başlangıç zamanı (UTC)
+        open         : İlk tick fiyatı
+        high         : En yüksek fiyat
+        low          : En düşük fiyat
+        close        : Son tick fiyatı
+        volume       : Toplam işlem hacmi (adet)
+        tick_count   : Çubuktaki tick sayısı
+        open_time    : open fiyatının tick zamanı (UTC)
+        close_time   : close fiyatının tick zamanı (UTC)
+    """
+    __tablename__ = "price_bars"
+
+    stock_symbol = Column(String(20), primary_key=True)
+    interval = Column(String(3), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False, default=0.0)
+    tick_count = Column(Integer, nullable=False, default=0)
+    open_time = Column(DateTime, nullable=True)
+    close_time = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<PriceBar(symbol='{self.stock_symbol}', interval='{self.interval}', "
+            f"bucket_start={self.bucket_start}, close={self.close})>"
+        )
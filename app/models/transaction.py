@@ -9,7 +9,7 @@ from datetime import datetime, timezone
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, ForeignKey, Enum
+    Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 )
 from sqlalchemy.orm import relationship
 
@@ -45,6 +45,10 @@ class Transaction(Base):
         created_at      : Kayıt oluşturulma tarihi
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Tarih aralığı sorguları (as_of, anlık görüntü sonrası oynatma)
+        Index("ix_transactions_user_date", "user_id", "transaction_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
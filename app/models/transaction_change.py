@@ -0,0 +1,60 @@
+"""
+TransactionChange (Değişiklik Kaydı) Modeli
+=============================================
+İstemci senkronizasyonu için her işlemin son değişikliğini tutar.
+
+Her işlem için tek satır vardır: işlem eklendiğinde oluşturulur,
+güncellendiğinde veya silindiğinde sıra numarası (seq) ve op alanı
+güncellenir. Silinen işlemlerin satırı "tombstone" olarak kalır; böylece
+istemciler silmeleri de görebilir.
+
+seq, yazma işleminin ürettiği kullanıcı veri sürümüdür (users.data_version);
+kullanıcı bazında benzersiz ve sürekli artandır.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from app.database import Base
+
+
+class ChangeOp:
+    """Değişiklik tipleri."""
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class TransactionChange(Base):
+    """
+    Değişiklik tablosu.
+
+    Alanlar:
+        id             : Satır kimliği
+        user_id        : İşlemin sahibi
+        transaction_id : Değişen işlemin ID'si (silinmiş olabilir, FK yok)
+        seq            : Son değişikliğin sıra numarası (veri sürümü)
+        op             : Son değişiklik tipi (insert / update / delete)
+        changed_at     : Son değişiklik zamanı
+    """
+    __tablename__ = "transaction_changes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "transaction_id", name="uq_transaction_changes_user_tx"),
+        Index("ix_transaction_changes_user_seq", "user_id", "seq"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    transaction_id = Column(Integer, nullable=False)
+    seq = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return (
+            f"<TransactionChange(user_id={self.user_id}, "
+            f"transaction_id={self.transaction_id}, seq={self.seq}, op='{self.op}')>"
+        )
@@ -25,6 +25,8 @@ class User(Base):
         is_active   : Hesap aktif mi? (pasif hesaplar giriş yapamaz)
         created_at  : Hesap oluşturulma tarihi
         updated_at  : Son güncelleme tarihi
+        data_version: Kullanıcının işlem verisi sürümü (her yazma işleminde artar;
+                      ETag ve önbellek anahtarlarında kullanılır)
     """
     __tablename__ = "users"
 
@@ -36,6 +38,7 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # ---------------------------------------------------------------------------
     # İlişki (Relationship)
@@ -43,11 +46,13 @@ class User(Base):
     # Bir kullanıcının birden fazla işlemi olabilir (One-to-Many)
     # back_populates: Transaction modelindeki "owner" alanına bağlanır
     # cascade="all, delete-orphan": Kullanıcı silinirse işlemleri de silinir
+    # lazy="select": İşlemler sadece erişildiğinde yüklenir; kimlik doğrulama
+    # sırasında kullanıcının tüm işlem geçmişi okunmaz.
     transactions = relationship(
         "Transaction",
         back_populates="owner",
         cascade="all, delete-orphan",
-        lazy="selectin",  # İlişkili verileri otomatik yükle
+        lazy="select",
     )
 
     def __repr__(self):
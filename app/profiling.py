@@ -0,0 +1,216 @@
+"""
+İstek Profilleme (İsteğe Bağlı)
+=================================
+Yavaş bir isteğin zamanını nerede harcadığını görmek için istatistiksel
+(örnekleme tabanlı) profilleyici.
+
+İki şekilde etkinleştirilir:
+    - Yönetici başlığı: `X-Profile-Token: <PROFILE_ADMIN_TOKEN>`
+    - Örnekleme oranı: PROFILE_SAMPLE_RATE (0.0 - 1.0)
+
+Profil, speedscope formatında (https://www.speedscope.app) şu dizine yazılır:
+    logs/profiles/<zaman>_<METHOD>_<route>_user<id>.speedscope.json
+
+Her iki ayar da kapalıysa middleware uygulamaya hiç eklenmez; yani
+profilleme kapalıyken istek yolunda ek maliyet yoktur.
+
+Not: Senkron endpointler thread pool'da çalıştığı için örnekleyici event
+loop thread'ini ve AnyIO worker thread'lerini örnekler. Aynı anda çalışan
+başka istekler varsa onların yığınları da profile karışabilir.
+"""
+
+import hmac
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+
+from app.config import settings
+from app.logger import get_logger, logs_dir
+from app.metrics import route_template
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile-token"
+profiles_dir = logs_dir / "profiles"
+
+# Boşta bekleyen thread'leri ayırt etmek için en içteki çerçeve adları
+_IDLE_FUNCTIONS = {"wait", "get", "select", "poll", "_worker", "run_forever"}
+_WORKER_THREAD_PREFIX = "AnyIO worker thread"
+
+Frame = Tuple[str, str, int]  # (fonksiyon, dosya, satır)
+
+
+def is_enabled() -> bool:
+    """Profilleme ayarlardan etkinleştirilmiş mi?"""
+    return settings.PROFILE_SAMPLE_RATE > 0 or bool(settings.PROFILE_ADMIN_TOKEN)
+
+
+# ===========================================================================
+# ÖRNEKLEYİCİ (SAMPLER)
+# ===========================================================================
+
+class StackSampler:
+    """
+    Arka plan thread'inde belirli aralıklarla yığınları örnekler.
+
+    Her örnekte event loop thread'inin ve AnyIO worker thread'lerinin
+    (boşta olmayanların) çağrı yığını kaydedilir.
+    """
+
+    def __init__(self, loop_thread_id: int, interval: float):
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.frames: List[Frame] = []
+        self._frame_index: Dict[Frame, int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiling-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> float:
+        """Örneklemeyi durdurur ve toplam süreyi (ms) döndürür."""
+        self._stop.set()
+        self._thread.join()
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def _frame_id(self, frame: Frame) -> int:
+        index = self._frame_index.get(frame)
+        if index is None:
+            index = self._frame_index[frame] = len(self.frames)
+            self.frames.append(frame)
+        return index
+
+    def _candidate_threads(self) -> List[int]:
+        ids = [self.loop_thread_id]
+        for thread in threading.enumerate():
+            if thread.name.startswith(_WORKER_THREAD_PREFIX) and thread.ident is not None:
+                ids.append(thread.ident)
+        return ids
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight = (now - last) * 1000
+            last = now
+
+            current = sys._current_frames()
+            for thread_id in self._candidate_threads():
+                frame = current.get(thread_id)
+                if frame is None or frame.f_code.co_name in _IDLE_FUNCTIONS:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(self._frame_id((code.co_name, code.co_filename, frame.f_lineno)))
+                    frame = frame.f_back
+                stack.reverse()  # speedscope: kökten yaprağa
+                self.samples.append(stack)
+                self.weights.append(weight)
+
+    def to_speedscope(self, name: str, duration_ms: float) -> dict:
+        """Örnekleri speedscope 'sampled' profil formatına çevirir."""
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "finans_takip",
+            "shared": {
+                "frames": [
+                    {"name": func, "file": file, "line": line}
+                    for func, file, line in self.frames
+                ],
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(duration_ms, 3),
+                    "samples": self.samples,
+                    "weights": [round(w, 3) for w in self.weights],
+                }
+            ],
+        }
+
+
+# ===========================================================================
+# MIDDLEWARE
+# ===========================================================================
+
+def _profile_filename(method: str, route: str, user_id: Optional[int]) -> str:
+    """Route ve kullanıcıya göre dosya adı üretir."""
+    safe_route = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+    user_part = f"user{user_id}" if user_id is not None else "anonymous"
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return f"{timestamp}_{method}_{safe_route}_{user_part}.speedscope.json"
+
+
+def _write_profile(path: Path, profile: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+
+
+class ProfilingMiddleware:
+    """
+    Seçilen istekleri StackSampler ile profilleyen ASGI middleware.
+
+    Sadece `is_enabled()` True ise uygulamaya eklenmelidir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+        self.admin_token = settings.PROFILE_ADMIN_TOKEN.encode()
+        self.interval = settings.PROFILE_INTERVAL_MS / 1000
+
+    def _should_profile(self, scope) -> bool:
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.admin_token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # get_current_user kullanıcı kimliğini request.state (scope["state"]) içine yazar
+        state = scope.setdefault("state", {})
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration_ms = sampler.stop()
+            method = scope["method"]
+            route = route_template(scope)
+            user_id = state.get("user_id")
+
+            filename = _profile_filename(method, route, user_id)
+            profile = sampler.to_speedscope(f"{method} {route}", duration_ms)
+            try:
+                await anyio.to_thread.run_sync(_write_profile, profiles_dir / filename, profile)
+                logger.info(
+                    f"🔬 Profil kaydedildi: {filename} ({duration_ms:.1f} ms, "
+                    f"{len(sampler.samples)} örnek)"
+                )
+            except OSError as e:
+                logger.error(f"❌ Profil kaydedilemedi: {e}")
@@ -0,0 +1,176 @@
+"""
+Batch Router - Toplu İstek Endpointi
+======================================
+Birden fazla GET isteğini tek HTTP isteğinde çalıştırır.
+
+- Kimlik doğrulama bir kez yapılır; alt istekler doğrulanmış kullanıcıyı
+  `scope["state"]` üzerinden alır (JWT çözme ve kullanıcı sorgusu tekrar
+  yapılmaz).
+- Alt istekler uygulamanın router'ına süreç içinde (ASGI) iletilir; HTTP,
+  middleware ve sıkıştırma katmanları atlanır.
+- En fazla BATCH_MAX_CONCURRENCY alt istek aynı anda çalışır; sonuçlar
+  istek sırasıyla döner.
+
+Örnek:
+    POST /api/batch
+    {"requests": [{"path": "/api/transactions/portfolio/THYAO"},
+                  {"path": "/api/transactions/portfolio/ASELS"}]}
+"""
+
+from typing import List, Optional
+
+import anyio
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.config import settings
+from app.logger import get_logger
+from app.models.user import User
+from app.schemas.batch import BatchItem, BatchRequest, BatchResponse
+from app.security import get_current_user
+
+logger = get_logger(__name__)
+
+# Router tanımı
+router = APIRouter(
+    prefix="/api/batch",
+    tags=["Toplu İstek (Batch)"],
+)
+
+# Alt isteklere üst istekten kopyalanan ASGI scope alanları
+_INHERITED_SCOPE_KEYS = (
+    "asgi", "http_version", "scheme", "server", "client", "root_path",
+    "app", "starlette.exception_handlers",
+)
+
+
+def _validate_item(item: BatchItem) -> None:
+    """Alt isteğin yolu API altında olmalı ve tekrar batch olmamalı."""
+    path = item.path.split("?", 1)[0]
+    if not path.startswith("/api/") or path.startswith(router.prefix):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Geçersiz alt istek yolu: {item.path}",
+        )
+
+
+def _decode_body(content_type: str, body: bytes):
+    """JSON gövdeleri ayrıştırır, diğerlerini metin olarak döndürür."""
+    if not body:
+        return None
+    if "json" in content_type:
+        return orjson.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _dispatch(parent: Request, item: BatchItem, user: User) -> dict:
+    """
+    Tek bir alt isteği uygulamanın router'ına iletir ve yanıtı toplar.
+
+    Args:
+        parent: Batch isteği
+        item: Alt istek
+        user: Üst istekte doğrulanmış kullanıcı
+
+    Returns:
+        {"status", "headers", "body"} sözlüğü
+    """
+    path, _, query_string = item.path.partition("?")
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() not in ("authorization", "host", "accept-encoding")
+    ]
+    authorization = parent.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+
+    scope = {key: parent.scope[key] for key in _INHERITED_SCOPE_KEYS if key in parent.scope}
+    scope.update({
+        "type": "http",
+        "method": item.method,
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query_string.encode("latin-1"),
+        "headers": headers,
+        "state": {"batch_user": user},
+    })
+
+    response = {"status": 500, "headers": {}, "body": None}
+    chunks: List[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+                if name.lower() != b"content-length"
+            }
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await parent.app.router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        # Router seviyesindeki 404/405 hataları
+        return {"status": exc.status_code, "headers": {}, "body": {"detail": exc.detail}}
+    except Exception as exc:
+        logger.error(f"❌ Batch alt isteği başarısız {item.path}: {exc}", exc_info=True)
+        return {
+            "status": 500,
+            "headers": {},
+            "body": {"detail": "Sunucu hatası oluştu. Lütfen daha sonra deneyin."},
+        }
+
+    response["body"] = _decode_body(response["headers"].get("content-type", ""), b"".join(chunks))
+    return response
+
+
+# ===========================================================================
+# POST /api/batch - Toplu İstek
+# ===========================================================================
+@router.post(
+    "",
+    response_model=BatchResponse,
+    summary="Toplu istek",
+    description="Birden fazla GET isteğini tek kimlik doğrulamayla çalıştırır.",
+)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Alt istekleri sınırlı eşzamanlılıkla çalıştırır ve sonuçları
+    istek sırasıyla döndürür.
+
+    - **requests**: `{"path": "/api/...", "headers": {...}}` listesi
+      (sadece GET, en fazla BATCH_MAX_REQUESTS adet)
+    """
+    items = batch_request.requests
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tek istekte en fazla {settings.BATCH_MAX_REQUESTS} alt istek gönderilebilir.",
+        )
+    for item in items:
+        _validate_item(item)
+
+    results: List[Optional[dict]] = [None] * len(items)
+    limiter = anyio.Semaphore(max(1, settings.BATCH_MAX_CONCURRENCY))
+
+    async def run(index: int, item: BatchItem) -> None:
+        async with limiter:
+            results[index] = await _dispatch(request, item, current_user)
+
+    async with anyio.create_task_group() as task_group:
+        for index, item in enumerate(items):
+            task_group.start_soon(run, index, item)
+
+    return ORJSONResponse({"responses": results})
@@ -0,0 +1,91 @@
+"""
+Dashboard Router - Ana Sayfa Endpointi
+========================================
+Masaüstü uygulamasının ana sayfası için özet kartları, portföy tablosu,
+son işlemler ve grafik serisini tek istekte döndürür.
+
+Endpoint korumalıdır (JWT token gerektirir) ve veri sürümünden türetilen
+ETag döndürür (piyasa fiyat sürümü dahil). Yanıt aynı sürüm için
+önbellekten gelir; `Cache-Control: max-stale` ile stale-while-revalidate
+desteklenir.
+"""
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.http_cache import (
+    CACHE_CONTROL, etag_headers, make_etag, not_modified, requested_max_stale,
+)
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.security import get_current_user
+from app.services.dashboard_service import (
+    DEFAULT_CHART_POINTS,
+    DEFAULT_RECENT_LIMIT,
+    get_dashboard_json,
+    refresh_dashboard,
+)
+from app.services.price_service import prices
+
+# Router tanımı
+router = APIRouter(
+    prefix="/api/dashboard",
+    tags=["Dashboard"],
+)
+
+
+# ===========================================================================
+# GET /api/dashboard - Ana Sayfa Verileri
+# ===========================================================================
+@router.get(
+    "",
+    response_model=DashboardResponse,
+    summary="Dashboard verileri",
+    description="Özet kartları, portföy tablosu, son işlemler ve grafik serisi.",
+)
+def dashboard(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    recent: int = Query(DEFAULT_RECENT_LIMIT, ge=0, le=50, description="Son işlem sayısı"),
+    chart_points: int = Query(
+        DEFAULT_CHART_POINTS, ge=2, le=500, description="Grafikteki en fazla nokta"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Ana sayfanın tüm parçalarını tek kimlik doğrulama ve tek veri
+    anlık görüntüsüyle döndürür:
+    - **cards**: Toplam yatırım, net yatırım, komisyon, hisse ve işlem sayısı,
+      piyasa değeri, gerçekleşmemiş ve günlük kar/zarar
+    - **holdings**: Hisse bazlı özet (portföy tablosu)
+    - **recent_transactions**: En yeni işlemler
+    - **chart**: Gün sonu kümülatif net yatırım serisi
+
+    `Cache-Control: max-stale[=saniye]` gönderilirse ve güncel yanıt henüz
+    hesaplanmamışsa, önceki yanıt hemen döndürülür (`stale: true`, `Age`
+    başlığı) ve güncel yanıt arka planda hesaplanır.
+    """
+    etag = make_etag(current_user, "dashboard", recent, chart_points, prices.epoch(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    max_stale = requested_max_stale(request, settings.SUMMARY_MAX_STALE_SECONDS)
+    payload, age = get_dashboard_json(db, current_user, recent, chart_points, max_stale)
+
+    if age is not None:
+        # Bayat yanıt: ETag verilmez (istemci bir sonraki istekte güncelini alır)
+        background_tasks.add_task(
+            refresh_dashboard,
+            db.get_bind(), current_user.id, current_user.data_version, recent, chart_points,
+        )
+        return Response(
+            payload,
+            media_type="application/json",
+            headers={"Age": str(int(age)), "Cache-Control": CACHE_CONTROL},
+        )
+
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
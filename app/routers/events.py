@@ -0,0 +1,90 @@
+"""
+Events Router - Değişiklik Olayları (Server-Sent Events)
+==========================================================
+İstemciler periyodik sorgulama (polling) yerine bu akışı dinler ve
+verilerini sadece bir değişiklik olayı geldiğinde yeniler.
+
+Akış biçimi (text/event-stream):
+    event: hello                  -> bağlantı açıldığında mevcut veri sürümü
+    event: transactions_changed   -> işlem eklendi/güncellendi/silindi
+    event: resync                 -> olaylar kaçırıldı, tüm veriyi yeniden yükle
+    : ping                        -> bağlantıyı canlı tutan yorum satırı
+
+Her olayın `id` alanı kullanıcının veri sürümüdür.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import settings
+from app.events import Subscription, hub
+from app.models.user import User
+from app.security import get_current_user
+
+# Router tanımı
+router = APIRouter(
+    prefix="/api/events",
+    tags=["Olaylar (Events)"],
+)
+
+
+def format_event(event: dict) -> str:
+    """Olayı SSE mesajına çevirir."""
+    lines = [f"event: {event['type']}"]
+    if "data_version" in event:
+        lines.append(f"id: {event['data_version']}")
+    lines.append(f"data: {orjson.dumps(event).decode()}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream_body(
+    subscription: Subscription, data_version: int, heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """
+    Bir aboneliğin SSE akışı: önce hello, sonra gelen olaylar; olay
+    gelmediğinde heartbeat_seconds aralıklarla ping yorumu.
+    """
+    try:
+        yield format_event({"type": "hello", "data_version": data_version})
+        while True:
+            try:
+                event = await subscription.get(heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        subscription.close()
+
+
+# ===========================================================================
+# GET /api/events - Değişiklik Akışı
+# ===========================================================================
+@router.get(
+    "",
+    summary="Değişiklik olayları (SSE)",
+    description="Kullanıcının işlemleri değiştiğinde olay gönderen Server-Sent Events akışı.",
+    response_class=StreamingResponse,
+)
+async def event_stream(current_user: User = Depends(get_current_user)):
+    """
+    Kullanıcının değişiklik olaylarını akış olarak gönderir.
+
+    Abonelik yanıt döndürülmeden açılır; böylece kimlik doğrulama ile akışın
+    başlaması arasında yapılan yazmalar kaçırılmaz.
+    """
+    subscription = hub.subscribe(current_user.id)
+    return StreamingResponse(
+        event_stream_body(
+            subscription, current_user.data_version, settings.SSE_HEARTBEAT_SECONDS
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Akış hiç başlamadan bağlantı koparsa da abonelik kapatılır
+        background=BackgroundTask(subscription.close),
+    )
@@ -0,0 +1,241 @@
+"""
+Portföy Router - Portföy Analizi Endpointleri
+===============================================
+Portföyün zaman içindeki değeri, getirisi, riski, korelasyonları ve
+önerilen ağırlıkları gibi, işlemler ve fiyat geçmişinden türetilen
+analizleri döndürür.
+
+Endpointler korumalıdır (JWT token gerektirir) ve veri sürümü, fiyat
+sürümü ve fiyat geçmişi deposu sürümünden türetilen ETag döndürür.
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.history_store import history_store
+from app.http_cache import etag_headers, make_etag, not_modified
+from app.models.user import User
+from app.schemas.portfolio import (
+    CorrelationResponse,
+    OptimizationResponse,
+    PerformanceResponse,
+    PortfolioHistoryResponse,
+    RiskResponse,
+)
+from app.security import get_current_user
+from app.services.correlation_service import DEFAULT_CORRELATION_WINDOW, get_correlation_json
+from app.services.history_service import (
+    DEFAULT_HISTORY_POINTS,
+    DEFAULT_PERIOD,
+    get_portfolio_history_json,
+    period_anchor,
+)
+from app.services.optimizer_service import DEFAULT_FRONTIER_POINTS, get_optimization_json
+from app.services.price_service import prices
+from app.services.returns_service import get_performance_json
+from app.services.risk_service import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_RISK_DAYS,
+    DEFAULT_VOLATILITY_WINDOW,
+    get_risk_json,
+)
+
+# Router tanımı
+router = APIRouter(
+    prefix="/api/portfolio",
+    tags=["Portföy Analizi"],
+)
+
+
+# ===========================================================================
+# GET /api/portfolio/history - Portföy Değer Grafiği
+# ===========================================================================
+@router.get(
+    "/history",
+    response_model=PortfolioHistoryResponse,
+    summary="Portföy değer geçmişi",
+    description="Dönem içindeki portföy değeri ve net yatırım serisi (LTTB ile seyreltilmiş).",
+)
+def history(
+    request: Request,
+    period: str = Query(
+        DEFAULT_PERIOD, pattern="^(1G|1H|1A|1Y)$",
+        description="Dönem: 1G (gün, saatlik), 1H (hafta), 1A (ay), 1Y (yıl)",
+    ),
+    points: int = Query(
+        DEFAULT_HISTORY_POINTS, ge=2, le=1000, description="Yanıttaki en fazla nokta"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Portföyün dönem içindeki değer serisini döndürür:
+    - **value**: Elde tutulan adetler x o günkü kapanış fiyatı (fiyat
+      geçmişi yoksa son işlem fiyatı; son nokta güncel fiyat)
+    - **net_invested**: Kümülatif alış - satış tutarı
+
+    Seri ilk işlemden önceye uzanmaz ve `points` noktaya seyreltilir.
+    """
+    now = datetime.now(timezone.utc)
+    version = (prices.epoch(db), history_store.generation(), period_anchor(period, now))
+    etag = make_etag(current_user, "portfolio_history", period, points, *version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_portfolio_history_json(db, current_user, period, points, version, now)
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/portfolio/performance - Getiri (XIRR / TWR)
+# ===========================================================================
+@router.get(
+    "/performance",
+    response_model=PerformanceResponse,
+    summary="Portföy getirisi",
+    description="Para ağırlıklı (XIRR) ve zaman ağırlıklı (TWR) getiri; hisse bazında XIRR.",
+)
+def performance(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Portföyün ilk işlemden bugüne getirisini döndürür:
+    - **xirr_percent**: Alış/satış nakit akışları ve bugünkü piyasa değerine
+      göre yıllık iç verim oranı (komisyonlar dahil)
+    - **twr_percent**: Günlük değerlemelerden, para giriş/çıkışlarından
+      arındırılmış bileşik getiri
+    - **stocks**: Her hissenin kendi nakit akışlarıyla XIRR'ı
+    """
+    now = datetime.now(timezone.utc)
+    version = (prices.epoch(db), history_store.generation(), now.date().isoformat())
+    etag = make_etag(current_user, "portfolio_performance", *version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_performance_json(db, current_user, version, now)
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/portfolio/risk - Risk Analizi
+# ===========================================================================
+@router.get(
+    "/risk",
+    response_model=RiskResponse,
+    summary="Portföy risk analizi",
+    description="Volatilite, maksimum düşüş, beta ve VaR (hisse bazında ve portföy).",
+)
+def risk(
+    request: Request,
+    days: int = Query(DEFAULT_RISK_DAYS, ge=30, le=3660, description="Geriye bakılan gün"),
+    window: int = Query(
+        DEFAULT_VOLATILITY_WINDOW, ge=5, le=252, description="Kayan volatilite penceresi"
+    ),
+    confidence: float = Query(DEFAULT_CONFIDENCE, ge=0.8, le=0.999, description="VaR güven düzeyi"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bugünkü pozisyonların son `days` gündeki günlük kapanışlarla risk
+    ölçülerini döndürür (fiyat geçmişi deposu). Portföy ölçüleri bugünkü
+    adetlerle ağırlıklandırılmış günlük getirilerdendir; VaR 1 günlüktür.
+
+    Sonuç aynı gün içinde (yeni işlem veya fiyat geçmişi güncellemesi
+    olmadıkça) önbellekten döner.
+    """
+    now = datetime.now(timezone.utc)
+    version = (history_store.generation(), now.date().isoformat())
+    etag = make_etag(current_user, "portfolio_risk", days, window, confidence, *version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_risk_json(db, current_user, days, window, confidence, version, now)
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/portfolio/correlation - Korelasyon Matrisi
+# ===========================================================================
+@router.get(
+    "/correlation",
+    response_model=CorrelationResponse,
+    summary="Korelasyon ve kovaryans matrisi",
+    description="Elde tutulan hisselerin günlük getiri korelasyonları (üst üçgen formatı).",
+)
+def correlation(
+    request: Request,
+    window: int = Query(
+        DEFAULT_CORRELATION_WINDOW, ge=20, le=1260, description="İşlem günü penceresi"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Elde tutulan hisselerin son `window` işlem günündeki eşli korelasyon
+    ve yıllık kovaryans matrislerini döndürür. Matris hisse kümesi, pencere
+    ve gün başına önbelleğe alınır; aynı hisseleri tutan kullanıcılar aynı
+    sonucu paylaşır.
+    """
+    now = datetime.now(timezone.utc)
+    etag = make_etag(
+        current_user, "portfolio_correlation", window,
+        history_store.generation(), now.date().isoformat(),
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_correlation_json(db, current_user, window, now)
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/portfolio/optimize - Ortalama-Varyans Optimizasyonu
+# ===========================================================================
+@router.get(
+    "/optimize",
+    response_model=OptimizationResponse,
+    summary="Önerilen ağırlıklar (etkin sınır)",
+    description="Elde tutulan hisseler için minimum varyans, maksimum Sharpe ve etkin sınır.",
+)
+def optimize(
+    request: Request,
+    window: int = Query(
+        DEFAULT_CORRELATION_WINDOW, ge=20, le=1260, description="İşlem günü penceresi"
+    ),
+    max_weight: float = Query(1.0, gt=0, le=1, description="Hisse başına en fazla ağırlık"),
+    risk_free_rate: float = Query(0.0, ge=0, le=5, description="Yıllık risksiz getiri (oran)"),
+    points: int = Query(DEFAULT_FRONTIER_POINTS, ge=2, le=100, description="Sınır noktası"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Son `window` işlem gününün kovaryansı ve tarihsel ortalama getirileriyle,
+    sadece uzun pozisyon ve `max_weight` sınırı altında:
+    - **min_variance**: En düşük volatiliteli portföy
+    - **max_sharpe**: (getiri - risksiz getiri) / volatilite oranı en yüksek portföy
+    - **frontier**: Etkin sınır noktaları
+
+    Tarihsel getiriler geleceği garanti etmez; sonuç öneri niteliğindedir.
+    """
+    now = datetime.now(timezone.utc)
+    version = (history_store.generation(), now.date().isoformat())
+    etag = make_etag(
+        current_user, "portfolio_optimization", window, max_weight, risk_free_rate, points, *version
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_optimization_json(
+        db, current_user, window, max_weight, risk_free_rate, points, version, now
+    )
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
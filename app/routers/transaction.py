@@ -5,14 +5,30 @@ Borsa alım/satım işlemlerinin CRUD endpointlerini ve
 portföy özeti hesaplama endpointlerini tanımlar.
 
 Tüm endpointler korumalıdır (JWT token gerektirir).
+
+Okuma endpointleri kullanıcının veri sürümünden türetilen ETag döndürür;
+If-None-Match eşleşirse hiçbir veri sorgusu çalışmadan 304 yanıtı verilir.
+Portföy özeti ETag'leri ayrıca piyasa fiyat sürümünü içerir.
+
+Portföy özetleri `as_of` ile geçmiş bir andaki haliyle istenebilir; bu
+yanıtlar önbelleğe alınmaz (ETag yine verilir).
 """
 
+from datetime import date, datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status,
+)
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.config import settings
+from app.http_cache import (
+    CACHE_CONTROL, etag_headers, make_etag, not_modified, requested_max_stale,
+)
+from app.history_store import history_store
 from app.models.user import User
 from app.security import get_current_user
 from app.schemas.transaction import (
@@ -22,6 +38,8 @@ from app.schemas.transaction import (
     TransactionListResponse,
     PortfolioSummary,
     StockSummary,
+    ChangeFeedResponse,
+    DigestResponse,
 )
 from app.services.portfolio_service import (
     create_transaction,
@@ -31,6 +49,16 @@ from app.services.portfolio_service import (
     delete_transaction,
     calculate_portfolio_summary,
     calculate_stock_summary,
+    get_portfolio_summary_json,
+    refresh_portfolio_summary,
+    transaction_to_dict,
+)
+from app.services.price_service import prices
+from app.services.sync_service import (
+    DEFAULT_CHANGE_LIMIT,
+    MAX_CHANGE_LIMIT,
+    get_changes,
+    get_digests_json,
 )
 
 # Router tanımı
@@ -68,6 +96,20 @@ def add_transaction(
     return transaction
 
 
+def _as_of_etag(user: User, resource: str, as_of: datetime):
+    """
+    Geçmiş tarihli özetler için (UTC'ye çevrilmiş an, ETag).
+
+    Bu yanıtlar önbelleğe alınmaz: her `as_of` ayrı bir sonuçtur ve anlık
+    görüntü + aralık taraması zaten ucuzdur. ETag veri sürümü, an ve fiyat
+    geçmişi deposu sürümünden türetilir.
+    """
+    if as_of.tzinfo is not None:
+        # İşlem tarihleri UTC olarak saklanır
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    return as_of, make_etag(user, resource, "as_of", as_of.isoformat(), history_store.generation())
+
+
 # ===========================================================================
 # GET /api/transactions/portfolio/summary - Portföy Özeti (PORTFOLIO İLK GELMELİ!)
 # ===========================================================================
@@ -78,6 +120,11 @@ def add_transaction(
     description="Kullanıcının tüm portföyünün özetini hesaplar.",
 )
 def portfolio_summary(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    as_of: Optional[datetime] = Query(
+        None, description="Bu andaki özet (ör: 2023-12-31T23:59:59); verilmezse güncel"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -86,8 +133,47 @@ def portfolio_summary(
     - Toplam yatırım tutarı
     - Toplam komisyon
     - Hisse bazlı detaylı özet (ortalama maliyet, adet vb.)
+    - Son fiyatı olan hisseler için piyasa değeri, gerçekleşmemiş ve
+      günlük kar/zarar
+
+    `Cache-Control: max-stale[=saniye]` gönderilirse ve güncel özet henüz
+    hesaplanmamışsa, önceki özet hemen döndürülür (`stale: true`, `Age`
+    başlığı) ve güncel özet arka planda hesaplanır.
+
+    `as_of` verilirse o andaki pozisyonlar (en yakın günlük anlık görüntü +
+    sonraki işlemler) o günün kapanış fiyatlarıyla döndürülür.
     """
-    return calculate_portfolio_summary(db, current_user.id)
+    if as_of is not None:
+        as_of, etag = _as_of_etag(current_user, "portfolio_summary", as_of)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        summary = calculate_portfolio_summary(db, current_user.id, as_of=as_of)
+        return ORJSONResponse(summary.model_dump(), headers=etag_headers(etag))
+
+    etag = make_etag(current_user, "portfolio_summary", prices.epoch(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # Özet (user_id, data_version) anahtarıyla önbellekten gelir veya
+    # hesaplanıp önbelleğe yazılır; zaten kodlanmış JSON doğrudan döndürülür.
+    max_stale = requested_max_stale(request, settings.SUMMARY_MAX_STALE_SECONDS)
+    payload, age = get_portfolio_summary_json(db, current_user, max_stale)
+
+    if age is not None:
+        # Bayat yanıt: ETag verilmez (istemci bir sonraki istekte güncelini alır)
+        background_tasks.add_task(
+            refresh_portfolio_summary,
+            db.get_bind(), current_user.id, current_user.data_version,
+        )
+        return Response(
+            payload,
+            media_type="application/json",
+            headers={"Age": str(int(age)), "Cache-Control": CACHE_CONTROL},
+        )
+
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
 
 
 # ===========================================================================
@@ -101,6 +187,8 @@ def portfolio_summary(
 )
 def stock_summary(
     stock_symbol: str,
+    request: Request,
+    as_of: Optional[datetime] = Query(None, description="Bu andaki özet; verilmezse güncel"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -109,8 +197,19 @@ def stock_summary(
     - Ortalama maliyet
     - Toplam alış/satış adedi
     - Net elde tutulan adet
+    - Son fiyat varsa piyasa değeri ve kar/zarar
+
+    `as_of` verilirse o andaki özet, o günün kapanışıyla döndürülür.
     """
-    summary = calculate_stock_summary(db, current_user.id, stock_symbol)
+    if as_of is not None:
+        as_of, etag = _as_of_etag(current_user, f"stock_summary:{stock_symbol.upper()}", as_of)
+    else:
+        etag = make_etag(current_user, "stock_summary", stock_symbol.upper(), prices.epoch(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    summary = calculate_stock_summary(db, current_user.id, stock_symbol, as_of)
 
     if not summary:
         raise HTTPException(
@@ -118,7 +217,7 @@ def stock_summary(
             detail=f"'{stock_symbol.upper()}' kodlu hisseye ait işlem bulunamadı.",
         )
 
-    return summary
+    return ORJSONResponse(summary.model_dump(), headers=etag_headers(etag))
 
 
 # ===========================================================================
@@ -131,6 +230,7 @@ def stock_summary(
     description="Kullanıcının tüm işlemlerini sayfalanmış olarak getirir.",
 )
 def list_transactions(
+    request: Request,
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     page_size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt"),
     stock_symbol: Optional[str] = Query(
@@ -145,16 +245,103 @@ def list_transactions(
     Sayfalama ve hisse filtresi destekler.
     En yeni işlemler önce gösterilir.
     """
+    etag = make_etag(
+        current_user, "transactions", page, page_size, (stock_symbol or "").upper()
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     transactions, total_count = get_user_transactions(
         db, current_user.id, page, page_size, stock_symbol
     )
 
-    return TransactionListResponse(
-        transactions=transactions,
-        total_count=total_count,
-        page=page,
-        page_size=page_size,
-    )
+    return ORJSONResponse({
+        "transactions": [transaction_to_dict(t) for t in transactions],
+        "total_count": total_count,
+        "page": page,
+        "page_size": page_size,
+    }, headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/transactions/changes - Değişiklik Akışı ({id}'DEN ÖNCE GELMELİ!)
+# ===========================================================================
+@router.get(
+    "/changes",
+    response_model=ChangeFeedResponse,
+    summary="Değişiklik akışı",
+    description="Verilen sıra numarasından sonra eklenen, güncellenen ve silinen işlemler.",
+)
+def list_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Son alınan sıra numarası (ilk senkronizasyonda 0)"),
+    limit: int = Query(
+        DEFAULT_CHANGE_LIMIT, ge=1, le=MAX_CHANGE_LIMIT, description="En fazla değişiklik"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    İstemci önbelleğini artımlı olarak günceller.
+
+    - Yanıttaki `next_since` bir sonraki istekte `since` olarak gönderilir
+    - `has_more` True ise hemen tekrar istenmelidir
+    - Silinen işlemler `op: "delete"` ve `transaction: null` ile döner
+    """
+    etag = make_etag(current_user, "changes", since, limit)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # Sürüm since'ten büyük değilse değişiklik yoktur; sorgu çalıştırılmaz
+    if since >= current_user.data_version:
+        content = {"changes": [], "next_since": since, "has_more": False}
+    else:
+        content = get_changes(db, current_user.id, since, limit)
+    content["data_version"] = current_user.data_version
+    return ORJSONResponse(content, headers=etag_headers(etag))
+
+
+# ===========================================================================
+# GET /api/transactions/digests - Aralık Özetleri ({id}'DEN ÖNCE GELMELİ!)
+# ===========================================================================
+@router.get(
+    "/digests",
+    response_model=DigestResponse,
+    summary="Aralık özetleri",
+    description="İşlemlerin ay, gün veya satır düzeyindeki hash özetleri (uzlaştırma için).",
+)
+def transaction_digests(
+    request: Request,
+    month: Optional[str] = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Gün özetleri için ay (YYYY-MM)"
+    ),
+    day: Optional[date] = Query(None, description="Satır özetleri için gün (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Çevrimdışı kalmış istemcinin verisini ucuza uzlaştırır:
+
+    1. Parametresiz istek: ay özetleri ve kök özet
+    2. Farklı ay için `?month=YYYY-MM`: o ayın gün özetleri
+    3. Farklı gün için `?day=YYYY-MM-DD`: o günün işlem özetleri
+    4. Farklı işlemler `/api/transactions/{id}` veya `/api/batch` ile indirilir
+    """
+    if month and day:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="month ve day parametreleri birlikte kullanılamaz.",
+        )
+
+    etag = make_etag(current_user, "digests", month or "", day or "")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    payload = get_digests_json(db, current_user, month, day)
+    return Response(payload, media_type="application/json", headers=etag_headers(etag))
 
 
 # ===========================================================================
@@ -168,10 +355,16 @@ def list_transactions(
 )
 def get_transaction(
     transaction_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Belirtilen ID'ye sahip işlemin detaylarını döndürür."""
+    etag = make_etag(current_user, "transaction", transaction_id)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     transaction = get_transaction_by_id(db, transaction_id, current_user.id)
 
     if not transaction:
@@ -180,7 +373,7 @@ def get_transaction(
             detail="İşlem bulunamadı.",
         )
 
-    return transaction
+    return ORJSONResponse(transaction_to_dict(transaction), headers=etag_headers(etag))
 
 
 # ===========================================================================
@@ -0,0 +1,37 @@
+"""
+Pydantic Şemaları - Batch (Toplu İstek)
+=========================================
+POST /api/batch ile tek HTTP isteğinde birden fazla GET isteği.
+"""
+
+from typing import Any, Dict, List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class BatchItem(BaseModel):
+    """Tek bir alt istek."""
+    method: Literal["GET"] = "GET"
+    path: str = Field(
+        ..., description="Sorgu parametreleriyle birlikte yol (ör: /api/transactions/?page=2)"
+    )
+    headers: Dict[str, str] = Field(
+        default_factory=dict, description="Ek başlıklar (ör: If-None-Match)"
+    )
+
+
+class BatchRequest(BaseModel):
+    """Toplu istek gövdesi."""
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+
+class BatchItemResponse(BaseModel):
+    """Tek bir alt isteğin sonucu."""
+    status: int
+    headers: Dict[str, str]
+    body: Any = None               # JSON yanıtlar ayrıştırılmış olarak
+
+
+class BatchResponse(BaseModel):
+    """Alt isteklerin sonuçları (istek sırasıyla)."""
+    responses: List[BatchItemResponse]
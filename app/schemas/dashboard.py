@@ -0,0 +1,40 @@
+"""
+Pydantic Şemaları - Dashboard
+===============================
+Masaüstü ana sayfasının (DashboardPage) tek istekte aldığı veriler.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.transaction import StockSummary, TransactionResponse
+
+
+class DashboardCards(BaseModel):
+    """Üst kısımdaki özet kartları."""
+    total_invested: float          # Toplam alış tutarı (TL)
+    net_invested: float            # Alışlar - satışlar (TL)
+    total_commission: float        # Toplam komisyon (TL)
+    stock_count: int               # Portföydeki farklı hisse sayısı
+    transaction_count: int         # Toplam işlem sayısı
+    # Son fiyatı olan hisselerin toplamları (fiyat yoksa None)
+    total_market_value: Optional[float] = None     # Toplam portföy değeri (TL)
+    total_unrealized_pnl: Optional[float] = None   # Gerçekleşmemiş kar/zarar (TL)
+    total_daily_pnl: Optional[float] = None        # Günlük kar/zarar (TL)
+
+
+class ChartPoint(BaseModel):
+    """Grafik noktası: gün sonundaki kümülatif net yatırım."""
+    date: date
+    net_invested: float
+
+
+class DashboardResponse(BaseModel):
+    """GET /api/dashboard yanıtı."""
+    cards: DashboardCards
+    holdings: List[StockSummary]                  # Portföy tablosu
+    recent_transactions: List[TransactionResponse]  # En yeni işlemler
+    chart: List[ChartPoint]                       # Portföy değer grafiği
+    stale: bool = False            # True: önceki sürümün yanıtı (arka planda yenileniyor)
@@ -0,0 +1,133 @@
+"""
+Pydantic Şemaları - Portföy Analizi
+=====================================
+/api/portfolio altındaki analiz endpointlerinin yanıtları.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class HistoryPoint(BaseModel):
+    """Değer grafiği noktası."""
+    time: datetime          # Günlük seride gün başı, 1G'de saat başı (UTC)
+    value: float            # Portföyün piyasa değeri (TL)
+    net_invested: float     # Kümülatif net yatırım (TL)
+
+
+class PortfolioHistoryResponse(BaseModel):
+    """GET /api/portfolio/history yanıtı."""
+    period: str                 # 1G / 1H / 1A / 1Y
+    interval: str               # Nokta aralığı: "h" (saatlik) veya "D" (günlük)
+    total_points: int           # Seyreltmeden önceki nokta sayısı
+    points: List[HistoryPoint]  # LTTB ile seyreltilmiş seri
+
+
+class PortfolioReturns(BaseModel):
+    """Portföy getirisi (yüzde değerler; hesaplanamıyorsa None)."""
+    xirr_percent: Optional[float] = None            # Para ağırlıklı yıllık getiri
+    twr_percent: Optional[float] = None             # Zaman ağırlıklı dönem getirisi
+    twr_annualized_percent: Optional[float] = None  # Yıllık TWR (en az 1 yıllık geçmişte)
+    market_value: float     # Bugünkü piyasa değeri (TL)
+    net_invested: float     # Kümülatif net yatırım (TL)
+    profit: float           # Satışlar + piyasa değeri - alışlar - komisyonlar (TL)
+
+
+class StockReturns(BaseModel):
+    """Hisse bazında para ağırlıklı getiri."""
+    stock_symbol: str
+    xirr_percent: Optional[float] = None
+    market_value: float
+    profit: float
+
+
+class PerformanceResponse(BaseModel):
+    """GET /api/portfolio/performance yanıtı."""
+    as_of: datetime                                 # Değerleme anı (UTC)
+    start: Optional[date] = None                    # İlk işlem günü
+    portfolio: Optional[PortfolioReturns] = None    # İşlem yoksa None
+    stocks: List[StockReturns]
+
+
+class RiskMetrics(BaseModel):
+    """Risk ölçüleri (yüzde/TL; veri yetersizse None)."""
+    market_value: Optional[float] = None                # Son kapanışla değer (TL)
+    volatility_percent: Optional[float] = None          # Yıllık volatilite (tüm dönem)
+    rolling_volatility_percent: Optional[float] = None  # Yıllık volatilite (son pencere)
+    max_drawdown_percent: Optional[float] = None        # Zirveden en derin düşüş (<= 0)
+    beta: Optional[float] = None                        # Karşılaştırma endeksine göre
+    var_historical_percent: Optional[float] = None      # 1 günlük tarihsel VaR
+    var_parametric_percent: Optional[float] = None      # 1 günlük parametrik VaR
+    var_historical: Optional[float] = None              # Tarihsel VaR (TL)
+    var_parametric: Optional[float] = None              # Parametrik VaR (TL)
+
+
+class StockRisk(RiskMetrics):
+    """Hisse bazında risk ölçüleri."""
+    stock_symbol: str
+
+
+class VolatilityPoint(BaseModel):
+    """Kayan volatilite noktası."""
+    day: date
+    value: float            # Yıllık volatilite (%)
+
+
+class RiskResponse(BaseModel):
+    """GET /api/portfolio/risk yanıtı."""
+    as_of: Optional[date] = None        # Son kapanış günü
+    days: int                           # Geriye bakılan takvim günü
+    window: int                         # Kayan volatilite penceresi (işlem günü)
+    confidence: float                   # VaR güven düzeyi
+    benchmark: Optional[str] = None     # Beta endeksi (geçmişi yoksa None)
+    portfolio: Optional[RiskMetrics] = None
+    stocks: List[StockRisk]
+    rolling_volatility: List[VolatilityPoint]   # Portföyün kayan volatilitesi
+
+
+class CorrelationResponse(BaseModel):
+    """
+    GET /api/portfolio/correlation yanıtı.
+
+    Matrisler üst üçgen (köşegen dahil) satır sırasıyla düz listedir:
+    N hisse için N(N+1)/2 değer, (i, j) (i <= j) elemanının yeri
+    i * N - i(i-1)/2 + (j - i). Verisi yetersiz çiftler None.
+    """
+    as_of: Optional[date] = None                    # Penceredeki son gün
+    window: int                                     # İşlem günü
+    format: str                                     # "upper"
+    symbols: List[str]
+    volatility_percent: List[Optional[float]]       # Yıllık volatilite
+    correlation: List[Optional[float]]
+    covariance: List[Optional[float]]               # Yıllık
+    observations: List[int]                         # Ortak gün sayısı
+
+
+class OptimizedPortfolio(BaseModel):
+    """Önerilen portföy."""
+    expected_return_percent: float      # Yıllık beklenen getiri
+    volatility_percent: float           # Yıllık volatilite
+    sharpe: Optional[float] = None
+    weights: Dict[str, float]           # Hisse -> ağırlık (sıfır olanlar yok)
+
+
+class FrontierPoint(BaseModel):
+    """Etkin sınır noktası."""
+    expected_return_percent: float
+    volatility_percent: float
+    weights: List[float]                # `symbols` sırasıyla
+
+
+class OptimizationResponse(BaseModel):
+    """GET /api/portfolio/optimize yanıtı."""
+    as_of: Optional[date] = None        # Kovaryans penceresinin son günü
+    window: int                         # İşlem günü
+    max_weight: float                   # Ağırlık üst sınırı
+    risk_free_rate: float               # Yıllık risksiz getiri (Sharpe için)
+    symbols: List[str]                  # Optimizasyona giren hisseler
+    excluded: List[str]                 # Yeterli fiyat geçmişi olmayanlar
+    min_variance: Optional[OptimizedPortfolio] = None
+    max_sharpe: Optional[OptimizedPortfolio] = None
+    frontier: List[FrontierPoint]       # Artan getiri sırasıyla
@@ -108,6 +108,13 @@ class StockSummary(BaseModel):
     total_commission: float        # Toplam komisyon (TL)
     total_buy_quantity: float      # Toplam alış adedi
     total_sell_quantity: float     # Toplam satış adedi
+    # Piyasa değeri (hissenin fiyatı yoksa None)
+    last_price: Optional[float] = None          # Son fiyat (TL)
+    price_time: Optional[datetime] = None       # Son fiyatın zamanı
+    market_value: Optional[float] = None        # Net adet × son fiyat
+    unrealized_pnl: Optional[float] = None      # Piyasa değeri - net adet × ortalama maliyet
+    unrealized_pnl_percent: Optional[float] = None
+    daily_pnl: Optional[float] = None           # Net adet × (son fiyat - önceki kapanış)
 
 
 class PortfolioSummary(BaseModel):
@@ -117,3 +124,45 @@ class PortfolioSummary(BaseModel):
     total_commission: float        # Toplam ödenen komisyon
     stock_count: int               # Portföydeki farklı hisse sayısı
     stocks: List[StockSummary]     # Her hissenin detaylı özeti
+    # Fiyatı olan hisselerin toplamları (hiçbirinin fiyatı yoksa None)
+    total_market_value: Optional[float] = None
+    total_unrealized_pnl: Optional[float] = None
+    total_daily_pnl: Optional[float] = None
+    stale: bool = False            # True: önceki sürümün özeti (arka planda yenileniyor)
+    as_of: Optional[datetime] = None  # Geçmiş tarihli özetlerde özetin anı
+
+
+# ===========================================================================
+# DEĞİŞİKLİK AKIŞI (SYNC) ŞEMALARI
+# ===========================================================================
+
+class ChangeEntry(BaseModel):
+    """Bir işlemin son değişikliği."""
+    seq: int                                       # Değişikliğin sıra numarası
+    op: str                                        # insert / update / delete
+    transaction_id: int
+    transaction: Optional[TransactionResponse] = None  # delete için None (tombstone)
+
+
+class ChangeFeedResponse(BaseModel):
+    """GET /api/transactions/changes yanıtı."""
+    changes: List[ChangeEntry]
+    next_since: int                # Sonraki istekte `since` olarak gönderilecek değer
+    has_more: bool                 # True: aynı istek next_since ile tekrarlanmalı
+    data_version: int              # Kullanıcının güncel veri sürümü
+
+
+class DigestBucket(BaseModel):
+    """Bir ay, gün veya işlemin özeti."""
+    key: str                       # "2024-01", "2024-01-03" veya işlem ID'si
+    digest: str                    # SHA-256 (hex)
+    count: int                     # Kapsamdaki işlem sayısı
+
+
+class DigestResponse(BaseModel):
+    """GET /api/transactions/digests yanıtı."""
+    level: str                     # Kovaların düzeyi: month / day / row
+    key: Optional[str] = None      # İstenen ay veya gün (kök için None)
+    digest: str                    # İstenen kapsamın özeti
+    count: int
+    buckets: List[DigestBucket]
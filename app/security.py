@@ -11,7 +11,7 @@ from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
@@ -133,6 +133,7 @@ def verify_token(token: str) -> dict:
 # ===========================================================================
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ):
@@ -148,13 +149,22 @@ def get_current_user(
         1. Authorization header'dan Bearer token'ı alır
         2. Token'ı doğrular
         3. Token'daki email ile kullanıcıyı veritabanından bulur
-        4. Kullanıcı nesnesi döndürür
+        4. Kullanıcı ID'sini request.state'e yazar (profilleme/loglama için)
+        5. Kullanıcı nesnesi döndürür
+
+    POST /api/batch alt isteklerinde kullanıcı üst istekte doğrulanmıştır;
+    bu durumda token tekrar çözülmez ve veritabanı sorgusu yapılmaz.
 
     Raises:
         HTTPException 401: Token geçersizse veya kullanıcı bulunamazsa
     """
     from app.models.user import User  # Circular import'u önlemek için burada import
 
+    # Batch alt isteği: state sunucu tarafında oluşturulur (bkz. routers/batch.py)
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Kimlik doğrulanamadı.",
@@ -180,4 +190,5 @@ def get_current_user(
             detail="Bu hesap devre dışı bırakılmış.",
         )
 
+    request.state.user_id = user.id
     return user
@@ -0,0 +1,240 @@
+"""
+Correlation Service - Kovaryans ve Korelasyon Matrisleri
+==========================================================
+Hisselerin son `window` işlem günündeki günlük getirilerinden yıllık
+kovaryans, korelasyon ve ortalama getiri (çeşitlendirme görünümü ve
+portföy optimizasyonu için).
+
+- Getiri matrisi: Kapanışlar ortak gün ekseninde hizalanır (eksik günlerde
+  önceki kapanış taşınır); ilk kapanışından önceki günler NaN kalır.
+- Eşli (pairwise) istatistikler: Her hisse çifti, ikisinin de getirisi
+  olan günler üzerinden hesaplanır; tamamı dört matris çarpımıyla
+  vektörel yapılır. Ortak gün sayısı pencerenin yarısından azsa NaN.
+
+İki seviyeli önbellek:
+- Hisse kapanışları (hisse, aralık, depo sürümü): Farklı ama kesişen hisse
+  kümeleri ortak hisseleri depodan tekrar okumaz.
+- Matris (hisse kümesi özeti, pencere, işlem günü, depo sürümü): Aynı
+  küme için tekrar hesaplanmaz. Matrisler üst üçgen olarak saklanır.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.history_store import PriceHistoryStore, align_closes, history_store
+from app.models.user import User
+from app.services.risk_service import TRADING_DAYS_PER_YEAR, daily_returns
+from app.services.snapshot_service import positions_as_of
+
+DEFAULT_CORRELATION_WINDOW = 252
+
+
+@dataclass
+class CovarianceMatrix:
+    """Hisselerin yıllık getiri istatistikleri (sıra: symbols)."""
+    symbols: List[str]
+    end: Optional[date]         # Penceredeki son gün
+    mean: np.ndarray            # (N,) yıllık ortalama getiri
+    covariance: np.ndarray      # (N x N) yıllık kovaryans
+    correlation: np.ndarray     # (N x N)
+    observations: np.ndarray    # (N x N) ortak gün sayısı
+
+
+# ===========================================================================
+# HESAPLAMA
+# ===========================================================================
+
+def pairwise_statistics(
+    returns: np.ndarray, min_observations: int = 2
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Eksik verili getiri matrisinden eşli kovaryans ve korelasyon.
+
+    Args:
+        returns: (gün x hisse) günlük getiriler, NaN: veri yok
+        min_observations: Çiftin en az ortak gün sayısı
+
+    Returns:
+        (ortalama, kovaryans, korelasyon, ortak gün sayısı); günlük
+    """
+    valid = np.isfinite(returns)
+    mask = valid.astype(float)
+    values = np.where(valid, returns, 0.0)
+    n = mask.T @ mask                   # n[i, j]: i ve j'nin ortak günleri
+    sums = values.T @ mask              # sums[i, j]: ortak günlerde i'nin toplamı
+    squares = (values ** 2).T @ mask
+    products = values.T @ values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = (products - sums * sums.T / n) / (n - 1)
+        variance = (squares - sums ** 2 / n) / (n - 1)
+        correlation = covariance / np.sqrt(variance * variance.T)
+        mean = np.diag(sums) / np.diag(n)
+    enough = n >= max(min_observations, 2)
+    covariance = np.where(enough, covariance, np.nan)
+    correlation = np.where(enough, np.clip(correlation, -1.0, 1.0), np.nan)
+    np.fill_diagonal(correlation, np.where(np.diag(enough), 1.0, np.nan))
+    return np.where(np.diag(enough), mean, np.nan), covariance, correlation, n.astype(np.int64)
+
+
+def _lookback(window: int) -> int:
+    """`window` işlem günü için okunacak takvim günü (hafta sonu ve tatiller dahil)."""
+    return int(window * 1.5) + 15
+
+
+def _symbol_closes(
+    store: PriceHistoryStore, symbol: str, start: date, end: date, generation: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hissenin kapanışları; (hisse, aralık, depo sürümü) ile önbellekte."""
+    key = f"price_closes:{symbol}:{start}:{end}:{generation}"
+    payload = cache_get(key, "price_closes")
+    if payload is None:
+        days, closes = store.closes(symbol, start, end)
+        payload = np.concatenate([days.astype("<i8"), closes.astype("<f8").view("<i8")]).tobytes()
+        get_cache().set(key, payload)
+    packed = np.frombuffer(payload, dtype="<i8")
+    half = len(packed) // 2
+    return packed[:half].astype("datetime64[D]"), packed[half:].view("<f8")
+
+
+def return_matrix(
+    symbols: Sequence[str], window: int, end: date, store: Optional[PriceHistoryStore] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Son `window` işlem gününün hizalanmış günlük getirileri.
+
+    Returns:
+        (günler, (gün x hisse) getiriler)
+    """
+    store = store or history_store
+    start = end - timedelta(days=_lookback(window))
+    generation = store.generation()
+    days, closes = align_closes(
+        [_symbol_closes(store, symbol, start, end, generation) for symbol in symbols]
+    )
+    days, closes = days[-(window + 1):], closes[-(window + 1):]
+    return days[1:], daily_returns(closes)
+
+
+def _pack(matrix: CovarianceMatrix) -> bytes:
+    upper = np.triu_indices(len(matrix.symbols))
+    header = orjson.dumps({"symbols": matrix.symbols, "end": matrix.end})
+    body = np.concatenate([
+        matrix.mean, matrix.covariance[upper], matrix.correlation[upper],
+        matrix.observations[upper].astype(float),
+    ])
+    return header + b"\n" + body.astype("<f8").tobytes()
+
+
+def _unpack(payload: bytes) -> CovarianceMatrix:
+    header, body = payload.split(b"\n", 1)
+    meta = orjson.loads(header)
+    count = len(meta["symbols"])
+    upper = np.triu_indices(count)
+    size = len(upper[0])
+    values = np.frombuffer(body, dtype="<f8")
+
+    def symmetric(packed: np.ndarray) -> np.ndarray:
+        result = np.empty((count, count))
+        result[upper] = packed
+        result.T[upper] = packed
+        return result
+
+    return CovarianceMatrix(
+        symbols=meta["symbols"],
+        end=date.fromisoformat(meta["end"]) if meta["end"] else None,
+        mean=values[:count].copy(),
+        covariance=symmetric(values[count:count + size]),
+        correlation=symmetric(values[count + size:count + 2 * size]),
+        observations=symmetric(values[count + 2 * size:]).astype(np.int64),
+    )
+
+
+def covariance_matrix(
+    symbols: Sequence[str],
+    window: int = DEFAULT_CORRELATION_WINDOW,
+    day: Optional[date] = None,
+    store: Optional[PriceHistoryStore] = None,
+) -> CovarianceMatrix:
+    """
+    Hisselerin `day` gününe kadarki son `window` işlem günündeki yıllık
+    getiri istatistikleri.
+
+    Sonuç (sıralı hisse kümesinin özeti, pencere, gün, depo sürümü) ile
+    önbelleğe alınır.
+
+    Args:
+        symbols: Hisse kodları (sonuç alfabetik sıradadır)
+        window: İşlem günü sayısı
+        day: Pencerenin son günü (varsayılan: bugün, UTC)
+        store: Fiyat geçmişi deposu (varsayılan: history_store)
+    """
+    store = store or history_store
+    day = day or datetime.now(timezone.utc).date()
+    symbols = sorted({s.upper() for s in symbols})
+    digest = hashlib.sha1(",".join(symbols).encode()).hexdigest()[:16]
+    key = f"covariance:{digest}:{len(symbols)}:{window}:{day}:{store.generation()}"
+    payload = cache_get(key, "covariance")
+    if payload is not None:
+        return _unpack(payload)
+
+    days, returns = return_matrix(symbols, window, day, store)
+    mean, covariance, correlation, observations = pairwise_statistics(returns, window // 2)
+    matrix = CovarianceMatrix(
+        symbols=symbols,
+        end=days[-1].item() if len(days) else None,
+        mean=mean * TRADING_DAYS_PER_YEAR,
+        covariance=covariance * TRADING_DAYS_PER_YEAR,
+        correlation=correlation,
+        observations=observations,
+    )
+    get_cache().set(key, _pack(matrix))
+    return matrix
+
+
+# ===========================================================================
+# PORTFÖY
+# ===========================================================================
+
+def held_symbols(db: Session, user_id: int, now: datetime) -> List[str]:
+    """Kullanıcının `now` anında elinde tuttuğu hisseler (alfabetik)."""
+    positions = positions_as_of(db, user_id, now.replace(tzinfo=None))
+    return sorted(symbol for symbol, p in positions.items() if p.quantity > 0)
+
+
+def _packed(matrix: np.ndarray, digits: int) -> list:
+    """Üst üçgen (köşegen dahil) satır sırasıyla; NaN -> None."""
+    values = np.round(matrix[np.triu_indices(len(matrix))], digits)
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def get_correlation_json(
+    db: Session, user: User, window: int, now: datetime
+) -> bytes:
+    """
+    Kullanıcının elindeki hisselerin korelasyon matrisi (CorrelationResponse).
+
+    Matrisler `format: "upper"` ile üst üçgen olarak döner: i <= j için
+    satır satır N(N+1)/2 değer; (i, j) elemanı i * N - i(i-1)/2 + (j - i).
+    """
+    symbols = held_symbols(db, user.id, now)
+    matrix = covariance_matrix(symbols, window, now.date())
+    volatility = np.sqrt(np.diag(matrix.covariance))
+    return orjson.dumps({
+        "as_of": matrix.end,
+        "window": window,
+        "format": "upper",
+        "symbols": matrix.symbols,
+        "volatility_percent": [
+            None if np.isnan(v) else round(v * 100, 2) for v in volatility.tolist()
+        ],
+        "correlation": _packed(matrix.correlation, 4),
+        "covariance": _packed(matrix.covariance, 6),
+        "observations": matrix.observations[np.triu_indices(len(symbols))].tolist(),
+    })
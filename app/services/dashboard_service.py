@@ -0,0 +1,228 @@
+"""
+Dashboard Service - Ana Sayfa Verileri
+========================================
+DashboardPage'in ihtiyaç duyduğu tüm parçaları (özet kartları, portföy
+tablosu, son işlemler, grafik serisi) tek bir veri anlık görüntüsünden
+hesaplar.
+
+Kullanıcının işlemleri tek bir SELECT ile okunur; bu nedenle tüm
+parçalar aynı veri sürümünü yansıtır ve her parça için ayrı sorgu,
+kimlik doğrulama veya oturum açılmaz. Parçalar okunan liste üzerinde tek
+geçişte hesaplanır. Hisselerin son fiyatları fiyat önbelleğinden tek
+seferde alınır.
+
+Kodlanmış yanıt (kullanıcı, veri sürümü, fiyat sürümü, parametreler)
+anahtarıyla önbelleğe alınır; önbellekte yoksa aynı anda gelen istekler
+tek bir hesaplamayı paylaşır (single-flight). Eski sürümlerin kayıtları
+parametreye bağlı olduğundan tek tek silinmez, LRU/TTL ile atılır.
+
+Portföy özetinde olduğu gibi `max-stale` kabul eden istemcilere, güncel
+yanıt arka planda hesaplanırken önceki sürümün yanıtı sunulur.
+"""
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.cache import (
+    CACHE_REQUESTS_TOTAL,
+    cache_get,
+    dashboard_key,
+    get_cache,
+    get_stale,
+    latest_dashboard_key,
+    set_latest,
+)
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.portfolio_service import (
+    market_totals,
+    summarize_stock,
+    transaction_to_dict,
+)
+from app.services.price_service import Quote, prices
+from app.singleflight import flights
+
+# Grafik için en fazla nokta sayısı (widget genişliğine göre)
+DEFAULT_CHART_POINTS = 60
+DEFAULT_RECENT_LIMIT = 5
+
+
+def _sample_points(points: List[dict], max_points: int) -> List[dict]:
+    """
+    Seriyi eşit aralıklarla seyreltir; ilk ve son nokta her zaman korunur.
+
+    Args:
+        points: Tarih sırasına göre noktalar
+        max_points: En fazla nokta sayısı
+
+    Returns:
+        En fazla max_points uzunluğunda liste
+    """
+    if len(points) <= max_points:
+        return points
+    step = (len(points) - 1) / (max_points - 1)
+    return [points[round(i * step)] for i in range(max_points)]
+
+
+def build_dashboard(
+    db: Session,
+    user_id: int,
+    recent_limit: int = DEFAULT_RECENT_LIMIT,
+    chart_points: int = DEFAULT_CHART_POINTS,
+    quotes: Optional[Dict[str, Quote]] = None,
+) -> dict:
+    """
+    Dashboard yanıtını tek sorgudan oluşturur.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        recent_limit: Son işlemler listesinin uzunluğu
+        chart_points: Grafik serisindeki en fazla nokta sayısı
+        quotes: Kullanılacak fiyatlar (verilmezse fiyat önbelleğinden)
+
+    Returns:
+        DashboardResponse yapısında sözlük
+    """
+    # Tek anlık görüntü: tüm işlemler tarih sırasıyla
+    transactions = (
+        db.query(Transaction)
+        .filter(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date, Transaction.id)
+        .all()
+    )
+
+    by_symbol: Dict[str, List[Transaction]] = defaultdict(list)
+    daily_net: Dict[date, float] = {}
+    net_invested = 0.0
+
+    for t in transactions:
+        by_symbol[t.stock_symbol].append(t)
+        if t.transaction_type == TransactionType.BUY:
+            net_invested += t.total_amount
+        else:
+            net_invested -= t.total_amount
+        # Aynı gündeki son değer gün sonu değeridir
+        daily_net[t.transaction_date.date()] = net_invested
+
+    if quotes is None:
+        quotes = prices.quotes(db, by_symbol)
+    holdings = [
+        summarize_stock(symbol, items, quotes.get(symbol))
+        for symbol, items in sorted(by_symbol.items())
+    ]
+    chart = [
+        {"date": day, "net_invested": round(value, 2)} for day, value in daily_net.items()
+    ]
+
+    return {
+        "cards": {
+            "total_invested": round(sum(h.total_invested for h in holdings), 2),
+            "net_invested": round(net_invested, 2),
+            "total_commission": round(sum(h.total_commission for h in holdings), 2),
+            "stock_count": len(holdings),
+            "transaction_count": len(transactions),
+            **market_totals(holdings),
+        },
+        "holdings": [h.model_dump() for h in holdings],
+        # En yeni işlemler önce
+        "recent_transactions": [
+            transaction_to_dict(t) for t in reversed(transactions[-recent_limit:])
+        ] if recent_limit else [],
+        "chart": _sample_points(chart, chart_points),
+        "stale": False,
+    }
+
+
+# ===========================================================================
+# ÖNBELLEKLİ DASHBOARD
+# ===========================================================================
+
+def _compute_dashboard_json(
+    db: Session, user_id: int, data_version: int, recent_limit: int, chart_points: int
+) -> bytes:
+    """Dashboard'u hesaplar, kodlar ve her iki önbellek kaydını yazar."""
+    price_epoch, quotes = prices.snapshot(db)
+    encoded = orjson.dumps(build_dashboard(db, user_id, recent_limit, chart_points, quotes))
+    get_cache().set(
+        dashboard_key(user_id, data_version, price_epoch, recent_limit, chart_points), encoded
+    )
+    set_latest(
+        latest_dashboard_key(user_id, recent_limit, chart_points), data_version, price_epoch, encoded
+    )
+    return encoded
+
+
+def get_dashboard_json(
+    db: Session,
+    user: User,
+    recent_limit: int = DEFAULT_RECENT_LIMIT,
+    chart_points: int = DEFAULT_CHART_POINTS,
+    max_stale: float = 0,
+) -> Tuple[bytes, Optional[float]]:
+    """
+    Dashboard yanıtını JSON (bytes) olarak döndürür; önbellekte varsa
+    veritabanı sorgusu ve hesaplama yapılmaz.
+
+    max_stale > 0 ise ve önceki sürümün yanıtı bu süreden yeniyse, hesaplama
+    beklenmeden o yanıt `stale: true` ile döndürülür; çağıran taraf
+    refresh_dashboard'u arka planda çalıştırmalıdır.
+
+    Args:
+        db: Veritabanı oturumu
+        user: Mevcut kullanıcı (id ve data_version)
+        recent_limit: Son işlemler listesinin uzunluğu
+        chart_points: Grafik serisindeki en fazla nokta sayısı
+        max_stale: Kabul edilen en fazla bayatlık (saniye)
+
+    Returns:
+        (DashboardResponse yapısında JSON bytes, bayat ise yaşı / güncel ise None)
+    """
+    price_epoch = prices.epoch(db)
+    key = dashboard_key(user.id, user.data_version, price_epoch, recent_limit, chart_points)
+    payload = cache_get(key, "dashboard")
+    if payload is not None:
+        return payload, None
+
+    if max_stale > 0:
+        stale = get_stale(
+            latest_dashboard_key(user.id, recent_limit, chart_points),
+            user.data_version, price_epoch, max_stale,
+        )
+        if stale is not None:
+            CACHE_REQUESTS_TOTAL.inc(("dashboard", "stale"))
+            return stale
+
+    # Aynı kullanıcı/sürüm/parametreler için eşzamanlı istekler tek hesaplamayı bekler
+    payload = flights.run(
+        "dashboard",
+        (user.id, user.data_version, price_epoch, recent_limit, chart_points),
+        lambda: _compute_dashboard_json(db, user.id, user.data_version, recent_limit, chart_points),
+    )
+    return payload, None
+
+
+def refresh_dashboard(
+    bind, user_id: int, data_version: int, recent_limit: int, chart_points: int
+) -> None:
+    """
+    Bayat dashboard sunulduktan sonra güncel yanıtı arka planda hesaplar.
+
+    İstek oturumu yanıttan sonra kapandığından aynı engine üzerinde yeni
+    bir oturum açılır. Aynı sürüm için devam eden bir hesaplama varsa ona
+    katılır.
+    """
+    with Session(bind=bind) as db:
+        price_epoch = prices.epoch(db)
+        key = dashboard_key(user_id, data_version, price_epoch, recent_limit, chart_points)
+        if get_cache().get(key) is not None:
+            return
+        flights.run(
+            "dashboard",
+            (user_id, data_version, price_epoch, recent_limit, chart_points),
+            lambda: _compute_dashboard_json(db, user_id, data_version, recent_limit, chart_points),
+        )
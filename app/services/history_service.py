@@ -0,0 +1,391 @@
+"""
+Portföy Değer Geçmişi Servisi
+===============================
+Dashboard grafiği için portföyün dönem içindeki değer serisini hesaplar.
+
+Hesaplama tamamen vektörel yapılır (hisse başına döngü yalnızca fiyat
+serilerini okurken vardır):
+- Zaman ekseni: 1G için saatlik, diğer dönemler için günlük noktalar.
+- Adet matrisi (zaman x hisse): işlemlerin adet değişimleri ilgili zaman
+  noktasına eklenir ve zaman ekseninde kümülatif toplanır.
+- Fiyat matrisi (zaman x hisse): her noktada o ana kadarki son kapanış
+  (günlük: fiyat geçmişi deposu, saatlik: 1h fiyat çubukları). Fiyatı
+  olmayan noktalarda son işlem fiyatı kullanılır; son nokta güncel
+  piyasa fiyatıdır. Saatlik eksende bir günün kapanışı ancak piyasa
+  kapandıktan sonra geçerlidir; öncesinde önceki günün kapanışı kullanılır.
+- Portföy değeri = satır bazında (adet x fiyat) toplamı.
+
+Dönemin başından önce günlük anlık görüntü varsa işlemler oradan
+okunur; uzun geçmişi olan portföylerde tüm işlemler taranmaz.
+
+Seri, istenen nokta sayısına LTTB (Largest-Triangle-Three-Buckets) ile
+seyreltilir: tepe ve dipler korunur, yanıt boyutu dönem uzunluğundan
+bağımsız kalır.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.history_store import PriceHistoryStore, history_store
+from app.models.price_bar import BarInterval, PriceBar
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.price_service import prices
+from app.services.snapshot_service import latest_snapshot
+from app.services.tick_service import MARKET_CLOSE_SECONDS, MARKET_UTC_OFFSET_SECONDS
+
+# Dönem kodu -> (gün sayısı, nokta aralığı)
+PERIODS: Dict[str, Tuple[int, str]] = {
+    "1G": (1, "h"),     # 1 gün, saatlik
+    "1H": (7, "D"),     # 1 hafta
+    "1A": (30, "D"),    # 1 ay
+    "1Y": (365, "D"),   # 1 yıl
+}
+DEFAULT_PERIOD = "1Y"
+DEFAULT_HISTORY_POINTS = 120
+
+
+# ===========================================================================
+# SEYRELTME (LTTB)
+# ===========================================================================
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets ile korunacak noktaların indeksleri.
+
+    İlk ve son nokta her zaman korunur; aradaki noktalar threshold - 2
+    kovaya bölünür ve her kovadan, önceki seçilen nokta ile sonraki
+    kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+
+    Args:
+        x: Artan x değerleri
+        y: y değerleri
+        threshold: En fazla nokta sayısı
+
+    Returns:
+        Seçilen noktaların artan indeksleri
+    """
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1][:max(threshold, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        # Sonraki kovanın ortalaması (son kova için son nokta)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+# ===========================================================================
+# MATRİSLER
+# ===========================================================================
+
+def _latest_at(times: np.ndarray, values: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    """Eksenin her noktasında o ana kadarki (dahil) son değer; yoksa NaN."""
+    position = np.searchsorted(times, axis, side="right") - 1
+    result = np.full(len(axis), np.nan)
+    found = position >= 0
+    result[found] = values[position[found]]
+    return result
+
+
+def position_matrix(
+    axis: np.ndarray, times: np.ndarray, columns: np.ndarray, deltas: np.ndarray, width: int
+) -> np.ndarray:
+    """
+    Zaman x hisse kümülatif adet matrisi.
+
+    Args:
+        axis: Artan zaman noktaları
+        times: İşlem zamanları (eksenle aynı birimde, noktaya yuvarlanmış)
+        columns: İşlemlerin hisse sütun numaraları
+        deltas: Adet değişimleri (alış +, satış -)
+        width: Hisse sayısı
+
+    Returns:
+        (len(axis), width) matrisi; eksen sonrasındaki işlemler dahil edilmez
+    """
+    rows = np.searchsorted(axis, times, side="left")
+    # Eksenden önceki işlemler ilk noktaya, sonrakiler hiç eklenmez
+    inside = rows < len(axis)
+    changes = np.zeros((len(axis), width))
+    np.add.at(changes, (rows[inside], columns[inside]), deltas[inside])
+    return np.cumsum(changes, axis=0)
+
+
+def _load_transactions(
+    db: Session, user_id: int, start: Optional[date]
+) -> Dict[str, np.ndarray]:
+    """
+    Kullanıcının işlemlerini sütun dizileri olarak okur (tek sorgu).
+
+    start gününden önceki en yakın anlık görüntü varsa, o günün
+    pozisyonları başlangıç satırları olarak eklenir (net adet, son işlem
+    fiyatı, net yatırım) ve sadece anlık görüntüden sonraki işlemler okunur.
+    """
+    rows = []
+    query = select(
+        Transaction.stock_symbol,
+        Transaction.transaction_type,
+        Transaction.quantity,
+        Transaction.price_per_unit,
+        Transaction.total_amount,
+        Transaction.transaction_date,
+    ).where(Transaction.user_id == user_id)
+
+    snapshot = latest_snapshot(db, user_id, before=start) if start is not None else None
+    if snapshot is not None:
+        day, _, positions = snapshot
+        seed_time = datetime.combine(day, time.min)
+        rows = [
+            (symbol, TransactionType.BUY, p.quantity, p.last_trade_price,
+             p.buy_amount - p.sell_amount, seed_time)
+            for symbol, p in positions.items()
+        ]
+        query = query.where(Transaction.transaction_date >= seed_time + timedelta(days=1))
+
+    rows += db.execute(query.order_by(Transaction.transaction_date, Transaction.id)).all()
+    symbols, types, quantity, unit_price, amount, when = zip(*rows) if rows else ([],) * 6
+    sign = np.array([1.0 if t == TransactionType.BUY else -1.0 for t in types])
+    return {
+        "symbol": np.array(symbols, dtype=object),
+        "sign": sign,
+        "quantity": np.array(quantity, dtype=float),
+        "price": np.array(unit_price, dtype=float),
+        "amount": np.array(amount, dtype=float),
+        "time": np.array(when, dtype="datetime64[s]"),
+    }
+
+
+def _daily_closes(
+    store: PriceHistoryStore, symbol: str, end: datetime, at_close: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fiyat geçmişi deposundaki günlük kapanışlar (zaman, fiyat).
+
+    Zaman varsayılan olarak günün başıdır (günlük nokta o günün sonunu
+    temsil eder). at_close=True ise kapanışın belli olduğu an (UTC) döner;
+    saatlik eksende gün içindeki noktalar o günün kapanışını görmez.
+    """
+    history = store.read(symbol, None, end.date())
+    closes = history["close"]
+    valid = ~np.isnan(closes)
+    times = history["date"][valid].astype("datetime64[s]")
+    if at_close:
+        times = times + np.timedelta64(MARKET_CLOSE_SECONDS - MARKET_UTC_OFFSET_SECONDS, "s")
+    return times, np.asarray(closes[valid])
+
+
+def _hourly_closes(
+    db: Session, symbols: Sequence[str], start: datetime, end: datetime
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Dönemdeki saatlik çubuk kapanışları (tek sorgu)."""
+    rows = db.execute(
+        select(PriceBar.stock_symbol, PriceBar.bucket_start, PriceBar.close)
+        .where(
+            PriceBar.interval == BarInterval.HOUR,
+            PriceBar.stock_symbol.in_(symbols),
+            PriceBar.bucket_start >= start,
+            PriceBar.bucket_start <= end,
+        )
+        .order_by(PriceBar.stock_symbol, PriceBar.bucket_start)
+    ).all()
+    series: Dict[str, Tuple[List[datetime], List[float]]] = {}
+    for symbol, bucket_start, close in rows:
+        times, values = series.setdefault(symbol, ([], []))
+        times.append(bucket_start)
+        values.append(close)
+    return {
+        symbol: (np.array(times, dtype="datetime64[s]"), np.array(values, dtype=float))
+        for symbol, (times, values) in series.items()
+    }
+
+
+def _axis(start: Optional[datetime], now: datetime, first: np.datetime64, unit: str) -> np.ndarray:
+    """start..now arası zaman noktaları (ilk işlemden öncesi atlanır)."""
+    end = np.datetime64(now.replace(tzinfo=None), unit)
+    first = first.astype(f"datetime64[{unit}]")
+    if start is not None:
+        first = max(np.datetime64(start.replace(tzinfo=None), unit), first)
+    return np.arange(first, end + 1).astype("datetime64[s]")
+
+
+# ===========================================================================
+# DEĞER SERİSİ
+# ===========================================================================
+
+@dataclass
+class ValueSeries:
+    """Portföyün zaman eksenindeki değerlemesi."""
+    axis: np.ndarray        # Zaman noktaları (datetime64[s])
+    symbols: np.ndarray     # Hisse kodları (matris sütunları, sıralı)
+    quantity: np.ndarray    # (zaman x hisse) elde tutulan adet
+    price: np.ndarray       # (zaman x hisse) fiyat
+    invested: np.ndarray    # Kümülatif net yatırım (alış - satış tutarı)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Her noktadaki portföy değeri."""
+        return np.nansum(self.quantity * self.price, axis=1)
+
+
+def value_series(
+    db: Session,
+    user_id: int,
+    start: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+    unit: str = "D",
+    store: Optional[PriceHistoryStore] = None,
+) -> Optional[ValueSeries]:
+    """
+    Portföyün start..now arasındaki adet x fiyat matrisleri.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        start: İlk nokta (None: ilk işlem günü)
+        now: Son nokta (varsayılan: şimdi, UTC)
+        unit: Nokta aralığı: "D" (günlük) veya "h" (saatlik)
+        store: Günlük fiyat geçmişi deposu (varsayılan: history_store)
+
+    Returns:
+        ValueSeries veya None (dönemde işlem/pozisyon yoksa)
+    """
+    now = now or datetime.now(timezone.utc)
+    store = store or history_store
+    txs = _load_transactions(db, user_id, start.date() if start is not None else None)
+    if not len(txs["symbol"]):
+        return None
+
+    axis = _axis(start, now, txs["time"][0], unit)
+    if not len(axis):
+        return None
+    # Gün içindeki her işlem o günün (saatin) noktasına yazılır
+    tx_points = txs["time"].astype(f"datetime64[{unit}]").astype("datetime64[s]")
+
+    symbols, columns = np.unique(txs["symbol"], return_inverse=True)
+    width = len(symbols)
+    quantity = position_matrix(axis, tx_points, columns, txs["sign"] * txs["quantity"], width)
+    invested = position_matrix(
+        axis, tx_points, np.zeros(len(columns), dtype=np.int64), txs["sign"] * txs["amount"], 1
+    )[:, 0]
+
+    # Fiyat matrisi: piyasa kapanışı, yoksa son işlem fiyatı
+    axis_end = axis[-1].item()
+    hourly = (
+        _hourly_closes(db, list(symbols), axis[0].item(), axis_end) if unit == "h" else {}
+    )
+    price = np.empty((len(axis), width))
+    for column, symbol in enumerate(symbols):
+        times, closes = _daily_closes(store, symbol, axis_end, at_close=unit == "h")
+        if symbol in hourly:
+            # Gün sonu kapanışları saatlik serinin öncesini doldurur
+            hour_times, hour_closes = hourly[symbol]
+            keep = times < hour_times[0]
+            times = np.concatenate([times[keep], hour_times])
+            closes = np.concatenate([closes[keep], hour_closes])
+        own = columns == column
+        fallback = _latest_at(tx_points[own], txs["price"][own], axis)
+        market = _latest_at(times, closes, axis)
+        price[:, column] = np.where(np.isnan(market), fallback, market)
+
+    # Son nokta güncel fiyatlarla (dashboard kartlarıyla aynı değer)
+    for symbol, quote in prices.quotes(db, symbols).items():
+        price[-1, int(np.searchsorted(symbols, symbol))] = quote.last_price
+
+    return ValueSeries(axis, symbols, quantity, price, invested)
+
+
+def portfolio_history(
+    db: Session,
+    user_id: int,
+    period: str = DEFAULT_PERIOD,
+    points: int = DEFAULT_HISTORY_POINTS,
+    now: Optional[datetime] = None,
+    store: Optional[PriceHistoryStore] = None,
+) -> dict:
+    """
+    Portföyün dönem içindeki değer ve net yatırım serisi.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        period: Dönem kodu (PERIODS)
+        points: Yanıttaki en fazla nokta sayısı
+        now: Serinin son anı (varsayılan: şimdi, UTC)
+        store: Günlük fiyat geçmişi deposu (varsayılan: history_store)
+
+    Returns:
+        PortfolioHistoryResponse yapısında sözlük
+    """
+    now = now or datetime.now(timezone.utc)
+    days, unit = PERIODS[period]
+    result = {"period": period, "interval": unit, "total_points": 0, "points": []}
+    series = value_series(db, user_id, now - timedelta(days=days), now, unit, store)
+    if series is None:
+        return result
+
+    values = series.values
+    keep = lttb_indices(series.axis.astype(np.int64), values, points)
+    times = series.axis[keep].astype(datetime)
+    result["total_points"] = len(series.axis)
+    result["points"] = [
+        {"time": t, "value": round(float(v), 2), "net_invested": round(float(n), 2)}
+        for t, v, n in zip(times, values[keep], series.invested[keep])
+    ]
+    return result
+
+
+def period_anchor(period: str, now: datetime) -> str:
+    """Dönemin son noktası (gün veya saat); önbellek anahtarı ve ETag için."""
+    return str(np.datetime64(now.replace(tzinfo=None), PERIODS[period][1]))
+
+
+def get_portfolio_history_json(
+    db: Session,
+    user: User,
+    period: str,
+    points: int,
+    version: Tuple,
+    now: datetime,
+) -> bytes:
+    """
+    portfolio_history sonucunu JSON (bytes) olarak döndürür.
+
+    Seri (kullanıcı, veri sürümü, dönem, nokta sayısı) ve `version`
+    (fiyat sürümü, geçmiş deposu sürümü, dönem sonu) anahtarıyla önbelleğe
+    alınır; yeni gün/saatte veya yeni fiyatlarla yeniden hesaplanır.
+    """
+    key = (
+        f"portfolio_history:{user.id}:{user.data_version}:{period}:{points}:"
+        + ":".join(str(part) for part in version)
+    )
+    payload = cache_get(key, "portfolio_history")
+    if payload is None:
+        payload = orjson.dumps(portfolio_history(db, user.id, period, points, now))
+        get_cache().set(key, payload)
+    return payload
@@ -0,0 +1,300 @@
+"""
+Optimizer Service - Ortalama-Varyans Optimizasyonu
+====================================================
+Elde tutulan hisseler için önerilen ağırlıklar: etkin sınır (efficient
+frontier), minimum varyans ve maksimum Sharpe portföyleri.
+
+Kısıtlar: Sadece uzun pozisyon (w >= 0), ağırlık üst sınırı (w <= cap) ve
+ağırlıkların toplamı 1. Dış çözücü kullanılmaz:
+
+- Her sınır noktası  min 1/2 wᵀΣw - t·μᵀw  problemidir (t: getiri
+  ağırlığı). Tüm t değerleri (K x N) ağırlık matrisinde birlikte,
+  hızlandırılmış projeksiyonlu gradyan (FISTA) ile çözülür.
+- Projeksiyon: Kısıt kümesine öklid izdüşümü w = clip(v - τ, 0, cap);
+  τ her satır için ikiye bölme ile aranır ve aktif küme üzerinden tam
+  olarak düzeltilir.
+- t = 0 minimum varyans portföyüdür. Maksimum Sharpe, sınırın en iyi
+  noktasının komşu t değerleri arasında her seferinde daralan taramalarla
+  bulunur (her tarama tek bir toplu çözümdür).
+
+Kovaryans ve beklenen getiri (tarihsel yıllık ortalama)
+correlation_service'ten gelir; fiyat geçmişi olmayan hisseler dışarıda
+bırakılır. Kovaryans eşli hesaplandığından negatif öz değerleri sıfıra
+kırpılır (pozitif yarı tanımlı hale getirilir).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import numpy as np
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.history_store import PriceHistoryStore
+from app.models.user import User
+from app.services.correlation_service import covariance_matrix, held_symbols
+
+DEFAULT_FRONTIER_POINTS = 20
+MAX_ITERATIONS = 2000
+TOLERANCE = 1e-8
+# İzdüşümde τ: ikiye bölme adımları + aktif küme üzerinden tam çözüm adımları
+BISECTION_STEPS = 15
+EXACT_STEPS = 3
+# Maksimum Sharpe araması: tarama sayısı ve her taramadaki t değeri
+REFINE_ROUNDS = 3
+REFINE_POINTS = 16
+
+
+@dataclass
+class Frontier:
+    """Etkin sınır (satırlar artan getiri ağırlığına göre)."""
+    weights: np.ndarray         # (K x N)
+    returns: np.ndarray         # (K,) yıllık beklenen getiri
+    volatility: np.ndarray      # (K,) yıllık volatilite
+    min_variance: np.ndarray    # (N,)
+    max_sharpe: np.ndarray      # (N,)
+
+
+# ===========================================================================
+# ÇÖZÜCÜ
+# ===========================================================================
+
+def project_capped_simplex(points: np.ndarray, cap: float = 1.0) -> np.ndarray:
+    """
+    Satırların {w : Σw = 1, 0 <= w <= cap} kümesine öklid izdüşümü.
+
+    Args:
+        points: (K x N) matris
+        cap: Ağırlık üst sınırı; cap * N >= 1 olmalı
+
+    Returns:
+        (K x N) izdüşüm
+    """
+    points = np.atleast_2d(points)
+    # Σ clip(v - τ, 0, cap) τ'da azalan: [min(v) - cap, max(v)] aralığında 1'i kesiyor
+    low = points.min(axis=1) - cap
+    high = points.max(axis=1)
+    for _ in range(BISECTION_STEPS):
+        tau = (low + high) / 2
+        total = np.clip(points - tau[:, None], 0.0, cap).sum(axis=1)
+        low = np.where(total > 1.0, tau, low)
+        high = np.where(total > 1.0, high, tau)
+    # τ'ya yakın: aktif küme üzerinden tam çöz (parçalı doğrusal f için
+    # Newton adımı; küme değişmeyince sonuç kesin)
+    tau = (low + high) / 2
+    for _ in range(EXACT_STEPS):
+        shifted = points - tau[:, None]
+        free = (shifted > 0) & (shifted < cap)
+        at_cap = (shifted >= cap).sum(axis=1)
+        count = free.sum(axis=1)
+        exact = ((points * free).sum(axis=1) + cap * at_cap - 1.0) / np.maximum(count, 1)
+        tau = np.where(count > 0, exact, tau)
+    return np.clip(points - tau[:, None], 0.0, cap)
+
+
+def solve_mean_variance(
+    covariance: np.ndarray, expected: np.ndarray, tradeoffs: np.ndarray, cap: float = 1.0
+) -> np.ndarray:
+    """
+    Her t için  min 1/2 wᵀΣw - t·μᵀw  (kısıtlı) çözümü, tümü birlikte.
+
+    Args:
+        covariance: (N x N) pozitif yarı tanımlı kovaryans
+        expected: (N,) beklenen getiriler
+        tradeoffs: (K,) getiri ağırlıkları (t >= 0)
+        cap: Ağırlık üst sınırı
+
+    Returns:
+        (K x N) ağırlıklar
+    """
+    count = len(expected)
+    step = 1.0 / max(float(np.linalg.eigvalsh(covariance)[-1]), 1e-12)
+    linear = tradeoffs[:, None] * expected[None, :]
+    weights = project_capped_simplex(np.full((len(tradeoffs), count), 1.0 / count), cap)
+    momentum, previous = weights, weights
+    scale = np.ones((len(tradeoffs), 1))
+    for _ in range(MAX_ITERATIONS):
+        gradient = momentum @ covariance - linear
+        weights = project_capped_simplex(momentum - step * gradient, cap)
+        change = weights - previous
+        if np.abs(change).max() < TOLERANCE:
+            break
+        # Uyarlamalı yeniden başlatma: momentum iniş yönüne ters düşen satırlarda sıfırlanır
+        restart = ((momentum - weights) * change).sum(axis=1, keepdims=True) > 0
+        scale = np.where(restart, 1.0, scale)
+        next_scale = (1 + np.sqrt(1 + 4 * scale ** 2)) / 2
+        momentum = weights + ((scale - 1) / next_scale) * change
+        previous, scale = weights, next_scale
+    return weights
+
+
+def _statistics(weights: np.ndarray, covariance: np.ndarray, expected: np.ndarray):
+    returns = weights @ expected
+    volatility = np.sqrt(np.maximum(np.einsum("kn,nm,km->k", weights, covariance, weights), 0.0))
+    return returns, volatility
+
+
+def _sharpe(returns: np.ndarray, volatility: np.ndarray, risk_free: float) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(volatility > 0, (returns - risk_free) / volatility, -np.inf)
+
+
+def efficient_frontier(
+    covariance: np.ndarray,
+    expected: np.ndarray,
+    cap: float = 1.0,
+    points: int = DEFAULT_FRONTIER_POINTS,
+    risk_free: float = 0.0,
+) -> Frontier:
+    """
+    Kısıtlı etkin sınır, minimum varyans ve maksimum Sharpe portföyleri.
+
+    Args:
+        covariance: (N x N) yıllık kovaryans
+        expected: (N,) yıllık beklenen getiri
+        cap: Ağırlık üst sınırı (cap * N >= 1)
+        points: Sınır noktası sayısı
+        risk_free: Yıllık risksiz getiri (Sharpe için)
+
+    Raises:
+        ValueError: Kısıtlar sağlanamıyorsa
+    """
+    count = len(expected)
+    if count == 0 or cap * count < 1.0 - 1e-12:
+        raise ValueError("Ağırlık üst sınırıyla toplamı 1 olan portföy kurulamaz.")
+    # Pozitif yarı tanımlı hale getir
+    values, vectors = np.linalg.eigh(covariance)
+    covariance = (vectors * np.clip(values, 0.0, None)) @ vectors.T
+
+    # t ölçeği: varyans ve getiri terimlerinin büyüklüğü eşit olacak şekilde
+    spread = float(np.ptp(expected)) or 1.0
+    scale = max(float(values[-1]), 1e-12) / spread
+    tradeoffs = np.concatenate([[0.0], scale * np.geomspace(1e-3, 1e3, points - 1)])
+    weights = solve_mean_variance(covariance, expected, tradeoffs, cap)
+    returns, volatility = _statistics(weights, covariance, expected)
+
+    # Maksimum Sharpe: en iyi noktanın komşu t'leri arasında daralan taramalar
+    sharpe = _sharpe(returns, volatility, risk_free)
+    best = int(np.argmax(sharpe))
+    best_weights, best_sharpe = weights[best], sharpe[best]
+    low = tradeoffs[max(best - 1, 0)]
+    high = tradeoffs[min(best + 1, len(tradeoffs) - 1)]
+    for _ in range(REFINE_ROUNDS):
+        grid = np.linspace(low, high, REFINE_POINTS)
+        refined = solve_mean_variance(covariance, expected, grid, cap)
+        refined_sharpe = _sharpe(*_statistics(refined, covariance, expected), risk_free)
+        best = int(np.argmax(refined_sharpe))
+        if refined_sharpe[best] > best_sharpe:
+            best_weights, best_sharpe = refined[best], refined_sharpe[best]
+        low, high = grid[max(best - 1, 0)], grid[min(best + 1, REFINE_POINTS - 1)]
+    return Frontier(
+        weights=weights,
+        returns=returns,
+        volatility=volatility,
+        min_variance=weights[0],
+        max_sharpe=best_weights,
+    )
+
+
+# ===========================================================================
+# PORTFÖY
+# ===========================================================================
+
+def _describe(
+    symbols: List[str], weights: np.ndarray, covariance: np.ndarray, expected: np.ndarray,
+    risk_free: float,
+) -> dict:
+    returns, volatility = _statistics(weights[None, :], covariance, expected)
+    sharpe = _sharpe(returns, volatility, risk_free)[0]
+    return {
+        "expected_return_percent": round(float(returns[0]) * 100, 2),
+        "volatility_percent": round(float(volatility[0]) * 100, 2),
+        "sharpe": round(float(sharpe), 4) if np.isfinite(sharpe) else None,
+        "weights": {s: round(float(w), 4) for s, w in zip(symbols, weights) if w > 5e-5},
+    }
+
+
+def portfolio_optimization(
+    db: Session,
+    user_id: int,
+    window: int,
+    max_weight: float = 1.0,
+    risk_free: float = 0.0,
+    points: int = DEFAULT_FRONTIER_POINTS,
+    now: Optional[datetime] = None,
+    store: Optional[PriceHistoryStore] = None,
+) -> dict:
+    """
+    Elde tutulan hisseler için etkin sınır ve önerilen ağırlıklar.
+
+    Returns:
+        OptimizationResponse yapısında sözlük
+
+    Raises:
+        HTTPException 400: Ağırlık üst sınırı hisse sayısı için çok küçükse
+    """
+    now = now or datetime.now(timezone.utc)
+    matrix = covariance_matrix(held_symbols(db, user_id, now), window, now.date(), store)
+    usable = np.isfinite(matrix.mean)
+    # Ortak günü yetersiz çift kalmayana kadar en çok eksiği olan hisse çıkarılır
+    missing = ~np.isfinite(matrix.covariance)
+    while (missing[np.ix_(usable, usable)]).any():
+        counts = np.where(usable, (missing & usable[None, :]).sum(axis=1), -1)
+        usable[int(np.argmax(counts))] = False
+    symbols = [s for s, keep in zip(matrix.symbols, usable) if keep]
+    result = {
+        "as_of": matrix.end, "window": window, "max_weight": max_weight,
+        "risk_free_rate": risk_free, "symbols": symbols,
+        "excluded": [s for s, keep in zip(matrix.symbols, usable) if not keep],
+        "min_variance": None, "max_sharpe": None, "frontier": [],
+    }
+    if not symbols:
+        return result
+
+    covariance = matrix.covariance[np.ix_(usable, usable)]
+    expected = matrix.mean[usable]
+    try:
+        frontier = efficient_frontier(covariance, expected, max_weight, points, risk_free)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{error} ({len(symbols)} hisse, en fazla %{max_weight * 100:g})",
+        )
+
+    result["min_variance"] = _describe(symbols, frontier.min_variance, covariance, expected, risk_free)
+    result["max_sharpe"] = _describe(symbols, frontier.max_sharpe, covariance, expected, risk_free)
+    result["frontier"] = [
+        {
+            "expected_return_percent": round(float(r) * 100, 2),
+            "volatility_percent": round(float(v) * 100, 2),
+            "weights": [round(float(w), 4) for w in weights],
+        }
+        for r, v, weights in zip(frontier.returns, frontier.volatility, frontier.weights)
+    ]
+    return result
+
+
+def get_optimization_json(
+    db: Session, user: User, window: int, max_weight: float, risk_free: float, points: int,
+    version: tuple, now: datetime,
+) -> bytes:
+    """
+    portfolio_optimization sonucunu JSON (bytes) olarak döndürür.
+
+    (kullanıcı, veri sürümü, parametreler) ve `version` (fiyat geçmişi
+    deposu sürümü, gün) anahtarıyla önbelleğe alınır.
+    """
+    key = (
+        f"portfolio_optimization:{user.id}:{user.data_version}:{window}:{max_weight}:"
+        f"{risk_free}:{points}:" + ":".join(str(part) for part in version)
+    )
+    payload = cache_get(key, "portfolio_optimization")
+    if payload is None:
+        payload = orjson.dumps(
+            portfolio_optimization(db, user.id, window, max_weight, risk_free, points, now)
+        )
+        get_cache().set(key, payload)
+    return payload
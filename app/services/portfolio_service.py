@@ -5,13 +5,42 @@ Kullanıcının portföy durumunu hesaplar:
 - Ortalama maliyet hesaplama
 - Kar/zarar analizi
 - Hisse bazlı ve genel portföy özeti
+- Son fiyatlarla piyasa değeri ve gerçekleşmemiş kar/zarar
+- Geçmiş bir andaki (as_of) özet: en yakın günlük anlık görüntü + sonraki
+  işlemler, değerleme o günün kapanışıyla
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from app.models.transaction import Transaction, TransactionType
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+from sqlalchemy import func, update
+
+from app.cache import (
+    CACHE_REQUESTS_TOTAL,
+    cache_get,
+    get_cache,
+    get_stale,
+    latest_summary_key,
+    set_latest,
+    summary_key,
+)
+from app.events import hub
+from app.history_store import history_store
+from app.singleflight import flights
+from app.models.transaction import Transaction
+from app.models.transaction_change import ChangeOp, TransactionChange
+from app.models.user import User
+from app.services.price_service import Quote, prices
+from app.services.snapshot_service import (
+    Position,
+    invalidate_snapshots,
+    positions_as_of,
+    replay,
+    snapshot_scheduler,
+)
 from app.schemas.transaction import (
     StockSummary,
     PortfolioSummary,
@@ -22,6 +51,136 @@ from app.logger import get_logger
 logger = get_logger(__name__)
 
 
+# ===========================================================================
+# YANIT DÖNÜŞÜMLERİ
+# ===========================================================================
+# Veritabanından gelen veriler zaten doğrulanmış olduğundan, okuma
+# endpointlerinde Pydantic ile yeniden doğrulamak yerine yanıt sözlükleri
+# doğrudan oluşturulur ve ORJSONResponse ile kodlanır.
+
+def transaction_to_dict(transaction: Transaction) -> dict:
+    """
+    Transaction nesnesini TransactionResponse yapısında bir sözlüğe çevirir.
+
+    Args:
+        transaction: Veritabanından okunmuş Transaction nesnesi
+
+    Returns:
+        TransactionResponse alanlarını içeren sözlük
+    """
+    return {
+        "id": transaction.id,
+        "stock_symbol": transaction.stock_symbol,
+        "stock_name": transaction.stock_name,
+        "transaction_type": transaction.transaction_type,
+        "quantity": transaction.quantity,
+        "price_per_unit": transaction.price_per_unit,
+        "total_amount": transaction.total_amount,
+        "commission": transaction.commission,
+        "transaction_date": transaction.transaction_date,
+        "notes": transaction.notes,
+        "created_at": transaction.created_at,
+    }
+
+
+# ===========================================================================
+# VERİ SÜRÜMÜ
+# ===========================================================================
+
+def bump_data_version(db: Session, user_id: int) -> int:
+    """
+    Kullanıcının veri sürümünü bir artırır.
+
+    Her yazma işleminde, aynı transaction içinde (commit'ten önce) çağrılır.
+    ETag'ler ve önbellek anahtarları bu sürümden türetilir.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+
+    Returns:
+        Yeni veri sürümü
+    """
+    return db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+    ).scalar_one()
+
+
+def invalidate_user_cache(user_id: int, new_version: int) -> None:
+    """
+    Yazma işleminden sonra (commit'ten sonra) eski sürümün önbellek
+    kayıtlarını siler.
+
+    Yeni sürüm zaten farklı bir anahtara karşılık geldiğinden bu adım
+    doğruluk için değil, eski kayıtların bellekte kalmaması içindir.
+
+    Args:
+        user_id: Kullanıcı ID'si
+        new_version: bump_data_version'ın döndürdüğü sürüm
+    """
+    get_cache().delete(summary_key(user_id, new_version - 1, prices.last_epoch))
+
+
+def record_change(
+    db: Session, user_id: int, transaction_id: int, seq: int, op: str
+) -> None:
+    """
+    İşlemin değişiklik kaydını yazar (her işlem için tek satır).
+
+    bump_data_version'dan sonra, aynı transaction içinde çağrılır; seq
+    yeni veri sürümüdür.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        transaction_id: Değişen işlemin ID'si
+        seq: Yeni veri sürümü
+        op: ChangeOp değeri (insert / update / delete)
+    """
+    if op != ChangeOp.INSERT:
+        updated = db.execute(
+            update(TransactionChange)
+            .where(
+                TransactionChange.user_id == user_id,
+                TransactionChange.transaction_id == transaction_id,
+            )
+            .values(seq=seq, op=op, changed_at=func.now())
+        ).rowcount
+        if updated:
+            return
+    db.add(TransactionChange(
+        user_id=user_id, transaction_id=transaction_id, seq=seq, op=op
+    ))
+
+
+def publish_change(
+    user_id: int, new_version: int, op: str, transaction_id: int, stock_symbol: str
+) -> None:
+    """
+    Kullanıcının açık olay akışlarına (SSE) değişiklik olayı gönderir.
+
+    Commit'ten sonra çağrılır; istemciler olayı aldıklarında verilerini
+    yeniler.
+
+    Args:
+        user_id: Kullanıcı ID'si
+        new_version: Yeni veri sürümü
+        op: ChangeOp değeri (insert / update / delete)
+        transaction_id: Değişen işlemin ID'si
+        stock_symbol: Değişen işlemin hisse kodu
+    """
+    hub.publish(user_id, {
+        "type": "transactions_changed",
+        "data_version": new_version,
+        "op": op,
+        "transaction_id": transaction_id,
+        "stock_symbol": stock_symbol,
+    })
+
+
 # ===========================================================================
 # İŞLEM CRUD İŞLEMLERİ
 # ===========================================================================
@@ -59,8 +218,17 @@ def create_transaction(
     )
 
     db.add(new_transaction)
+    db.flush()  # İşlem ID'si değişiklik kaydı için gerekli
+    new_version = bump_data_version(db, user_id)
+    record_change(db, user_id, new_transaction.id, new_version, ChangeOp.INSERT)
+    invalidate_snapshots(db, user_id, new_transaction.transaction_date.date())
     db.commit()
+    invalidate_user_cache(user_id, new_version)
+    snapshot_scheduler.schedule(db.get_bind(), user_id)
     db.refresh(new_transaction)
+    publish_change(
+        user_id, new_version, ChangeOp.INSERT, new_transaction.id, new_transaction.stock_symbol
+    )
 
     return new_transaction
 
@@ -155,6 +323,8 @@ def update_transaction(
     if not transaction:
         return None
 
+    previous_date = transaction.transaction_date.date()
+
     # Güncelleme işlemi
     for field, value in transaction_data.items():
         if value is not None:
@@ -168,8 +338,19 @@ def update_transaction(
     if hasattr(transaction, "stock_symbol"):
         transaction.stock_symbol = transaction.stock_symbol.upper()
 
+    new_version = bump_data_version(db, user_id)
+    record_change(db, user_id, transaction.id, new_version, ChangeOp.UPDATE)
+    # Tarih değiştiyse eski ve yeni günden önce gelenden itibaren
+    invalidate_snapshots(
+        db, user_id, min(previous_date, transaction.transaction_date.date())
+    )
     db.commit()
+    invalidate_user_cache(user_id, new_version)
+    snapshot_scheduler.schedule(db.get_bind(), user_id)
     db.refresh(transaction)
+    publish_change(
+        user_id, new_version, ChangeOp.UPDATE, transaction.id, transaction.stock_symbol
+    )
     return transaction
 
 
@@ -192,8 +373,16 @@ def delete_transaction(
     if not transaction:
         return False
 
+    stock_symbol = transaction.stock_symbol
+    transaction_day = transaction.transaction_date.date()
     db.delete(transaction)
+    new_version = bump_data_version(db, user_id)
+    record_change(db, user_id, transaction_id, new_version, ChangeOp.DELETE)
+    invalidate_snapshots(db, user_id, transaction_day)
     db.commit()
+    invalidate_user_cache(user_id, new_version)
+    snapshot_scheduler.schedule(db.get_bind(), user_id)
+    publish_change(user_id, new_version, ChangeOp.DELETE, transaction_id, stock_symbol)
     return True
 
 
@@ -201,57 +390,54 @@ def delete_transaction(
 # PORTFÖY HESAPLAMA FONKSİYONLARI
 # ===========================================================================
 
-def calculate_stock_summary(
-    db: Session, user_id: int, stock_symbol: str
+def summarize_stock(
+    stock_symbol: str, transactions: List[Transaction], quote: Optional[Quote] = None
 ) -> Optional[StockSummary]:
     """
-    Tek bir hisse senedi için portföy özetini hesaplar.
+    Tek bir hissenin işlemlerinden portföy özetini hesaplar.
 
     Hesaplama mantığı:
         - Toplam alış adedi ve tutarı
         - Toplam satış adedi
         - Net elde tutulan adet = alış - satış
         - Ortalama maliyet = toplam alış tutarı / toplam alış adedi
+        - Son fiyat varsa: piyasa değeri = net adet × son fiyat,
+          gerçekleşmemiş K/Z = piyasa değeri - net adet × ortalama maliyet,
+          günlük K/Z = net adet × (son fiyat - önceki kapanış)
 
     Args:
-        db: Veritabanı oturumu
-        user_id: Kullanıcı ID'si
         stock_symbol: Hisse kodu (ör: THYAO)
+        transactions: Bu hisseye ait işlemler
+        quote: Hissenin son fiyatı (yoksa piyasa alanları None kalır)
 
     Returns:
         StockSummary nesnesi veya None (işlem yoksa)
     """
-    transactions = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user_id,
-            Transaction.stock_symbol == stock_symbol.upper(),
-        )
-        .all()
-    )
-
     if not transactions:
         return None
+    position = replay({}, transactions)[transactions[0].stock_symbol]
+    return summarize_position(stock_symbol, position, quote)
 
-    # Değişkenleri başlat
-    total_buy_quantity = 0.0
-    total_buy_amount = 0.0
-    total_sell_quantity = 0.0
-    total_commission = 0.0
-    stock_name = None
 
-    for t in transactions:
-        if t.transaction_type == TransactionType.BUY:
-            total_buy_quantity += t.quantity
-            total_buy_amount += t.total_amount
-        elif t.transaction_type == TransactionType.SELL:
-            total_sell_quantity += t.quantity
+def summarize_position(
+    stock_symbol: str, position: Position, quote: Optional[Quote] = None
+) -> StockSummary:
+    """
+    Birikmiş pozisyon durumundan hisse özetini oluşturur (bkz. summarize_stock).
 
-        total_commission += t.commission
+    Args:
+        stock_symbol: Hisse kodu
+        position: İşlemlerin oynatılmasıyla (veya anlık görüntüden) elde edilen durum
+        quote: Hissenin son fiyatı
 
-        # En son işlemdeki hisse adını kullan
-        if t.stock_name:
-            stock_name = t.stock_name
+    Returns:
+        StockSummary nesnesi
+    """
+    total_buy_quantity = position.buy_quantity
+    total_buy_amount = position.buy_amount
+    total_sell_quantity = position.sell_quantity
+    total_commission = position.commission
+    stock_name = position.stock_name
 
     # Net elde tutulan adet
     net_quantity = total_buy_quantity - total_sell_quantity
@@ -263,7 +449,7 @@ def calculate_stock_summary(
         else 0.0
     )
 
-    return StockSummary(
+    summary = StockSummary(
         stock_symbol=stock_symbol.upper(),
         stock_name=stock_name,
         total_quantity=round(net_quantity, 4),
@@ -274,22 +460,159 @@ def calculate_stock_summary(
         total_sell_quantity=round(total_sell_quantity, 4),
     )
 
+    if quote is not None:
+        market_value = net_quantity * quote.last_price
+        cost_basis = net_quantity * average_cost
+        unrealized_pnl = market_value - cost_basis
+        summary.last_price = quote.last_price
+        summary.price_time = quote.price_time
+        summary.market_value = round(market_value, 2)
+        summary.unrealized_pnl = round(unrealized_pnl, 2)
+        summary.unrealized_pnl_percent = (
+            round(unrealized_pnl / cost_basis * 100, 2) if cost_basis > 0 else None
+        )
+        if quote.previous_close is not None:
+            summary.daily_pnl = round(net_quantity * (quote.last_price - quote.previous_close), 2)
+
+    return summary
+
+
+def market_totals(holdings: List[StockSummary]) -> Dict[str, Optional[float]]:
+    """
+    Fiyatı olan hisselerin piyasa değeri ve kar/zarar toplamları.
+
+    Args:
+        holdings: summarize_stock sonuçları
+
+    Returns:
+        total_market_value, total_unrealized_pnl, total_daily_pnl
+        (ilgili değere sahip hisse yoksa None)
+    """
+    def total(field: str) -> Optional[float]:
+        values = [getattr(h, field) for h in holdings if getattr(h, field) is not None]
+        return round(sum(values), 2) if values else None
+
+    return {
+        "total_market_value": total("market_value"),
+        "total_unrealized_pnl": total("unrealized_pnl"),
+        "total_daily_pnl": total("daily_pnl"),
+    }
+
+
+def historical_quotes(symbols: Iterable[str], as_of: datetime) -> Dict[str, Quote]:
+    """
+    Hisselerin as_of günündeki (veya öncesindeki son) kapanışları.
+
+    Fiyat geçmişi deposundan okunur; önceki kapanış bir önceki işlem
+    günüdür. Geçmişi olmayan hisseler dahil edilmez.
+
+    Args:
+        symbols: Hisse kodları
+        as_of: Değerleme anı
+
+    Returns:
+        Hisse kodu -> Quote sözlüğü
+    """
+    quotes: Dict[str, Quote] = {}
+    for symbol in symbols:
+        history = history_store.read(symbol, None, as_of.date())
+        # Sadece son birkaç gün (kapanışı olmayan günler atlanır)
+        closes = np.asarray(history["close"][-10:])
+        valid = np.flatnonzero(~np.isnan(closes))
+        if not len(valid):
+            continue
+        day = history["date"][-10:][valid[-1]].item()
+        quotes[symbol] = Quote(
+            last_price=float(closes[valid[-1]]),
+            previous_close=float(closes[valid[-2]]) if len(valid) > 1 else None,
+            price_time=datetime(day.year, day.month, day.day),
+        )
+    return quotes
+
+
+def calculate_stock_summary(
+    db: Session, user_id: int, stock_symbol: str, as_of: Optional[datetime] = None
+) -> Optional[StockSummary]:
+    """
+    Tek bir hisse senedi için portföy özetini hesaplar.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        stock_symbol: Hisse kodu (ör: THYAO)
+        as_of: Verilirse bu andaki (dahil) özet, o günün kapanışıyla değerlenir
+
+    Returns:
+        StockSummary nesnesi veya None (işlem yoksa)
+    """
+    symbol = stock_symbol.upper()
+    if as_of is not None:
+        position = positions_as_of(db, user_id, as_of, symbol).get(symbol)
+        if position is None:
+            return None
+        return summarize_position(symbol, position, historical_quotes([symbol], as_of).get(symbol))
+
+    transactions = (
+        db.query(Transaction)
+        .filter(
+            Transaction.user_id == user_id,
+            Transaction.stock_symbol == symbol,
+        )
+        .all()
+    )
+    quote = prices.quotes(db, [symbol]).get(symbol)
+    return summarize_stock(stock_symbol, transactions, quote)
+
+
+def _portfolio_summary(
+    user_id: int, stocks: List[StockSummary], as_of: Optional[datetime] = None
+) -> PortfolioSummary:
+    """Hisse özetlerinden portföy toplamlarını oluşturur."""
+    return PortfolioSummary(
+        user_id=user_id,
+        total_invested=round(sum(s.total_invested for s in stocks), 2),
+        total_commission=round(sum(s.total_commission for s in stocks), 2),
+        stock_count=len(stocks),
+        stocks=stocks,
+        as_of=as_of,
+        **market_totals(stocks),
+    )
+
 
 def calculate_portfolio_summary(
-    db: Session, user_id: int
+    db: Session,
+    user_id: int,
+    quotes: Optional[Dict[str, Quote]] = None,
+    as_of: Optional[datetime] = None,
 ) -> PortfolioSummary:
     """
     Kullanıcının tüm portföyünün özetini hesaplar.
 
     Tüm hisse senetlerini gruplar ve her biri için StockSummary hesaplar.
+    Tüm hisselerin fiyatları tek seferde fiyat önbelleğinden alınır.
+
+    as_of verilirse pozisyonlar as_of gününden önceki en yakın anlık
+    görüntüden ve sonraki işlemlerin tarih aralığı taramasından hesaplanır;
+    değerleme o günün kapanışlarıyla yapılır (historical_quotes).
 
     Args:
         db: Veritabanı oturumu
         user_id: Kullanıcı ID'si
+        quotes: Kullanılacak fiyatlar (verilmezse fiyat önbelleğinden)
+        as_of: Özetin anı (None: güncel)
 
     Returns:
         PortfolioSummary nesnesi
     """
+    if as_of is not None:
+        positions = positions_as_of(db, user_id, as_of)
+        quotes = historical_quotes(positions, as_of)
+        stocks = [
+            summarize_position(symbol, position, quotes.get(symbol))
+            for symbol, position in sorted(positions.items())
+        ]
+        return _portfolio_summary(user_id, stocks, as_of)
+
     # Kullanıcının portföyündeki benzersiz hisse kodlarını al
     unique_symbols = (
         db.query(Transaction.stock_symbol)
@@ -298,21 +621,108 @@ def calculate_portfolio_summary(
         .all()
     )
 
+    if quotes is None:
+        quotes = prices.quotes(db, [symbol for (symbol,) in unique_symbols])
+
     stocks: List[StockSummary] = []
-    total_invested = 0.0
-    total_commission = 0.0
 
     for (symbol,) in unique_symbols:
-        summary = calculate_stock_summary(db, user_id, symbol)
+        transactions = (
+            db.query(Transaction)
+            .filter(Transaction.user_id == user_id, Transaction.stock_symbol == symbol)
+            .all()
+        )
+        summary = summarize_stock(symbol, transactions, quotes.get(symbol))
         if summary:
             stocks.append(summary)
-            total_invested += summary.total_invested
-            total_commission += summary.total_commission
 
-    return PortfolioSummary(
-        user_id=user_id,
-        total_invested=round(total_invested, 2),
-        total_commission=round(total_commission, 2),
-        stock_count=len(stocks),
-        stocks=stocks,
+    return _portfolio_summary(user_id, stocks)
+
+
+# ===========================================================================
+# ÖNBELLEKLİ PORTFÖY ÖZETİ (STALE-WHILE-REVALIDATE)
+# ===========================================================================
+# Her hesaplama iki kayıt yazar:
+#   portfolio_summary:{id}:{sürüm}:{fiyat sürümü}  -> özet JSON
+#   portfolio_summary_latest:{id}  -> sürümler + hesaplanma zamanı + özet JSON
+# İkinci kayıt yazma işlemlerinde silinmez; bayat yanıt kabul eden istemcilere
+# yeni özet arka planda hesaplanırken sunulur (bkz. app.cache.get_stale).
+
+
+def _compute_summary_json(db: Session, user_id: int, data_version: int) -> bytes:
+    """Özeti hesaplar, kodlar ve her iki önbellek kaydını yazar."""
+    price_epoch, quotes = prices.snapshot(db)
+    summary = calculate_portfolio_summary(db, user_id, quotes)
+    encoded = orjson.dumps(summary.model_dump())
+    get_cache().set(summary_key(user_id, data_version, price_epoch), encoded)
+    set_latest(latest_summary_key(user_id), data_version, price_epoch, encoded)
+    return encoded
+
+
+def get_portfolio_summary_json(
+    db: Session, user: User, max_stale: float = 0
+) -> Tuple[bytes, Optional[float]]:
+    """
+    Portföy özetini JSON (bytes) olarak döndürür; önbellekte varsa
+    hesaplama yapılmaz.
+
+    Önbellek anahtarı kullanıcının veri sürümünü ve fiyat sürümünü
+    içerir, bu nedenle yazma işlemlerinden veya fiyat yüklemelerinden sonra
+    eski özet varsayılan olarak döndürülmez. Önbellekte yoksa aynı anda
+    gelen istekler tek bir hesaplamayı paylaşır (single-flight).
+
+    max_stale > 0 ise ve önceki sürümün özeti bu süreden yeniyse, hesaplama
+    beklenmeden o özet `stale: true` ile döndürülür; çağıran taraf
+    refresh_portfolio_summary'yi arka planda çalıştırmalıdır.
+
+    Args:
+        db: Veritabanı oturumu
+        user: Mevcut kullanıcı (id ve data_version)
+        max_stale: Kabul edilen en fazla bayatlık (saniye)
+
+    Returns:
+        (PortfolioSummary yapısında JSON bytes, bayat ise yaşı / güncel ise None)
+    """
+    price_epoch = prices.epoch(db)
+    key = summary_key(user.id, user.data_version, price_epoch)
+    payload = cache_get(key, "portfolio_summary")
+    if payload is not None:
+        return payload, None
+
+    if max_stale > 0:
+        stale = get_stale(latest_summary_key(user.id), user.data_version, price_epoch, max_stale)
+        if stale is not None:
+            CACHE_REQUESTS_TOTAL.inc(("portfolio_summary", "stale"))
+            return stale
+
+    # Aynı kullanıcı/sürüm için eşzamanlı istekler tek hesaplamayı bekler
+    payload = flights.run(
+        "portfolio_summary",
+        (user.id, user.data_version, price_epoch),
+        lambda: _compute_summary_json(db, user.id, user.data_version),
     )
+    return payload, None
+
+
+def refresh_portfolio_summary(bind, user_id: int, data_version: int) -> None:
+    """
+    Bayat özet sunulduktan sonra güncel özeti arka planda hesaplar.
+
+    İstek oturumu yanıttan sonra kapandığından aynı engine üzerinde yeni
+    bir oturum açılır. Aynı sürüm için devam eden bir hesaplama varsa ona
+    katılır.
+
+    Args:
+        bind: İstek oturumunun engine'i (db.get_bind())
+        user_id: Kullanıcı ID'si
+        data_version: Hesaplanacak veri sürümü
+    """
+    with Session(bind=bind) as db:
+        price_epoch = prices.epoch(db)
+        if get_cache().get(summary_key(user_id, data_version, price_epoch)) is not None:
+            return
+        flights.run(
+            "portfolio_summary",
+            (user_id, data_version, price_epoch),
+            lambda: _compute_summary_json(db, user_id, data_version),
+        )
@@ -0,0 +1,339 @@
+"""
+Price Service - Piyasa Fiyatları
+==================================
+Hisse senetlerinin son fiyatlarını yükler ve portföy hesaplamalarına
+sunar:
+- CSV / JSON fiyat dosyasından toplu yükleme (upsert)
+- Süreç içi son fiyat önbelleği (PriceCache)
+
+Önbellek tüm fiyat tablosunu (hisse başına tek satır) bellekte tutar.
+Veritabanındaki fiyat sürümü (price_epoch) en fazla
+PRICE_CACHE_TTL_SECONDS aralıkla okunur; sürüm değişmişse sadece yeni
+sürümle yazılan satırlar okunur. Aynı süreçteki yüklemeler önbelleği
+hemen günceller.
+
+Fiyat sürümü portföy özeti önbellek anahtarlarına ve ETag'lere eklenir;
+böylece yeni fiyatlar yüklendiğinde eski özetler döndürülmez.
+
+Çalıştırma:
+    python -m app.services.price_service fiyatlar.csv
+    python -m app.services.price_service fiyatlar.json
+
+Dosya biçimi (CSV başlık satırı veya JSON nesne listesi):
+    stock_symbol,last_price,previous_close,stock_name,price_time
+    THYAO,262.75,258.00,Türk Hava Yolları,2024-06-14T18:10:00
+"""
+
+import csv
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.logger import get_logger
+from app.metrics import REGISTRY
+from app.models.instrument_price import InstrumentPrice, PriceEpoch
+
+logger = get_logger(__name__)
+
+# Tek INSERT ... ON CONFLICT ifadesindeki en fazla satır
+UPSERT_BATCH_SIZE = 500
+
+PRICE_CACHE_RELOADS_TOTAL = REGISTRY.counter(
+    "price_cache_reloads_total",
+    "Fiyat önbelleğinin veritabanından okuduğu sürümler",
+    ("kind",),
+)
+
+
+@dataclass(frozen=True)
+class Quote:
+    """Bir hissenin son fiyat bilgisi."""
+    last_price: float
+    previous_close: Optional[float] = None
+    price_time: Optional[datetime] = None
+
+
+# ===========================================================================
+# FİYAT ÖNBELLEĞİ
+# ===========================================================================
+
+class PriceCache:
+    """
+    Süreç içi son fiyat önbelleği.
+
+    Veritabanına sadece TTL dolduğunda (sürüm kontrolü) ve sürüm
+    değiştiğinde (değişen satırlar) gidilir.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._quotes: Dict[str, Quote] = {}
+        self._epoch = 0
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Önbelleği boşaltır; sonraki erişim tabloyu baştan okur."""
+        with self._lock:
+            self._quotes = {}
+            self._epoch = 0
+            self._checked_at = None
+
+    def _refresh(self, db: Session) -> None:
+        """TTL dolmuşsa fiyat sürümünü kontrol eder ve değişen satırları okur."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.ttl_seconds:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.ttl_seconds:
+                return
+            epoch = db.execute(
+                select(PriceEpoch.epoch).where(PriceEpoch.id == 1)
+            ).scalar() or 0
+            if epoch < self._epoch:
+                # Sayaç geriye gitti (veritabanı değişti): baştan oku
+                self._quotes, self._epoch = {}, 0
+            if epoch != self._epoch:
+                self._load(db, since=self._epoch)
+                self._epoch = epoch
+            self._checked_at = now
+
+    def _load(self, db: Session, since: int) -> None:
+        """since sürümünden sonra yazılmış satırları önbelleğe ekler."""
+        rows = db.execute(
+            select(
+                InstrumentPrice.stock_symbol,
+                InstrumentPrice.last_price,
+                InstrumentPrice.previous_close,
+                InstrumentPrice.price_time,
+            ).where(InstrumentPrice.epoch > since)
+        ).all()
+        quotes = dict(self._quotes)
+        for symbol, last_price, previous_close, price_time in rows:
+            quotes[symbol] = Quote(last_price, previous_close, price_time)
+        # Okuyucular her zaman tutarlı bir sözlük görür (yerinde değişiklik yok)
+        self._quotes = quotes
+        PRICE_CACHE_RELOADS_TOTAL.inc(("full" if since == 0 else "delta",))
+
+    @property
+    def last_epoch(self) -> int:
+        """Son kontrol edilen fiyat sürümü (veritabanına gitmez)."""
+        return self._epoch
+
+    def epoch(self, db: Session) -> int:
+        """Güncel fiyat sürümü (ETag ve önbellek anahtarları için)."""
+        self._refresh(db)
+        return self._epoch
+
+    def snapshot(self, db: Session) -> Tuple[int, Dict[str, Quote]]:
+        """
+        Fiyat sürümü ve tüm fiyatlar (tutarlı bir anlık görüntü).
+
+        Returns:
+            (fiyat sürümü, hisse kodu -> Quote sözlüğü)
+        """
+        self._refresh(db)
+        with self._lock:
+            return self._epoch, self._quotes
+
+    def quotes(self, db: Session, symbols: Iterable[str]) -> Dict[str, Quote]:
+        """
+        Verilen hisselerin son fiyatları (fiyatı olmayanlar dahil edilmez).
+
+        Args:
+            db: Veritabanı oturumu
+            symbols: Hisse kodları
+
+        Returns:
+            Hisse kodu -> Quote sözlüğü
+        """
+        _, quotes = self.snapshot(db)
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    def invalidate(self) -> None:
+        """Sonraki erişimde sürümün hemen kontrol edilmesini sağlar."""
+        self._checked_at = None
+
+
+# Uygulama genelinde paylaşılan fiyat önbelleği
+prices = PriceCache(settings.PRICE_CACHE_TTL_SECONDS)
+
+
+# ===========================================================================
+# TOPLU YÜKLEME
+# ===========================================================================
+
+def _parse_float(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(str(value).replace(",", "."))
+
+
+def _parse_row(raw: dict) -> dict:
+    """Dosyadaki bir kaydı doğrular ve tablo satırına çevirir."""
+    symbol = (raw.get("stock_symbol") or raw.get("symbol") or "").strip().upper()
+    last_price = _parse_float(raw.get("last_price", raw.get("price")))
+    if not symbol or last_price is None or last_price <= 0:
+        raise ValueError(f"Geçersiz fiyat kaydı: {raw}")
+    price_time = raw.get("price_time")
+    return {
+        "stock_symbol": symbol,
+        "stock_name": raw.get("stock_name") or None,
+        "last_price": last_price,
+        "previous_close": _parse_float(raw.get("previous_close")),
+        "price_time": datetime.fromisoformat(price_time) if price_time else None,
+    }
+
+
+def read_price_feed(path: Path) -> List[dict]:
+    """
+    CSV veya JSON fiyat dosyasını okur.
+
+    Args:
+        path: .csv veya .json dosyası
+
+    Returns:
+        upsert_prices'a verilecek satırlar
+    """
+    if path.suffix.lower() == ".json":
+        records = orjson.loads(path.read_bytes())
+        if isinstance(records, dict):
+            records = records.get("prices", [])
+    else:
+        with path.open(newline="", encoding="utf-8-sig") as feed:
+            records = list(csv.DictReader(feed))
+    return [_parse_row(record) for record in records]
+
+
+def _bump_price_epoch(db: Session) -> int:
+    """Fiyat sürümünü bir artırır (satır kilidi yüklemeleri sıraya sokar)."""
+    epoch = db.execute(
+        update(PriceEpoch)
+        .where(PriceEpoch.id == 1)
+        .values(epoch=PriceEpoch.epoch + 1)
+        .returning(PriceEpoch.epoch)
+    ).scalar()
+    if epoch is None:
+        db.add(PriceEpoch(id=1, epoch=1))
+        db.flush()
+        epoch = 1
+    return epoch
+
+
+def _write_prices(
+    db: Session,
+    rows: List[dict],
+    columns: Tuple[str, ...],
+    newer_only: bool = False,
+) -> int:
+    """
+    Fiyat satırlarını yeni bir fiyat sürümüyle yazar (commit etmez).
+
+    Satırlar UPSERT_BATCH_SIZE'lık INSERT ... ON CONFLICT ifadeleriyle
+    yazılır; mevcut satırlarda sadece `columns` güncellenir. newer_only
+    ise fiyat zamanı kayıtlı olandan eski satırlar mevcut kaydı değiştirmez.
+
+    Returns:
+        Yeni fiyat sürümü
+    """
+    epoch = _bump_price_epoch(db)
+    statement = dialect_insert(db, InstrumentPrice.__table__)
+    where = None
+    if newer_only:
+        where = or_(
+            InstrumentPrice.price_time.is_(None),
+            InstrumentPrice.price_time <= statement.excluded.price_time,
+        )
+    statement = statement.on_conflict_do_update(
+        index_elements=[InstrumentPrice.stock_symbol],
+        set_={
+            column: getattr(statement.excluded, column)
+            for column in columns + ("epoch", "updated_at")
+        },
+        where=where,
+    )
+
+    now = datetime.now(timezone.utc)
+    values = [dict(row, epoch=epoch, updated_at=now) for row in rows]
+    for start in range(0, len(values), UPSERT_BATCH_SIZE):
+        db.execute(statement, values[start:start + UPSERT_BATCH_SIZE])
+    return epoch
+
+
+def upsert_prices(db: Session, rows: List[dict]) -> int:
+    """
+    Fiyatları toplu olarak ekler veya günceller.
+
+    Tüm yükleme tek transaction ve tek fiyat sürümüdür.
+
+    Args:
+        db: Veritabanı oturumu
+        rows: read_price_feed'in döndürdüğü satırlar
+
+    Returns:
+        Yeni fiyat sürümü
+    """
+    # Aynı hisse birden fazla kez varsa son kayıt geçerlidir
+    latest = {row["stock_symbol"]: row for row in rows}
+
+    epoch = _write_prices(db, list(latest.values()), (
+        "stock_name", "last_price", "previous_close", "price_time",
+    ))
+    db.commit()
+
+    prices.invalidate()
+    logger.info(f"💹 {len(latest)} fiyat yüklendi (fiyat sürümü: {epoch})")
+    return epoch
+
+
+def write_last_prices(db: Session, last_prices: Dict[str, Tuple[float, datetime]]) -> int:
+    """
+    Sadece son fiyat ve zamanını günceller (hisse adı ve önceki kapanış
+    korunur). Gün içi fiyat akışı (tick_service) tarafından kullanılır.
+    Kayıtlı fiyat zamanından eski fiyatlar yok sayılır.
+
+    Commit etmez; çağıran taraf commit'ten sonra prices.invalidate()
+    çağırmalıdır.
+
+    Args:
+        db: Veritabanı oturumu
+        last_prices: Hisse kodu -> (son fiyat, fiyat zamanı)
+
+    Returns:
+        Yeni fiyat sürümü
+    """
+    rows = [
+        {"stock_symbol": symbol, "last_price": price, "price_time": price_time}
+        for symbol, (price, price_time) in last_prices.items()
+    ]
+    # Eski tick'ler (ör. yeniden oynatılan dosyalar) son fiyatı geri almaz
+    return _write_prices(db, rows, ("last_price", "price_time"), newer_only=True)
+
+
+def main(argv: List[str]) -> int:
+    """Komut satırı giriş noktası."""
+    from app.database import SessionLocal
+
+    if not argv:
+        print("Kullanım: python -m app.services.price_service <fiyatlar.csv|fiyatlar.json>")
+        return 2
+
+    rows = read_price_feed(Path(argv[0]))
+    with SessionLocal() as db:
+        epoch = upsert_prices(db, rows)
+    print(f"✅ {len(rows)} fiyat yüklendi (fiyat sürümü: {epoch})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,256 @@
+"""
+Returns Service - Getiri Hesaplamaları (XIRR / TWR)
+=====================================================
+Kullanıcının gerçek getirisini iki yöntemle hesaplar:
+
+- XIRR (para ağırlıklı getiri): İşlemlerin nakit akışlarının (alış: -tutar
+  - komisyon, satış: +tutar - komisyon) ve bugünkü piyasa değerinin net
+  bugünkü değerini sıfırlayan yıllık oran. Her hisse ve portföyün tamamı
+  için aynı anda, tek bir vektörel Newton iterasyonuyla çözülür; yakınsamayan
+  seriler vektörel ikiye bölme (bisection) ile çözülür.
+- TWR (zaman ağırlıklı getiri): Günlük değerlemelerden (history_service),
+  o günkü net alış/satış tutarı çıkarılarak hesaplanan günlük getirilerin
+  bileşik çarpımı; para giriş/çıkışlarının zamanlamasından etkilenmez.
+
+Yıl 365 gün kabul edilir (Excel XIRR ile aynı).
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.history_store import PriceHistoryStore
+from app.models.transaction import TransactionType
+from app.models.user import User
+from app.services.history_service import value_series
+from app.services.snapshot_service import load_transactions
+
+DAYS_PER_YEAR = 365.0
+NEWTON_ITERATIONS = 50
+BISECTION_ITERATIONS = 200
+# Oranın aranacağı aralık (yıllık): -%99,99 ... +%1.000.000
+RATE_FLOOR = -0.9999
+RATE_CEILING = 1e4
+# Çözüm kabulü: |NBD| <= tolerans x toplam |akış|
+NPV_TOLERANCE = 1e-9
+
+
+# ===========================================================================
+# XIRR
+# ===========================================================================
+
+def _npv(rates: np.ndarray, years: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """Her seri için NBD (satırlar seri, sütunlar akış)."""
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        discount = np.exp(-years * np.log1p(rates)[:, None])
+        return (flows * discount).sum(axis=1)
+
+
+def xirr(days: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Birden fazla nakit akışı serisinin XIRR değerleri (vektörel).
+
+    Serilerin akış sayıları farklıysa kullanılmayan hücreler 0 akışla
+    doldurulur (NBD'ye etkisi yoktur).
+
+    Args:
+        days: (seri x akış) ilk akıştan itibaren geçen gün
+        flows: (seri x akış) nakit akışları (yatırım negatif)
+
+    Returns:
+        (seri,) yıllık oranlar; çözüm yoksa (akışların hepsi aynı
+        işaretliyse) NaN
+    """
+    years = np.asarray(days, dtype=float) / DAYS_PER_YEAR
+    flows = np.asarray(flows, dtype=float)
+    scale = np.abs(flows).sum(axis=1)
+    solvable = (flows > 0).any(axis=1) & (flows < 0).any(axis=1)
+
+    # Newton: tüm seriler aynı anda
+    rates = np.full(len(flows), 0.1)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(NEWTON_ITERATIONS):
+            base = 1.0 + rates[:, None]
+            discount = np.exp(-years * np.log(base))
+            npv = (flows * discount).sum(axis=1)
+            slope = (-years * flows * discount / base).sum(axis=1)
+            step = np.where(slope != 0, npv / slope, 0.0)
+            step = np.where(np.isfinite(step), step, 0.0)
+            # Tanım aralığında kal: -1'in altına düşecekse yarı yola git
+            rates = np.where(rates - step <= -1.0, (rates - 1.0) / 2, rates - step)
+            if np.all(np.abs(step) <= 1e-12 * (1 + np.abs(rates))):
+                break
+        solved = solvable & (np.abs(_npv(rates, years, flows)) <= NPV_TOLERANCE * scale)
+
+    # Yakınsamayanlar: işaret değiştiren aralığı bul ve ikiye böl
+    pending = np.flatnonzero(solvable & ~solved)
+    if len(pending):
+        rates[pending] = _bisect(years[pending], flows[pending])
+        solved[pending] = np.isfinite(rates[pending])
+    return np.where(solved, rates, np.nan)
+
+
+def _bisect(years: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """NBD'nin işaret değiştirdiği ilk aralıkta ikiye bölme; yoksa NaN."""
+    grid = np.concatenate([
+        [RATE_FLOOR], -np.logspace(0, -4, 20)[1:], [0.0], np.logspace(-4, np.log10(RATE_CEILING), 40)
+    ])
+    low = np.full(len(flows), np.nan)
+    high = np.full(len(flows), np.nan)
+    previous = _npv(np.full(len(flows), grid[0]), years, flows)
+    for left, right in zip(grid[:-1], grid[1:]):
+        current = _npv(np.full(len(flows), right), years, flows)
+        found = np.isnan(low) & (np.sign(previous) * np.sign(current) <= 0)
+        low[found], high[found] = left, right
+        previous = current
+
+    bracketed = ~np.isnan(low)
+    low_npv = _npv(np.where(bracketed, low, 0.0), years, flows)
+    for _ in range(BISECTION_ITERATIONS):
+        middle = (low + high) / 2
+        middle_npv = _npv(np.where(bracketed, middle, 0.0), years, flows)
+        same = np.sign(middle_npv) == np.sign(low_npv)
+        low = np.where(same, middle, low)
+        low_npv = np.where(same, middle_npv, low_npv)
+        high = np.where(same, high, middle)
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+# ===========================================================================
+# TWR
+# ===========================================================================
+
+def time_weighted_return(values: np.ndarray, invested: np.ndarray) -> Optional[float]:
+    """
+    Günlük değerlemelerden zaman ağırlıklı getiri.
+
+    t günündeki getiri = (V_t - F_t) / V_{t-1} - 1; F_t o günkü net
+    alış - satış tutarıdır (kümülatif net yatırımın farkı). Önceki günün
+    değeri sıfır olan günler (portföy boş) atlanır.
+
+    Args:
+        values: Günlük portföy değeri
+        invested: Günlük kümülatif net yatırım
+
+    Returns:
+        Dönem getirisi (oran) veya None (getiri hesaplanacak gün yoksa)
+    """
+    if len(values) < 2:
+        return None
+    flows = np.diff(invested)
+    previous = values[:-1]
+    active = previous > 0
+    if not active.any():
+        return None
+    daily = (values[1:][active] - flows[active]) / previous[active]
+    return float(np.prod(daily) - 1.0)
+
+
+def _percent(rate: Optional[float]) -> Optional[float]:
+    return None if rate is None or not np.isfinite(rate) else round(float(rate) * 100, 2)
+
+
+# ===========================================================================
+# PERFORMANS
+# ===========================================================================
+
+def portfolio_performance(
+    db: Session,
+    user_id: int,
+    now: Optional[datetime] = None,
+    store: Optional[PriceHistoryStore] = None,
+) -> dict:
+    """
+    Portföyün ve her hissenin getirisi.
+
+    Bugünkü değerleme history_service ile aynıdır (güncel fiyat, yoksa son
+    kapanış, yoksa son işlem fiyatı).
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        now: Değerleme anı (varsayılan: şimdi, UTC)
+        store: Günlük fiyat geçmişi deposu (varsayılan: history_store)
+
+    Returns:
+        PerformanceResponse yapısında sözlük
+    """
+    now = now or datetime.now(timezone.utc)
+    result = {"as_of": now.replace(tzinfo=None), "start": None, "portfolio": None, "stocks": []}
+    series = value_series(db, user_id, None, now, "D", store)
+    if series is None:
+        return result
+    transactions = load_transactions(db, user_id, until=now.replace(tzinfo=None))
+
+    # Nakit akışları: hisse başına bir satır + portföy satırı
+    symbols = list(series.symbols)
+    column_of = {symbol: i for i, symbol in enumerate(symbols)}
+    dates = np.array([t.transaction_date for t in transactions], dtype="datetime64[D]")
+    first = dates[0]
+    today = np.datetime64(now.replace(tzinfo=None), "D")
+    rows = np.array([column_of[t.stock_symbol] for t in transactions])
+    amounts = np.array([
+        -(t.total_amount + t.commission) if t.transaction_type == TransactionType.BUY
+        else t.total_amount - t.commission
+        for t in transactions
+    ])
+    market_values = series.quantity[-1] * series.price[-1]
+
+    # Satırlar: her hisse + son satır portföy. Sütunlar: işlemler (her
+    # işlem kendi sütununda, diğer satırlarda 0) + son sütun bugünkü değer
+    count = len(transactions)
+    span = int((today - first).astype(int))
+    flows = np.zeros((len(symbols) + 1, count + 1))
+    flows[rows, np.arange(count)] = amounts
+    flows[-1, :count] = amounts
+    flows[:-1, -1] = market_values
+    flows[-1, -1] = market_values.sum()
+    days = np.append((dates - first).astype(float), span)
+    rates = xirr(np.broadcast_to(days, flows.shape), flows)
+
+    twr = time_weighted_return(series.values, series.invested)
+    result["start"] = first.item()
+    result["portfolio"] = {
+        "xirr_percent": _percent(rates[-1]),
+        "twr_percent": _percent(twr),
+        "twr_annualized_percent": (
+            _percent((1 + twr) ** (DAYS_PER_YEAR / span) - 1)
+            if twr is not None and span >= DAYS_PER_YEAR and twr > -1 else None
+        ),
+        "market_value": round(float(market_values.sum()), 2),
+        "net_invested": round(float(series.invested[-1]), 2),
+        "profit": round(float(flows[-1].sum()), 2),
+    }
+    result["stocks"] = [
+        {
+            "stock_symbol": symbol,
+            "xirr_percent": _percent(rates[i]),
+            "market_value": round(float(market_values[i]), 2),
+            "profit": round(float(flows[i].sum()), 2),
+        }
+        for i, symbol in enumerate(symbols)
+    ]
+    return result
+
+
+def get_performance_json(
+    db: Session, user: User, version: tuple, now: datetime
+) -> bytes:
+    """
+    portfolio_performance sonucunu JSON (bytes) olarak döndürür.
+
+    (kullanıcı, veri sürümü) ve `version` (fiyat sürümü, fiyat geçmişi
+    deposu sürümü, gün) anahtarıyla önbelleğe alınır.
+    """
+    key = f"portfolio_performance:{user.id}:{user.data_version}:" + ":".join(
+        str(part) for part in version
+    )
+    payload = cache_get(key, "portfolio_performance")
+    if payload is None:
+        payload = orjson.dumps(portfolio_performance(db, user.id, now))
+        get_cache().set(key, payload)
+    return payload
@@ -0,0 +1,300 @@
+"""
+Risk Service - Portföy Risk Analizi
+=====================================
+Kullanıcının bugünkü pozisyonlarının, fiyat geçmişi deposundaki günlük
+kapanışlarla geriye dönük risk ölçüleri:
+
+- Volatilite: Günlük getirilerin yıllıklandırılmış standart sapması (tüm
+  dönem ve kayan pencere)
+- Maksimum düşüş (max drawdown): Zirveden en derin düşüş
+- Beta: Karşılaştırma endeksine (RISK_BENCHMARK_SYMBOL) göre
+- VaR (1 günlük): Tarihsel (getirilerin alt yüzdeliği) ve parametrik
+  (normal dağılım varsayımıyla)
+
+Tüm ölçüler (gün x sütun) getiri matrisi üzerinde, hisseler ve portföy
+aynı anda vektörel hesaplanır; portföy sütunu bugünkü adetlerin önceki
+günkü değerleriyle ağırlıklandırılmış hisse getirileridir. Sonuç
+(kullanıcı, veri sürümü, fiyat geçmişi deposu sürümü, gün) ile önbelleğe
+alınır.
+"""
+
+import warnings
+from datetime import date, datetime, timedelta, timezone
+from statistics import NormalDist
+from typing import List, Optional
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.config import settings
+from app.history_store import PriceHistoryStore, history_store
+from app.models.user import User
+from app.services.history_service import DEFAULT_HISTORY_POINTS, lttb_indices
+from app.services.snapshot_service import positions_as_of
+
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_RISK_DAYS = 365
+DEFAULT_VOLATILITY_WINDOW = 21
+DEFAULT_CONFIDENCE = 0.95
+
+
+# ===========================================================================
+# ÖLÇÜLER (gün x sütun matrisleri, NaN: veri yok)
+# ===========================================================================
+
+def daily_returns(closes: np.ndarray) -> np.ndarray:
+    """Günlük basit getiriler; ilk satır atlanır (T-1 x N)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return closes[1:] / closes[:-1] - 1.0
+
+
+def portfolio_returns(closes: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    """
+    Sabit adetli portföyün günlük getirisi.
+
+    Her gün, getirisi olan hisselerin önceki günkü değerleriyle ağırlıklı
+    ortalamadır; geçmişi sonradan başlayan hisseler seriye sıçrama eklemez.
+    """
+    returns = daily_returns(closes)
+    weights = closes[:-1] * quantities
+    valid = np.isfinite(returns) & np.isfinite(weights)
+    weights = np.where(valid, weights, 0.0)
+    total = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = (weights * np.where(valid, returns, 0.0)).sum(axis=1) / total
+    return np.where(total > 0, result, np.nan)
+
+
+def rolling_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    """
+    Kayan pencerede yıllıklandırılmış volatilite.
+
+    Kümülatif toplamlarla her sütun için O(T) hesaplanır.
+
+    Returns:
+        (T - window + 1 x N); i. satır returns[i : i + window] penceresi.
+        Penceresi eksik verili sütunlarda NaN.
+    """
+    valid = np.isfinite(returns)
+    values = np.where(valid, returns, 0.0)
+    zero = np.zeros((1, returns.shape[1]))
+    sums = np.concatenate([zero, np.cumsum(values, axis=0)])
+    squares = np.concatenate([zero, np.cumsum(values ** 2, axis=0)])
+    counts = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    s1 = sums[window:] - sums[:-window]
+    s2 = squares[window:] - squares[:-window]
+    n = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = np.maximum(s2 - s1 ** 2 / n, 0.0) / (n - 1)
+    return np.where(n == window, np.sqrt(variance * TRADING_DAYS_PER_YEAR), np.nan)
+
+
+def max_drawdown(levels: np.ndarray) -> np.ndarray:
+    """Her sütunun zirveden en derin düşüşü (oran, <= 0); verisiz sütunda NaN."""
+    peaks = np.fmax.accumulate(levels, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdowns = levels / peaks - 1.0
+    has_data = np.isfinite(drawdowns).any(axis=0)
+    return np.where(has_data, np.where(np.isfinite(drawdowns), drawdowns, 0.0).min(axis=0, initial=0.0), np.nan)
+
+
+def beta(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """Her sütunun benchmark getirisine betası (ortak günler üzerinden)."""
+    valid = np.isfinite(returns) & np.isfinite(benchmark)[:, None]
+    n = valid.sum(axis=0)
+    r = np.where(valid, returns, 0.0)
+    b = np.where(valid, benchmark[:, None], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_mean = r.sum(axis=0) / n
+        b_mean = b.sum(axis=0) / n
+        b_dev = np.where(valid, b - b_mean, 0.0)
+        covariance = (np.where(valid, r - r_mean, 0.0) * b_dev).sum(axis=0)
+        variance = (b_dev ** 2).sum(axis=0)
+        return np.where((n > 1) & (variance > 0), covariance / variance, np.nan)
+
+
+def value_at_risk(returns: np.ndarray, confidence: float):
+    """
+    1 günlük VaR (kayıp oranı, pozitif).
+
+    Returns:
+        (tarihsel, parametrik) sütun dizileri
+    """
+    z = NormalDist().inv_cdf(1.0 - confidence)
+    with warnings.catch_warnings():
+        # Verisiz sütunlar (All-NaN slice) NaN döner
+        warnings.simplefilter("ignore", RuntimeWarning)
+        historical = -np.nanquantile(returns, 1.0 - confidence, axis=0)
+        parametric = -(np.nanmean(returns, axis=0) + z * np.nanstd(returns, axis=0, ddof=1))
+    return historical, parametric
+
+
+def annual_volatility(returns: np.ndarray) -> np.ndarray:
+    """Tüm dönemin yıllıklandırılmış volatilitesi."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanstd(returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+# ===========================================================================
+# PORTFÖY
+# ===========================================================================
+
+def _percent(value) -> Optional[float]:
+    return round(float(value) * 100, 2) if np.isfinite(value) else None
+
+
+def _round(value, digits: int = 2) -> Optional[float]:
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def risk_metrics(
+    days: np.ndarray,
+    closes: np.ndarray,
+    quantities: np.ndarray,
+    benchmark: Optional[np.ndarray] = None,
+    window: int = DEFAULT_VOLATILITY_WINDOW,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> dict:
+    """
+    Hisseler ve portföy için risk ölçüleri (son sütun portföy).
+
+    Args:
+        days: Gün ekseni (datetime64[D])
+        closes: (gün x hisse) kapanışlar
+        quantities: (hisse,) bugünkü adetler
+        benchmark: (gün,) endeks kapanışları (None: beta yok)
+        window: Kayan volatilite penceresi (işlem günü)
+        confidence: VaR güven düzeyi
+
+    Returns:
+        Ölçü adı -> (hisse + 1,) dizi; "rolling" portföyün kayan
+        volatilite serisi (günler, değerler)
+    """
+    portfolio = portfolio_returns(closes, quantities)
+    returns = np.column_stack([daily_returns(closes), portfolio])
+    # Portföy düzeyi: günlük getirilerden bileşik endeks
+    level = np.ones(len(closes))
+    level[1:] = np.cumprod(1.0 + np.nan_to_num(portfolio))
+    levels = np.column_stack([closes, level])
+
+    rolling = (
+        rolling_volatility(returns, window) if len(returns) >= window
+        else np.empty((0, returns.shape[1]))
+    )
+    historical, parametric = value_at_risk(returns, confidence)
+    betas = (
+        beta(returns, daily_returns(benchmark[:, None])[:, 0]) if benchmark is not None
+        else np.full(returns.shape[1], np.nan)
+    )
+    latest = rolling[-1] if len(rolling) else np.full(returns.shape[1], np.nan)
+    return {
+        "volatility": annual_volatility(returns),
+        "rolling_volatility": latest,
+        "max_drawdown": max_drawdown(levels),
+        "beta": betas,
+        "var_historical": historical,
+        "var_parametric": parametric,
+        "rolling": (days[window:], rolling[:, -1]),
+    }
+
+
+def portfolio_risk(
+    db: Session,
+    user_id: int,
+    days: int = DEFAULT_RISK_DAYS,
+    window: int = DEFAULT_VOLATILITY_WINDOW,
+    confidence: float = DEFAULT_CONFIDENCE,
+    now: Optional[datetime] = None,
+    store: Optional[PriceHistoryStore] = None,
+) -> dict:
+    """
+    Bugünkü pozisyonların son `days` gündeki risk ölçüleri.
+
+    Değerleme fiyat geçmişi deposundaki son kapanışlarladır (gün içinde
+    sabit kalır). Geçmişi olmayan hisseler ölçüsüz listelenir.
+
+    Returns:
+        RiskResponse yapısında sözlük
+    """
+    now = now or datetime.now(timezone.utc)
+    store = store or history_store
+    benchmark_symbol = settings.RISK_BENCHMARK_SYMBOL
+    result = {
+        "as_of": None, "days": days, "window": window, "confidence": confidence,
+        "benchmark": None, "portfolio": None, "stocks": [], "rolling_volatility": [],
+    }
+    positions = positions_as_of(db, user_id, now.replace(tzinfo=None))
+    symbols: List[str] = sorted(s for s, p in positions.items() if p.quantity > 0)
+    if not symbols:
+        return result
+
+    end = now.date()
+    start = end - timedelta(days=days)
+    axis, closes = store.aligned_closes(symbols, start, end)
+    # Endeks, hisselerin gün eksenine (aynı gün) eşlenir
+    index_days, index_closes = store.aligned_closes([benchmark_symbol], start, end)
+    index = np.full(len(axis), np.nan)
+    _, at_axis, at_index = np.intersect1d(axis, index_days, return_indices=True)
+    index[at_axis] = index_closes[at_index, 0]
+    has_benchmark = bool(np.isfinite(index).sum() > 1)
+
+    quantities = np.array([positions[s].quantity for s in symbols])
+    metrics = risk_metrics(
+        axis, closes, quantities, index if has_benchmark else None, window, confidence
+    )
+    rolling_days, rolling = metrics.pop("rolling")
+    last_close = closes[-1] if len(axis) else np.full(len(symbols), np.nan)
+    values = quantities * last_close
+    market_value = float(np.nansum(values))
+
+    def describe(i: int, value: float) -> dict:
+        return {
+            "market_value": _round(value),
+            "volatility_percent": _percent(metrics["volatility"][i]),
+            "rolling_volatility_percent": _percent(metrics["rolling_volatility"][i]),
+            "max_drawdown_percent": _percent(metrics["max_drawdown"][i]),
+            "beta": _round(metrics["beta"][i], 4),
+            "var_historical_percent": _percent(metrics["var_historical"][i]),
+            "var_parametric_percent": _percent(metrics["var_parametric"][i]),
+            "var_historical": _round(metrics["var_historical"][i] * value),
+            "var_parametric": _round(metrics["var_parametric"][i] * value),
+        }
+
+    result["as_of"] = axis[-1].item() if len(axis) else None
+    result["benchmark"] = benchmark_symbol if has_benchmark else None
+    result["portfolio"] = describe(-1, market_value)
+    result["stocks"] = [
+        {"stock_symbol": symbol, **describe(i, values[i])} for i, symbol in enumerate(symbols)
+    ]
+    finite = np.isfinite(rolling)
+    rolling_days, rolling = rolling_days[finite], rolling[finite]
+    keep = lttb_indices(rolling_days.astype(np.int64), rolling, DEFAULT_HISTORY_POINTS)
+    result["rolling_volatility"] = [
+        {"day": day, "value": round(float(value) * 100, 2)}
+        for day, value in zip(rolling_days[keep].astype(date), rolling[keep])
+    ]
+    return result
+
+
+def get_risk_json(
+    db: Session, user: User, days: int, window: int, confidence: float, version: tuple,
+    now: datetime,
+) -> bytes:
+    """
+    portfolio_risk sonucunu JSON (bytes) olarak döndürür.
+
+    (kullanıcı, veri sürümü, parametreler) ve `version` (fiyat geçmişi
+    deposu sürümü, gün) anahtarıyla önbelleğe alınır; aynı işlem gününde
+    tekrar hesaplanmaz.
+    """
+    key = f"portfolio_risk:{user.id}:{user.data_version}:{days}:{window}:{confidence}:" + ":".join(
+        str(part) for part in version
+    )
+    payload = cache_get(key, "portfolio_risk")
+    if payload is None:
+        payload = orjson.dumps(portfolio_risk(db, user.id, days, window, confidence, now))
+        get_cache().set(key, payload)
+    return payload
@@ -0,0 +1,452 @@
+"""
+Snapshot Service - Günlük Portföy Anlık Görüntüleri
+=====================================================
+Geçmiş bir tarihteki portföyü hesaplamak için tüm işlemleri baştan
+oynatmak yerine, o tarihten önceki en yakın günlük anlık görüntüden
+başlanır ve sadece sonraki işlemler oynatılır.
+
+- Anlık görüntü bir günün sonundaki hisse bazlı durumdur (Position):
+  alış/satış adet ve tutarları, komisyon, son işlem fiyatı ve hisse adı.
+  Sadece işlem yapılan ve tamamlanmış (bugünden önceki) günler için yazılır.
+- Yazma işlemleri, işlemin gününden itibaren anlık görüntüleri aynı
+  transaction içinde siler (invalidate_snapshots) ve eksik günlerin
+  oluşturulmasını erteler (SnapshotScheduler, SNAPSHOT_DEBOUNCE_SECONDS).
+- Oluşturma, okunan veri sürümü hâlâ güncelse commit edilir; araya giren
+  bir yazma işlemi varsa sonuç atılır.
+
+Çalıştırma:
+    python -m app.services.snapshot_service build [user_id ...]     # Eksik günler (gece işi)
+    python -m app.services.snapshot_service rebuild [user_id ...]   # Baştan oluştur
+    python -m app.services.snapshot_service check [user_id ...]     # Tam oynatmayla karşılaştır
+"""
+
+import math
+import sys
+import threading
+from dataclasses import astuple, dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.logger import get_logger
+from app.metrics import REGISTRY
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+
+logger = get_logger(__name__)
+
+SNAPSHOTS_WRITTEN_TOTAL = REGISTRY.counter(
+    "snapshots_written_total",
+    "Yazılan günlük portföy anlık görüntüsü sayısı",
+)
+
+# Tutarlılık kontrolünde kabul edilen kayan nokta farkı
+CHECK_TOLERANCE = 1e-6
+
+
+# ===========================================================================
+# POZİSYON DURUMU
+# ===========================================================================
+
+@dataclass
+class Position:
+    """Bir hissenin işlemlerden birikmiş durumu."""
+    stock_name: Optional[str] = None
+    buy_quantity: float = 0.0
+    buy_amount: float = 0.0
+    sell_quantity: float = 0.0
+    sell_amount: float = 0.0
+    commission: float = 0.0
+    last_trade_price: Optional[float] = None
+
+    @property
+    def quantity(self) -> float:
+        """Net elde tutulan adet."""
+        return self.buy_quantity - self.sell_quantity
+
+    def apply(self, t) -> None:
+        """Bir işlemi (Transaction veya aynı sütunlara sahip satır) ekler."""
+        if t.transaction_type == TransactionType.BUY:
+            self.buy_quantity += t.quantity
+            self.buy_amount += t.total_amount
+        elif t.transaction_type == TransactionType.SELL:
+            self.sell_quantity += t.quantity
+            self.sell_amount += t.total_amount
+        self.commission += t.commission
+        self.last_trade_price = t.price_per_unit
+        # En son işlemdeki hisse adını kullan
+        if t.stock_name:
+            self.stock_name = t.stock_name
+
+
+Positions = Dict[str, Position]
+
+
+def replay(positions: Positions, transactions: Iterable) -> Positions:
+    """İşlemleri (tarih sırasıyla) pozisyonlara uygular."""
+    for t in transactions:
+        position = positions.get(t.stock_symbol)
+        if position is None:
+            position = positions[t.stock_symbol] = Position()
+        position.apply(t)
+    return positions
+
+
+def encode_positions(positions: Positions) -> bytes:
+    """Pozisyonları kompakt JSON'a çevirir: {hisse: [alan, ...]}."""
+    return orjson.dumps({symbol: astuple(p) for symbol, p in sorted(positions.items())})
+
+
+def decode_positions(payload: bytes) -> Positions:
+    """encode_positions'ın tersi."""
+    return {symbol: Position(*fields) for symbol, fields in orjson.loads(payload).items()}
+
+
+# ===========================================================================
+# OKUMA
+# ===========================================================================
+
+_REPLAY_COLUMNS = (
+    Transaction.stock_symbol,
+    Transaction.stock_name,
+    Transaction.transaction_type,
+    Transaction.quantity,
+    Transaction.price_per_unit,
+    Transaction.total_amount,
+    Transaction.commission,
+    Transaction.transaction_date,
+)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def load_transactions(
+    db: Session,
+    user_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    stock_symbol: Optional[str] = None,
+) -> list:
+    """
+    Oynatma için gereken sütunlar, tarih sırasıyla.
+
+    Args:
+        since: Bu andan itibaren (dahil)
+        until: Bu ana kadar (dahil)
+        stock_symbol: Sadece bu hisse
+    """
+    query = select(*_REPLAY_COLUMNS).where(Transaction.user_id == user_id)
+    if since is not None:
+        query = query.where(Transaction.transaction_date >= since)
+    if until is not None:
+        query = query.where(Transaction.transaction_date <= until)
+    if stock_symbol is not None:
+        query = query.where(Transaction.stock_symbol == stock_symbol)
+    return db.execute(query.order_by(Transaction.transaction_date, Transaction.id)).all()
+
+
+def latest_snapshot(
+    db: Session, user_id: int, before: Optional[date] = None
+) -> Optional[Tuple[date, int, Positions]]:
+    """
+    Kullanıcının `before` gününden önceki en yeni anlık görüntüsü.
+
+    Returns:
+        (gün, o güne kadarki işlem sayısı, pozisyonlar) veya None
+    """
+    query = select(
+        PortfolioSnapshot.snapshot_date,
+        PortfolioSnapshot.transaction_count,
+        PortfolioSnapshot.positions,
+    ).where(PortfolioSnapshot.user_id == user_id)
+    if before is not None:
+        query = query.where(PortfolioSnapshot.snapshot_date < before)
+    row = db.execute(
+        query.order_by(PortfolioSnapshot.snapshot_date.desc()).limit(1)
+    ).first()
+    if row is None:
+        return None
+    return row.snapshot_date, row.transaction_count, decode_positions(row.positions)
+
+
+def positions_as_of(
+    db: Session, user_id: int, as_of: datetime, stock_symbol: Optional[str] = None
+) -> Positions:
+    """
+    Kullanıcının `as_of` anındaki (dahil) pozisyonları.
+
+    as_of gününden önceki en yakın anlık görüntüden başlar ve sadece
+    sonraki işlemleri oynatır; anlık görüntü yoksa as_of'a kadarki işlemler
+    (user_id, transaction_date) indeksiyle aralık taranarak oynatılır.
+
+    Args:
+        stock_symbol: Verilirse sadece bu hissenin pozisyonu döner
+    """
+    snapshot = latest_snapshot(db, user_id, before=as_of.date())
+    if snapshot is None:
+        positions, since = {}, None
+    else:
+        day, _, positions = snapshot
+        since = _day_start(day + timedelta(days=1))
+    if stock_symbol is not None:
+        positions = {stock_symbol: positions[stock_symbol]} if stock_symbol in positions else {}
+    return replay(
+        positions,
+        load_transactions(db, user_id, since=since, until=as_of, stock_symbol=stock_symbol),
+    )
+
+
+# ===========================================================================
+# YAZMA
+# ===========================================================================
+
+def invalidate_snapshots(db: Session, user_id: int, since: date) -> None:
+    """
+    `since` gününden itibaren anlık görüntüleri siler.
+
+    Yazma işleminde, bump_data_version'dan sonra aynı transaction içinde
+    çağrılır; böylece eski bir anlık görüntü hiçbir zaman okunmaz.
+    """
+    db.execute(
+        delete(PortfolioSnapshot).where(
+            PortfolioSnapshot.user_id == user_id,
+            PortfolioSnapshot.snapshot_date >= since,
+        )
+    )
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def build_snapshots(db: Session, user_id: int, today: Optional[date] = None) -> int:
+    """
+    En yeni anlık görüntüden sonraki, tamamlanmış işlem günlerinin
+    anlık görüntülerini oluşturur.
+
+    Okunan veri sürümü commit anında hâlâ güncel değilse (araya bir yazma
+    girdiyse) hiçbir şey yazılmaz; bir sonraki çalıştırma tekrar dener.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        today: Bu gün ve sonrası için anlık görüntü yazılmaz (varsayılan: bugün, UTC)
+
+    Returns:
+        Yazılan anlık görüntü sayısı
+    """
+    today = today or _today()
+    data_version = db.execute(
+        select(User.data_version).where(User.id == user_id)
+    ).scalar_one_or_none()
+    if data_version is None:
+        return 0
+
+    snapshot = latest_snapshot(db, user_id)
+    if snapshot is None:
+        positions, count, since = {}, 0, None
+    else:
+        day, count, positions = snapshot
+        since = _day_start(day + timedelta(days=1))
+    transactions = load_transactions(db, user_id, since=since, until=_day_start(today))
+
+    rows = []
+    for index, t in enumerate(transactions):
+        if t.transaction_date >= _day_start(today):
+            break
+        replay(positions, [t])
+        day = t.transaction_date.date()
+        following = transactions[index + 1] if index + 1 < len(transactions) else None
+        if following is None or following.transaction_date.date() != day:
+            rows.append({
+                "user_id": user_id,
+                "snapshot_date": day,
+                "data_version": data_version,
+                "transaction_count": count + index + 1,
+                "positions": encode_positions(positions),
+            })
+    if not rows:
+        db.rollback()
+        return 0
+
+    db.execute(PortfolioSnapshot.__table__.insert(), rows)
+    # Koşullu güncelleme kullanıcı satırını kilitler: eşzamanlı bir yazma
+    # (bump_data_version) ya bekler ya da sürümü değiştirmiş olur.
+    current = db.execute(
+        update(User)
+        .where(User.id == user_id, User.data_version == data_version)
+        .values(data_version=User.data_version)
+    ).rowcount
+    if not current:
+        db.rollback()
+        logger.info(f"⏭️  Kullanıcı {user_id}: veri değişti, anlık görüntüler atlandı")
+        return 0
+    db.commit()
+    SNAPSHOTS_WRITTEN_TOTAL.inc((), len(rows))
+    return len(rows)
+
+
+def rebuild_snapshots(db: Session, user_id: int, today: Optional[date] = None) -> int:
+    """Kullanıcının tüm anlık görüntülerini silip baştan oluşturur."""
+    db.execute(delete(PortfolioSnapshot).where(PortfolioSnapshot.user_id == user_id))
+    db.commit()
+    return build_snapshots(db, user_id, today)
+
+
+def _differences(expected: Positions, actual: Positions) -> List[str]:
+    """İki pozisyon kümesi arasındaki farklar (boş liste: eşit)."""
+    problems = []
+    for symbol in sorted(set(expected) | set(actual)):
+        if symbol not in actual or symbol not in expected:
+            problems.append(f"{symbol}: {'eksik' if symbol not in actual else 'fazla'}")
+            continue
+        for field, want, got in zip(
+            Position.__dataclass_fields__, astuple(expected[symbol]), astuple(actual[symbol])
+        ):
+            if isinstance(want, float) and isinstance(got, float):
+                equal = math.isclose(want, got, rel_tol=CHECK_TOLERANCE, abs_tol=CHECK_TOLERANCE)
+            else:
+                equal = want == got
+            if not equal:
+                problems.append(f"{symbol}.{field}: {got!r} != {want!r}")
+    return problems
+
+
+def check_snapshots(db: Session, user_id: int) -> List[str]:
+    """
+    Anlık görüntüleri tüm işlemlerin tek geçişte oynatılmasıyla karşılaştırır.
+
+    Returns:
+        Tutarsızlıklar ("gün: açıklama"); boş liste tutarlı demektir
+    """
+    snapshots = db.execute(
+        select(
+            PortfolioSnapshot.snapshot_date,
+            PortfolioSnapshot.transaction_count,
+            PortfolioSnapshot.positions,
+        )
+        .where(PortfolioSnapshot.user_id == user_id)
+        .order_by(PortfolioSnapshot.snapshot_date)
+    ).all()
+    transactions = load_transactions(db, user_id)
+
+    problems = []
+    positions: Positions = {}
+    applied = 0
+    for snapshot in snapshots:
+        end = _day_start(snapshot.snapshot_date + timedelta(days=1))
+        while applied < len(transactions) and transactions[applied].transaction_date < end:
+            replay(positions, [transactions[applied]])
+            applied += 1
+        if snapshot.transaction_count != applied:
+            problems.append(
+                f"{snapshot.snapshot_date}: işlem sayısı {snapshot.transaction_count} != {applied}"
+            )
+        problems.extend(
+            f"{snapshot.snapshot_date}: {problem}"
+            for problem in _differences(positions, decode_positions(snapshot.positions))
+        )
+    return problems
+
+
+# ===========================================================================
+# ERTELENMİŞ OLUŞTURMA (YAZMA SONRASI)
+# ===========================================================================
+
+class SnapshotScheduler:
+    """
+    Yazma işlemlerinden sonra anlık görüntü oluşturmayı erteler.
+
+    Aynı kullanıcı için süre dolmadan gelen yeni yazmalar zamanlayıcıyı
+    yeniden başlatır; böylece art arda yapılan işlemler için tek bir
+    oluşturma çalışır.
+    """
+
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self._timers: Dict[int, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, bind, user_id: int) -> None:
+        """
+        Kullanıcının eksik günlerini delay_seconds sonra oluşturur.
+
+        Args:
+            bind: İstek oturumunun engine'i (db.get_bind())
+            user_id: Kullanıcı ID'si
+        """
+        if self.delay_seconds <= 0:
+            return
+        timer = threading.Timer(self.delay_seconds, self._run, (bind, user_id))
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(user_id, None)
+            if previous is not None:
+                previous.cancel()
+            self._timers[user_id] = timer
+        timer.start()
+
+    def _run(self, bind, user_id: int) -> None:
+        with self._lock:
+            if self._timers.get(user_id) is threading.current_thread():
+                del self._timers[user_id]
+        try:
+            with Session(bind=bind) as db:
+                build_snapshots(db, user_id)
+        except Exception as e:
+            logger.error(f"❌ Anlık görüntü oluşturulamadı (kullanıcı {user_id}): {e}")
+
+    def cancel_all(self) -> None:
+        """Bekleyen tüm oluşturmaları iptal eder."""
+        with self._lock:
+            timers, self._timers = self._timers, {}
+        for timer in timers.values():
+            timer.cancel()
+
+
+# Uygulama genelinde paylaşılan zamanlayıcı
+snapshot_scheduler = SnapshotScheduler(settings.SNAPSHOT_DEBOUNCE_SECONDS)
+
+
+# ===========================================================================
+# KOMUT SATIRI
+# ===========================================================================
+
+def main(argv: List[str]) -> int:
+    """Komut satırı giriş noktası."""
+    from app.database import SessionLocal
+
+    commands = {"build": build_snapshots, "rebuild": rebuild_snapshots, "check": check_snapshots}
+    if not argv or argv[0] not in commands:
+        print("Kullanım: python -m app.services.snapshot_service build | rebuild | check [user_id ...]")
+        return 2
+
+    command = argv[0]
+    with SessionLocal() as db:
+        user_ids = [int(arg) for arg in argv[1:]] or list(
+            db.execute(select(User.id).order_by(User.id)).scalars()
+        )
+        if command == "check":
+            failed = 0
+            for user_id in user_ids:
+                problems = check_snapshots(db, user_id)
+                failed += bool(problems)
+                for problem in problems:
+                    print(f"❌ Kullanıcı {user_id} - {problem}")
+            print(f"{'✅' if not failed else '❌'} {len(user_ids) - failed}/{len(user_ids)} kullanıcı tutarlı")
+            return 1 if failed else 0
+
+        written = sum(commands[command](db, user_id) for user_id in user_ids)
+    print(f"✅ {written} anlık görüntü yazıldı ({len(user_ids)} kullanıcı)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,216 @@
+"""
+Sync Service - İstemci Senkronizasyonu
+========================================
+Masaüstü istemcisinin yerel önbelleğini tüm işlemleri yeniden indirmeden
+güncel tutması için:
+
+- Değişiklik akışı: İstemci son aldığı sıra numarasını (`since`) gönderir
+  ve sadece o numaradan sonra değişen işlemleri alır. Her işlem için
+  yalnızca son değişiklik tutulduğundan maliyet, değişen işlem sayısıyla
+  orantılıdır.
+- Aralık özetleri: Uzun süre çevrimdışı kalmış istemciler ay/gün/satır
+  özetlerini karşılaştırarak sadece farklı olan aralıkları indirir.
+"""
+
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.cache import cache_get, get_cache
+from app.models.transaction import Transaction
+from app.models.transaction_change import ChangeOp, TransactionChange
+from app.models.user import User
+from app.services.portfolio_service import transaction_to_dict
+
+# Tek yanıttaki varsayılan / en fazla değişiklik sayısı
+DEFAULT_CHANGE_LIMIT = 500
+MAX_CHANGE_LIMIT = 1000
+
+
+def get_changes(
+    db: Session, user_id: int, since: int, limit: int = DEFAULT_CHANGE_LIMIT
+) -> dict:
+    """
+    `since` sıra numarasından sonra değişen işlemleri döndürür.
+
+    Silinen işlemler `transaction: None` ile (tombstone) döner. Değişiklikler
+    sıra numarasına göre artan sıradadır; `has_more` True ise istemci aynı
+    isteği `next_since` ile tekrarlamalıdır.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        since: İstemcinin son aldığı sıra numarası (ilk senkronizasyonda 0)
+        limit: En fazla değişiklik sayısı
+
+    Returns:
+        {"changes", "next_since", "has_more"} sözlüğü
+    """
+    rows = (
+        db.query(TransactionChange, Transaction)
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.id == TransactionChange.transaction_id,
+                Transaction.user_id == TransactionChange.user_id,
+            ),
+        )
+        .filter(
+            TransactionChange.user_id == user_id,
+            TransactionChange.seq > since,
+        )
+        .order_by(TransactionChange.seq)
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(rows) > limit
+    changes = []
+    for change, transaction in rows[:limit]:
+        deleted = change.op == ChangeOp.DELETE or transaction is None
+        changes.append({
+            "seq": change.seq,
+            "op": ChangeOp.DELETE if deleted else change.op,
+            "transaction_id": change.transaction_id,
+            "transaction": None if deleted else transaction_to_dict(transaction),
+        })
+
+    return {
+        "changes": changes,
+        "next_since": changes[-1]["seq"] if changes else since,
+        "has_more": has_more,
+    }
+
+
+# ===========================================================================
+# ARALIK ÖZETLERİ (MERKLE DIGESTS)
+# ===========================================================================
+# Ağaç: işlem satırı -> gün -> ay -> kök
+#   satır özeti : sha256(kanonik JSON)  (TransactionResponse alanları,
+#                 anahtarlar sıralı, ayraçlar boşluksuz)
+#   gün özeti   : sha256(günün satır özetleri, işlem ID sırasıyla)
+#   ay özeti    : sha256(ayın gün özetleri, tarih sırasıyla)
+#   kök         : sha256(ay özetleri, tarih sırasıyla)
+# İstemci aynı özetleri yerel verisinden hesaplar, farklı olan aya/güne
+# iner ve sadece farklı satırları indirir.
+
+def row_digest(transaction) -> str:
+    """Tek bir işlemin kanonik JSON gösteriminin SHA-256 özeti."""
+    canonical = orjson.dumps(transaction_to_dict(transaction), option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def combine_digests(digests: Iterable[str]) -> str:
+    """Alt düğüm özetlerinden (sıralı) üst düğüm özetini üretir."""
+    combined = hashlib.sha256()
+    for digest in digests:
+        combined.update(digest.encode("ascii"))
+    return combined.hexdigest()
+
+
+def _month_range(month: str) -> Tuple[datetime, datetime]:
+    """"YYYY-MM" -> [ayın ilk günü, sonraki ayın ilk günü)."""
+    year, month_number = (int(part) for part in month.split("-"))
+    start = datetime(year, month_number, 1)
+    end = datetime(year + month_number // 12, month_number % 12 + 1, 1)
+    return start, end
+
+
+def get_digests(
+    db: Session,
+    user_id: int,
+    month: Optional[str] = None,
+    day: Optional[date] = None,
+) -> dict:
+    """
+    İşlemlerin ay, gün veya satır düzeyindeki özetlerini döndürür.
+
+    Args:
+        db: Veritabanı oturumu
+        user_id: Kullanıcı ID'si
+        month: "YYYY-MM" verilirse o ayın gün özetleri
+        day: Verilirse o günün satır (işlem) özetleri
+
+    Returns:
+        {"level", "key", "digest", "count", "buckets": [{"key", "digest", "count"}]}
+        "digest" istenen kapsamın (kök / ay / gün) özetidir.
+    """
+    columns = Transaction.__table__.c
+    query = select(*columns).where(columns.user_id == user_id)
+    if day is not None:
+        level, key = "row", day.isoformat()
+        start = datetime(day.year, day.month, day.day)
+        query = query.where(
+            columns.transaction_date >= start,
+            columns.transaction_date < start + timedelta(days=1),
+        )
+    elif month is not None:
+        level, key = "day", month
+        start, end = _month_range(month)
+        query = query.where(columns.transaction_date >= start, columns.transaction_date < end)
+    else:
+        level, key = "month", None
+
+    # Gün -> [(işlem ID, satır özeti)]
+    days: Dict[date, List[Tuple[int, str]]] = defaultdict(list)
+    for row in db.execute(query):
+        days[row.transaction_date.date()].append((row.id, row_digest(row)))
+    for rows in days.values():
+        rows.sort()
+
+    if level == "row":
+        rows = days.get(day, [])
+        buckets = [{"key": str(tx_id), "digest": digest, "count": 1} for tx_id, digest in rows]
+    else:
+        day_buckets = [
+            {
+                "key": day_key.isoformat(),
+                "digest": combine_digests(digest for _, digest in days[day_key]),
+                "count": len(days[day_key]),
+            }
+            for day_key in sorted(days)
+        ]
+        if level == "day":
+            buckets = day_buckets
+        else:
+            months: Dict[str, List[dict]] = defaultdict(list)
+            for bucket in day_buckets:
+                months[bucket["key"][:7]].append(bucket)
+            buckets = [
+                {
+                    "key": month_key,
+                    "digest": combine_digests(b["digest"] for b in months[month_key]),
+                    "count": sum(b["count"] for b in months[month_key]),
+                }
+                for month_key in sorted(months)
+            ]
+
+    return {
+        "level": level,
+        "key": key,
+        "digest": combine_digests(bucket["digest"] for bucket in buckets),
+        "count": sum(bucket["count"] for bucket in buckets),
+        "buckets": buckets,
+    }
+
+
+def get_digests_json(
+    db: Session, user: User, month: Optional[str] = None, day: Optional[date] = None
+) -> bytes:
+    """
+    get_digests sonucunu JSON (bytes) olarak döndürür.
+
+    Özetler (kullanıcı, veri sürümü, kapsam) anahtarıyla önbelleğe alınır;
+    veri değişmediği sürece satırlar tekrar okunup hash'lenmez.
+    """
+    key = f"digests:{user.id}:{user.data_version}:{month or ''}:{day or ''}"
+    payload = cache_get(key, "digests")
+    if payload is None:
+        payload = orjson.dumps(get_digests(db, user.id, month, day))
+        get_cache().set(key, payload)
+    return payload
@@ -0,0 +1,441 @@
+"""
+Tick Service - Gün İçi Fiyat Akışı
+====================================
+Fiyat tick'lerini bir kaynaktan (dosya, TCP soketi) okur, bellekte
+OHLCV çubuklarına (1m, 1h, 1d) toplar ve çubukları toplu upsert ile
+`price_bars` tablosuna yazar. Ham tick'ler veritabanına yazılmaz.
+
+Akış:
+    kaynak (okuyucu thread) --[sınırlı kuyruk]--> BarAggregator --> flush
+
+- Kaynaklar satır gruplarını (batch) kuyruğa koyar. Kuyruk doluysa
+  okuyucu bekler (backpressure): dosya okuma durur, soket okunmadığı için
+  TCP akış kontrolü göndericiyi yavaşlatır.
+- Aggregator sadece son yazımdan bu yana değişen çubukları tutar; her
+  flush bu kısmi çubukları veritabanındakilerle birleştirir. Bellek
+  kullanımı TICK_MAX_PENDING_BARS ile sınırlıdır.
+- Her flush ayrıca hisselerin son fiyatını instrument_prices tablosuna
+  yazar; böylece portföy özetleri gün içi değerleme gösterir.
+
+Satır biçimi (virgülle ayrılmış, zaman UNIX saniyesi):
+    THYAO,262.75,1500,1718370000.125
+
+Çalıştırma:
+    python -m app.services.tick_service ticks.csv
+    python -m app.services.tick_service tcp://127.0.0.1:9100
+"""
+
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.logger import get_logger
+from app.metrics import REGISTRY
+from app.models.price_bar import BarInterval, PriceBar
+from app.services.price_service import prices, write_last_prices
+
+logger = get_logger(__name__)
+
+# Tick: (hisse kodu, fiyat, hacim, UNIX zamanı)
+Tick = Tuple[str, float, float, float]
+
+# Günlük çubuklar Borsa İstanbul saatine (UTC+3) göre gece yarısında başlar
+MARKET_UTC_OFFSET_SECONDS = 3 * 3600
+# Kapanış seansının bittiği an (yerel gece yarısından itibaren saniye, 18:10);
+# bu andan önce günlük çubuk kısmidir
+MARKET_CLOSE_SECONDS = 18 * 3600 + 10 * 60
+
+# (aralık, genişlik saniye, hizalama kayması)
+DEFAULT_INTERVALS: Tuple[Tuple[str, int, int], ...] = (
+    (BarInterval.MINUTE, 60, 0),
+    (BarInterval.HOUR, 3600, 0),
+    (BarInterval.DAY, 86400, MARKET_UTC_OFFSET_SECONDS),
+)
+
+# Kaynakların tek seferde okuduğu en fazla byte
+READ_CHUNK_SIZE = 64 * 1024
+# Tek INSERT ... ON CONFLICT ifadesindeki en fazla çubuk
+UPSERT_BATCH_SIZE = 1000
+
+TICKS_INGESTED_TOTAL = REGISTRY.counter(
+    "ticks_ingested_total",
+    "Toplanan fiyat tick'leri",
+)
+TICKS_REJECTED_TOTAL = REGISTRY.counter(
+    "ticks_rejected_total",
+    "Ayrıştırılamayan tick satırları",
+)
+PRICE_BARS_WRITTEN_TOTAL = REGISTRY.counter(
+    "price_bars_written_total",
+    "Veritabanına yazılan (kısmi) fiyat çubukları",
+    ("interval",),
+)
+TICK_QUEUE_DEPTH = REGISTRY.gauge(
+    "tick_queue_depth",
+    "Toplanmayı bekleyen tick grupları",
+)
+
+
+# ===========================================================================
+# KAYNAKLAR
+# ===========================================================================
+
+def parse_ticks(lines: Sequence[bytes]) -> List[Tick]:
+    """
+    Tick satırlarını ayrıştırır; hatalı satırlar atlanır.
+
+    Args:
+        lines: b"SEMBOL,fiyat,hacim,zaman" satırları
+
+    Returns:
+        Tick listesi
+    """
+    ticks: List[Tick] = []
+    append = ticks.append
+    rejected = 0
+    for line in lines:
+        try:
+            symbol, price, volume, timestamp = line.split(b",")
+            append((symbol.strip().upper().decode(), float(price), float(volume), float(timestamp)))
+        except ValueError:
+            if line.strip():
+                rejected += 1
+    if rejected:
+        TICKS_REJECTED_TOTAL.inc(amount=rejected)
+    return ticks
+
+
+def _line_batches(read: Callable[[int], bytes]) -> Iterator[List[Tick]]:
+    """read(n) ile okunan parçaları tam satırlardan oluşan tick gruplarına böler."""
+    pending = b""
+    while True:
+        chunk = read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield parse_ticks(lines)
+    if pending:
+        yield parse_ticks([pending])
+
+
+class TickSource:
+    """Tick kaynağı arayüzü: tick gruplarını sırayla üretir."""
+
+    def batches(self) -> Iterator[List[Tick]]:  # pragma: no cover - alt sınıflar uygular
+        raise NotImplementedError
+
+
+class FileTickSource(TickSource):
+    """Satır bazlı tick dosyası."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def batches(self) -> Iterator[List[Tick]]:
+        with self.path.open("rb") as feed:
+            yield from _line_batches(feed.read)
+
+
+class SocketTickSource(TickSource):
+    """
+    TCP üzerinden satır bazlı tick akışı; gönderici bağlantıyı kapatınca
+    biter.
+    """
+
+    def __init__(self, host: str, port: int, timeout: Optional[float] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def batches(self) -> Iterator[List[Tick]]:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            yield from _line_batches(conn.recv)
+
+
+# ===========================================================================
+# ÇUBUK TOPLAMA
+# ===========================================================================
+
+class BarAggregator:
+    """
+    Tick'leri bellekte OHLCV çubuklarına toplar.
+
+    Sadece son drain()'den bu yana gelen tick'lerin kısmi çubuklarını
+    tutar. Tick'ler sırasız gelebilir: open / close ve son fiyat geliş
+    sırasına göre değil, tick zamanına göre belirlenir.
+    """
+
+    def __init__(self, intervals: Sequence[Tuple[str, int, int]] = DEFAULT_INTERVALS):
+        self.intervals = tuple(intervals)
+        # (hisse, aralık, başlangıç) ->
+        #     [open, high, low, close, volume, tick_count, open zamanı, close zamanı]
+        self._bars: Dict[Tuple[str, str, int], list] = {}
+        # hisse -> (son fiyat, son tick zamanı)
+        self._last: Dict[str, Tuple[float, float]] = {}
+        self.tick_count = 0
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def add(self, ticks: List[Tick]) -> None:
+        """Bir tick grubunu çubuklara ekler."""
+        bars = self._bars
+        last = self._last
+        intervals = self.intervals
+        for symbol, price, volume, timestamp in ticks:
+            for interval, width, offset in intervals:
+                start = int((timestamp + offset) // width) * width - offset
+                key = (symbol, interval, start)
+                bar = bars.get(key)
+                if bar is None:
+                    bars[key] = [price, price, price, price, volume, 1, timestamp, timestamp]
+                    continue
+                if price > bar[1]:
+                    bar[1] = price
+                elif price < bar[2]:
+                    bar[2] = price
+                if timestamp >= bar[7]:
+                    bar[3] = price
+                    bar[7] = timestamp
+                elif timestamp < bar[6]:
+                    bar[0] = price
+                    bar[6] = timestamp
+                bar[4] += volume
+                bar[5] += 1
+            previous = last.get(symbol)
+            if previous is None or timestamp >= previous[1]:
+                last[symbol] = (price, timestamp)
+        self.tick_count += len(ticks)
+
+    def drain(self) -> Tuple[List[dict], Dict[str, Tuple[float, datetime]]]:
+        """
+        Bekleyen çubukları ve son fiyatları döndürür, toplayıcıyı sıfırlar.
+
+        Returns:
+            (price_bars satırları, hisse -> (son fiyat, zaman))
+        """
+        bars, last = self._bars, self._last
+        self._bars, self._last = {}, {}
+        rows = [
+            {
+                "stock_symbol": symbol,
+                "interval": interval,
+                "bucket_start": _utc(start),
+                "open": bar[0],
+                "high": bar[1],
+                "low": bar[2],
+                "close": bar[3],
+                "volume": bar[4],
+                "tick_count": bar[5],
+                "open_time": _utc(bar[6]),
+                "close_time": _utc(bar[7]),
+            }
+            for (symbol, interval, start), bar in bars.items()
+        ]
+        last_prices = {symbol: (price, _utc(ts)) for symbol, (price, ts) in last.items()}
+        return rows, last_prices
+
+
+def _utc(timestamp: float) -> datetime:
+    """UNIX zamanını veritabanındaki gibi saat dilimsiz UTC'ye çevirir."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def write_bars(db: Session, rows: List[dict]) -> None:
+    """
+    Kısmi çubukları mevcut çubuklarla birleştirerek yazar (commit etmez).
+
+    open / close, zamanı daha erken / daha geç olan taraftan alınır; böylece
+    eski tick'lerin yeniden oynatılması kapanışı geri almaz.
+
+    Args:
+        db: Veritabanı oturumu
+        rows: BarAggregator.drain() satırları
+    """
+    table = PriceBar.__table__
+    statement = dialect_insert(db, table)
+    new = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.stock_symbol, table.c.interval, table.c.bucket_start],
+        set_={
+            "high": case((new.high > table.c.high, new.high), else_=table.c.high),
+            "low": case((new.low < table.c.low, new.low), else_=table.c.low),
+            "open": case((new.open_time < table.c.open_time, new.open), else_=table.c.open),
+            "open_time": case(
+                (new.open_time < table.c.open_time, new.open_time), else_=table.c.open_time,
+            ),
+            "close": case(
+                (table.c.close_time > new.close_time, table.c.close), else_=new.close,
+            ),
+            "close_time": case(
+                (table.c.close_time > new.close_time, table.c.close_time),
+                else_=new.close_time,
+            ),
+            "volume": table.c.volume + new.volume,
+            "tick_count": table.c.tick_count + new.tick_count,
+        },
+    )
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(statement, rows[start:start + UPSERT_BATCH_SIZE])
+    for interval, count in Counter(row["interval"] for row in rows).items():
+        PRICE_BARS_WRITTEN_TOTAL.inc((interval,), count)
+
+
+# ===========================================================================
+# ALIM DÖNGÜSÜ
+# ===========================================================================
+
+@dataclass
+class IngestStats:
+    """Bir alım çalışmasının özeti."""
+    ticks: int = 0
+    bars_written: int = 0
+    flushes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+
+_END = object()
+
+
+class TickIngestor:
+    """
+    Kaynağı ayrı bir thread'de okur, tick'leri toplar ve çubukları
+    periyodik olarak yazar.
+
+    Args:
+        session_factory: Yeni veritabanı oturumu döndüren çağrılabilir
+        queue_size: Bekleyebilecek en fazla tick grubu (backpressure sınırı)
+        flush_interval: Çubukların en fazla bu aralıkla (saniye) yazılması
+        max_pending_bars: Bu kadar çubuk birikince beklemeden yazılır
+        update_prices: Son fiyatlar instrument_prices'a da yazılsın mı
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        queue_size: int = settings.TICK_QUEUE_SIZE,
+        flush_interval: float = settings.TICK_FLUSH_INTERVAL_SECONDS,
+        max_pending_bars: int = settings.TICK_MAX_PENDING_BARS,
+        update_prices: bool = True,
+        intervals: Sequence[Tuple[str, int, int]] = DEFAULT_INTERVALS,
+    ):
+        self.session_factory = session_factory
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self.flush_interval = flush_interval
+        self.max_pending_bars = max_pending_bars
+        self.update_prices = update_prices
+        self.aggregator = BarAggregator(intervals)
+        self.stats = IngestStats()
+
+    def _read(self, source: TickSource, errors: list) -> None:
+        """Okuyucu thread: kuyruk doluysa put() bekler (backpressure)."""
+        try:
+            for batch in source.batches():
+                if batch:
+                    self.queue.put(batch)
+                    TICK_QUEUE_DEPTH.inc()
+        except Exception as exc:  # Ana thread'e iletilir
+            errors.append(exc)
+        finally:
+            self.queue.put(_END)
+
+    def flush(self) -> int:
+        """Bekleyen çubukları (ve son fiyatları) tek transaction'da yazar."""
+        rows, last_prices = self.aggregator.drain()
+        if not rows:
+            return 0
+        with self.session_factory() as db:
+            write_bars(db, rows)
+            if self.update_prices:
+                write_last_prices(db, last_prices)
+            db.commit()
+        if self.update_prices:
+            prices.invalidate()
+        self.stats.bars_written += len(rows)
+        self.stats.flushes += 1
+        return len(rows)
+
+    def run(self, source: TickSource) -> IngestStats:
+        """
+        Kaynak bitene kadar tick'leri toplar ve yazar.
+
+        Returns:
+            IngestStats
+        """
+        errors: list = []
+        reader = threading.Thread(
+            target=self._read, args=(source, errors), name="tick-reader", daemon=True
+        )
+        started = time.perf_counter()
+        next_flush = time.monotonic() + self.flush_interval
+        reader.start()
+
+        while True:
+            try:
+                batch = self.queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                batch = None
+            if batch is _END:
+                break
+            if batch is not None:
+                TICK_QUEUE_DEPTH.dec()
+                self.aggregator.add(batch)
+                TICKS_INGESTED_TOTAL.inc(amount=len(batch))
+            if len(self.aggregator) >= self.max_pending_bars or time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+        reader.join()
+        self.flush()
+        self.stats.ticks = self.aggregator.tick_count
+        self.stats.seconds = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+        logger.info(
+            f"📈 {self.stats.ticks} tick toplandı, {self.stats.bars_written} çubuk yazıldı "
+            f"({self.stats.ticks_per_second:,.0f} tick/sn)"
+        )
+        return self.stats
+
+
+def source_from_uri(uri: str) -> TickSource:
+    """"tcp://host:port" veya dosya yolundan kaynak oluşturur."""
+    if uri.startswith("tcp://"):
+        host, _, port = uri[len("tcp://"):].rpartition(":")
+        return SocketTickSource(host, int(port))
+    return FileTickSource(Path(uri))
+
+
+def main(argv: List[str]) -> int:
+    """Komut satırı giriş noktası."""
+    from app.database import SessionLocal
+
+    if not argv:
+        print("Kullanım: python -m app.services.tick_service <ticks.csv|tcp://host:port>")
+        return 2
+
+    stats = TickIngestor(SessionLocal).run(source_from_uri(argv[0]))
+    print(f"✅ {stats.ticks} tick, {stats.bars_written} çubuk ({stats.flushes} yazım)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
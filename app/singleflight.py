@@ -0,0 +1,98 @@
+"""
+Single-Flight (İstek Birleştirme)
+===================================
+Aynı anahtar için eşzamanlı gelen pahalı hesaplamaları tek bir
+hesaplamaya indirir: ilk çağıran (lider) hesaplamayı yapar, aynı anda
+gelen diğer çağıranlar sonucu bekler ve aynı sonucu alır.
+
+Anahtar (fonksiyon adı, kullanıcı ID'si, veri sürümü, ...) biçimindedir;
+veri sürümü anahtarda olduğundan bir yazma işleminden sonra gelen istekler
+eski hesaplamaya bağlanmaz.
+
+Endpointler thread havuzunda çalıştığından bekleme threading.Event ile
+yapılır. Lider hata alırsa aynı hata bekleyenlere de iletilir.
+
+Kullanım:
+    summary = flights.run("portfolio_summary", (user.id, user.data_version),
+                          lambda: calculate_portfolio_summary(db, user.id))
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.metrics import REGISTRY
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_CALLS_TOTAL = REGISTRY.counter(
+    "singleflight_calls_total",
+    "Single-flight çağrıları (executed: hesaplandı, coalesced: bekleyip sonucu paylaştı)",
+    ("function", "result"),
+)
+
+
+class _Call:
+    """Devam eden tek bir hesaplama."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Anahtar başına en fazla bir hesaplamanın çalışmasını sağlar."""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, Hashable], _Call] = {}
+        self._lock = threading.Lock()
+
+    def run(self, name: str, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        fn'i çalıştırır; aynı (name, key) için devam eden bir hesaplama
+        varsa onun sonucunu bekler.
+
+        Args:
+            name: Hesaplamanın adı (metrik etiketi, ör: "portfolio_summary")
+            key: Hesaplamayı belirleyen değerler (ör: (user_id, data_version))
+            fn: Argümansız hesaplama fonksiyonu
+
+        Returns:
+            fn'in (kendi veya liderin) sonucu
+        """
+        flight_key = (name, key)
+        with self._lock:
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+
+        if not leader:
+            SINGLEFLIGHT_CALLS_TOTAL.inc((name, "coalesced"))
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLEFLIGHT_CALLS_TOTAL.inc((name, "executed"))
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            # Önce kaydı sil: bundan sonra gelenler yeni bir hesaplama başlatır
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Şu an devam eden hesaplama sayısı."""
+        return len(self._calls)
+
+
+# Uygulama genelinde paylaşılan grup
+flights = SingleFlight()
@@ -0,0 +1,102 @@
+"""
+Logging Benchmark'ı
+====================
+Logging seviyesi (INFO / DEBUG) ve handler yapısının (senkron dosya
+handler'ları / kuyruk tabanlı pipeline) istek gecikmesine etkisini ölçer.
+
+Test endpointi her istekte 1 INFO ve 5 DEBUG kaydı üretir.
+
+Çalıştırma:
+    python -m benchmarks.bench_logging [istek_sayısı]
+"""
+
+import logging
+import logging.handlers
+import queue
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.logger as app_logger
+
+
+def _build_app(bench_logger: logging.Logger) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/api/transactions/{transaction_id}")
+    def read(transaction_id: int):
+        bench_logger.info(f"İşlem okundu: {transaction_id}")
+        for step in range(5):
+            bench_logger.debug(f"Adım {step}: transaction_id={transaction_id}")
+        return {"id": transaction_id}
+
+    return bench_app
+
+
+def _measure(client: TestClient, requests: int) -> list:
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        client.get(f"/api/transactions/{i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(mode: str, level: int, requests: int, log_dir: Path) -> dict:
+    """Tek bir konfigürasyonu ölçer ve gecikme istatistiklerini döndürür."""
+    app_logger.logs_dir = log_dir / f"{mode}-{logging.getLevelName(level)}"
+    file_handlers = app_logger.build_handlers()[1:]  # konsol hariç
+
+    bench_logger = logging.getLogger(f"bench.{mode}.{level}")
+    bench_logger.setLevel(level)
+    bench_logger.propagate = False
+
+    listener = None
+    if mode == "queue":
+        log_queue = queue.SimpleQueue()
+        bench_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(
+            log_queue, *file_handlers, respect_handler_level=True
+        )
+        listener.start()
+    else:
+        for handler in file_handlers:
+            bench_logger.addHandler(handler)
+
+    with TestClient(_build_app(bench_logger)) as client:
+        _measure(client, min(200, requests))  # ısınma
+        latencies = _measure(client, requests)
+
+    if listener is not None:
+        listener.stop()
+    for handler in file_handlers:
+        handler.close()
+
+    latencies.sort()
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main(requests: int = 2000) -> None:
+    print(f"İstek sayısı: {requests}")
+    print(f"{'Mod':<8} {'Seviye':<7} {'ort (ms)':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sync", "queue"):
+            for level in (logging.INFO, logging.DEBUG):
+                stats = run(mode, level, requests, Path(tmp))
+                print(
+                    f"{mode:<8} {logging.getLevelName(level):<7} "
+                    f"{stats['mean']:>9.3f} {stats['p50']:>9.3f} {stats['p99']:>9.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
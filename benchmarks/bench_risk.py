@@ -0,0 +1,64 @@
+"""
+Risk Analizi Benchmark'ı
+=========================
+500 hisselik, 10 yıllık günlük geçmişi olan bir portföyün risk
+ölçülerinin süresini ölçer (hedef: istek başına 1 sn altı, önbelleksiz).
+
+Senaryolar:
+    okuma   : fiyat geçmişi deposundan ortak eksende kapanış matrisi
+    ölçüler : getiriler, kayan volatilite, düşüş, beta, VaR (vektörel)
+
+Çalıştırma:
+    python -m benchmarks.bench_risk [hisse_sayısı] [yıl]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+from app.history_store import PriceHistoryStore
+from app.services.risk_service import risk_metrics
+
+TARGET_SECONDS = 1.0
+
+
+def main(symbols: int = 500, years: int = 10) -> None:
+    rng = np.random.default_rng(42)
+    days = np.busday_offset("2015-01-01", np.arange(252 * years), roll="forward")
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = PriceHistoryStore(directory)
+        index = 1000 * np.cumprod(1 + rng.normal(0, 0.01, len(days)))
+        store.append("XU100", days, {"close": index})
+        for i, name in enumerate(names):
+            # Hisselerin bir kısmı dönem içinde işlem görmeye başlar
+            offset = (i * 7) % (len(days) // 2) if i % 5 == 0 else 0
+            closes = 50 * np.cumprod(1 + rng.normal(0, 0.02, len(days) - offset))
+            store.append(name, days[offset:], {"close": closes})
+
+        start = time.perf_counter()
+        axis, closes = store.aligned_closes(names, date(2015, 1, 1), date(2025, 12, 31))
+        benchmark = store.aligned_closes(["XU100"])[1][:, 0]
+        read_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        risk_metrics(axis, closes, rng.integers(1, 1000, symbols).astype(float), benchmark)
+        metric_seconds = time.perf_counter() - start
+
+    total = read_seconds + metric_seconds
+    mark = "✅" if total < TARGET_SECONDS else "❌"
+    print(f"Hisse: {symbols}  Gün: {len(axis):,}  Hedef: {TARGET_SECONDS:.1f} sn")
+    print(f"{'okuma':<8} {read_seconds * 1000:>8.1f} ms")
+    print(f"{'ölçüler':<8} {metric_seconds * 1000:>8.1f} ms")
+    print(f"{'toplam':<8} {total * 1000:>8.1f} ms {mark}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
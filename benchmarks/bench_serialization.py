@@ -0,0 +1,151 @@
+"""
+Serileştirme Benchmark'ı
+=========================
+Okuma endpointlerinin yanıt üretme süresini karşılaştırır:
+
+    eski : ORM -> response_model doğrulaması -> jsonable -> stdlib json
+    yeni : ORM -> sözlük / şema nesnesi -> orjson (ikinci doğrulama yok)
+
+Senaryolar: 100 satırlık işlem sayfası ve 500 hisselik portföy özeti.
+
+Çalıştırma:
+    python -m benchmarks.bench_serialization [tekrar_sayısı]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User  # noqa: F401  (ilişki çözümlemesi için)
+from app.schemas.transaction import (
+    PortfolioSummary,
+    StockSummary,
+    TransactionListResponse,
+)
+from app.services.portfolio_service import transaction_to_dict
+
+
+def _transactions(count: int) -> list:
+    base = datetime(2024, 1, 1, 10, 0, 0)
+    return [
+        Transaction(
+            id=i,
+            user_id=1,
+            stock_symbol=f"SYM{i % 50}",
+            stock_name=f"Hisse {i % 50}",
+            transaction_type=TransactionType.BUY if i % 3 else TransactionType.SELL,
+            quantity=100.0 + i,
+            price_per_unit=10.5 + i / 10,
+            total_amount=(100.0 + i) * (10.5 + i / 10),
+            commission=1.25,
+            transaction_date=base + timedelta(hours=i),
+            notes="Benchmark",
+            created_at=base + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+def _stock_fields(count: int) -> list:
+    return [
+        dict(
+            stock_symbol=f"SYM{i}",
+            stock_name=f"Hisse {i}",
+            total_quantity=100.0 + i,
+            average_cost=12.3456,
+            total_invested=1234.56 + i,
+            total_commission=4.5,
+            total_buy_quantity=150.0 + i,
+            total_sell_quantity=50.0,
+        )
+        for i in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Eski yol: FastAPI'nin response_model işlemlerinin eşdeğeri
+# ---------------------------------------------------------------------------
+_list_adapter = TypeAdapter(TransactionListResponse)
+_summary_adapter = TypeAdapter(PortfolioSummary)
+
+
+def old_transaction_page(transactions: list) -> bytes:
+    response = TransactionListResponse(
+        transactions=transactions, total_count=1000, page=1, page_size=100
+    )
+    validated = _list_adapter.validate_python(response.model_dump())
+    content = _list_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def old_portfolio(stocks: list) -> bytes:
+    summary = PortfolioSummary(
+        user_id=1,
+        total_invested=1.0,
+        total_commission=1.0,
+        stock_count=len(stocks),
+        stocks=[StockSummary(**fields) for fields in stocks],
+    )
+    validated = _summary_adapter.validate_python(summary.model_dump())
+    content = _summary_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Yeni yol: güvenilir veriden doğrudan sözlük + orjson
+# ---------------------------------------------------------------------------
+def new_transaction_page(transactions: list) -> bytes:
+    return orjson.dumps({
+        "transactions": [transaction_to_dict(t) for t in transactions],
+        "total_count": 1000,
+        "page": 1,
+        "page_size": 100,
+    })
+
+
+def new_portfolio(stocks: list) -> bytes:
+    # Not: pydantic 2.x'te model_construct saf Python'dur ve bu boyutta
+    # Rust tabanlı normal kurucudan yavaştır; asıl kazanç FastAPI'nin
+    # response_model için yaptığı ikinci doğrulama + jsonable turunun atlanmasıdır.
+    summary = PortfolioSummary(
+        user_id=1,
+        total_invested=1.0,
+        total_commission=1.0,
+        stock_count=len(stocks),
+        stocks=[StockSummary(**fields) for fields in stocks],
+    )
+    return orjson.dumps(summary.model_dump())
+
+
+def _timeit(func, arg, repeat: int) -> float:
+    func(arg)  # ısınma
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(repeat: int = 200) -> None:
+    page = _transactions(100)
+    stocks = _stock_fields(500)
+    assert orjson.loads(old_transaction_page(page)) == orjson.loads(new_transaction_page(page))
+    assert orjson.loads(old_portfolio(stocks)) == orjson.loads(new_portfolio(stocks))
+
+    print(f"Tekrar: {repeat}")
+    print(f"{'Senaryo':<24} {'eski (ms)':>10} {'yeni (ms)':>10} {'hızlanma':>9}")
+    for name, old, new, arg in (
+        ("100 satırlık sayfa", old_transaction_page, new_transaction_page, page),
+        ("500 hisselik portföy", old_portfolio, new_portfolio, stocks),
+    ):
+        old_ms = _timeit(old, arg, repeat)
+        new_ms = _timeit(new, arg, repeat)
+        print(f"{name:<24} {old_ms:>10.3f} {new_ms:>10.3f} {old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,95 @@
+"""
+Fiyat Akışı Benchmark'ı
+========================
+Tick alım hattının tek çekirdekteki hızını ölçer (hedef: 50.000 tick/sn).
+
+Senaryolar:
+    ayrıştırma : bytes satırlar -> Tick
+    toplama    : Tick -> 1m / 1h / 1d çubukları (bellekte)
+    uçtan uca  : dosya -> okuyucu thread -> kuyruk -> toplama -> SQLite upsert
+
+Tick'ler 200 hisse için 6,5 saatlik bir seansa yayılır (her hisseye
+saniyede ~2 tick düşecek şekilde).
+
+Çalıştırma:
+    python -m benchmarks.bench_ticks [tick_sayısı]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.instrument_price import InstrumentPrice, PriceEpoch  # noqa: F401
+from app.models.price_bar import PriceBar  # noqa: F401
+from app.services.tick_service import (
+    BarAggregator,
+    FileTickSource,
+    TickIngestor,
+    parse_ticks,
+)
+
+TARGET_TICKS_PER_SECOND = 50_000
+SESSION_START = 1718344800.0  # 2024-06-14 10:00 İstanbul
+SESSION_SECONDS = 6.5 * 3600
+
+
+def _feed(count: int, symbols: int = 200) -> bytes:
+    rng = random.Random(42)
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+    step = SESSION_SECONDS / count
+    lines = []
+    for i in range(count):
+        price = 10 + rng.random() * 90
+        lines.append(
+            f"{names[i % symbols]},{price:.2f},{rng.randint(1, 500)},{SESSION_START + i * step:.3f}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _rate(count: int, seconds: float) -> str:
+    rate = count / seconds
+    mark = "✅" if rate >= TARGET_TICKS_PER_SECOND else "❌"
+    return f"{rate:>12,.0f} tick/sn {mark}"
+
+
+def main(count: int = 500_000) -> None:
+    payload = _feed(count)
+    lines = payload.split(b"\n")[:-1]
+
+    start = time.perf_counter()
+    ticks = parse_ticks(lines)
+    parse_seconds = time.perf_counter() - start
+
+    aggregator = BarAggregator()
+    start = time.perf_counter()
+    for offset in range(0, len(ticks), 2000):
+        aggregator.add(ticks[offset:offset + 2000])
+    aggregate_seconds = time.perf_counter() - start
+    bars = len(aggregator)
+
+    with tempfile.TemporaryDirectory() as directory:
+        feed = Path(directory) / "ticks.csv"
+        feed.write_bytes(payload)
+        engine = create_engine(f"sqlite:///{directory}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        ingestor = TickIngestor(sessionmaker(bind=engine), flush_interval=1.0)
+        stats = ingestor.run(FileTickSource(feed))
+        engine.dispose()
+
+    print(f"Tick: {count:,}  Çubuk: {bars:,}  Hedef: {TARGET_TICKS_PER_SECOND:,} tick/sn")
+    print(f"{'ayrıştırma':<12} {_rate(count, parse_seconds)}")
+    print(f"{'toplama':<12} {_rate(count, aggregate_seconds)}")
+    print(
+        f"{'uçtan uca':<12} {_rate(stats.ticks, stats.seconds)}"
+        f"  ({stats.bars_written:,} çubuk, {stats.flushes} yazım)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
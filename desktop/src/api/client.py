@@ -5,11 +5,40 @@ FastAPI backend'e HTTP istekleri gönderir.
 """
 
 import requests
+import copy
+import hashlib
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from requests.exceptions import RequestException, Timeout, ConnectionError
 
 
+# Dashboard için kabul edilen en fazla bayatlık (saniye): güncel veri arka
+# planda hesaplanırken önceki yanıt hemen gösterilir
+DASHBOARD_MAX_STALE = 60
+
+
+def _accepted_encodings() -> str:
+    """
+    İstemcinin çözebildiği sıkıştırma kodlamaları.
+
+    requests (urllib3) gzip/deflate yanıtlarını her zaman, Brotli ve zstd
+    yanıtlarını ise ilgili paket kuruluysa otomatik olarak çözer.
+    """
+    encodings = []
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    encodings.extend(["gzip", "deflate"])
+    return ", ".join(encodings)
+
+
 class APIClient:
     """Backend API ile iletişim kuran sınıf."""
 
@@ -23,25 +52,40 @@ class APIClient:
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
+            # Yavaş bağlantılarda yanıt boyutunu küçültmek için sıkıştırma iste
+            "Accept-Encoding": _accepted_encodings(),
         }
         self.timeout = 10  # saniye
+        # GET yanıtları için ETag önbelleği: istek anahtarı -> (ETag, yanıt)
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
 
     def set_token(self, token: str):
         """JWT token'ı ayarla."""
         self.token = token
         self.headers["Authorization"] = f"Bearer {token}"
+        self._etag_cache.clear()
 
     def clear_token(self):
         """Token'ı temizle."""
         self.token = None
         self.headers.pop("Authorization", None)
+        self._etag_cache.clear()
+
+    @staticmethod
+    def _cache_key(url: str, params: Optional[Dict]) -> str:
+        """GET isteği için önbellek anahtarı (URL + sıralı parametreler)."""
+        if not params:
+            return url
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
 
     def _request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """
         HTTP isteği gönder.
@@ -51,6 +95,7 @@ class APIClient:
             endpoint: API endpoint'i (/api/auth/register vb)
             data: POST/PUT body'si
             params: Query parameters
+            extra_headers: Sadece bu isteğe eklenecek başlıklar (GET)
 
         Returns:
             Response JSON
@@ -59,12 +104,20 @@ class APIClient:
             APIError: API hatası durumunda
         """
         url = f"{self.base_url}{endpoint}"
+        cache_key = None
+        cached = None
 
         try:
             if method == "GET":
+                # Elimizdeki sürümü bildir; değişmediyse sunucu 304 döner
+                headers = {**self.headers, **(extra_headers or {})}
+                cache_key = self._cache_key(url, params)
+                cached = self._etag_cache.get(cache_key)
+                if cached:
+                    headers["If-None-Match"] = cached[0]
                 response = requests.get(
                     url,
-                    headers=self.headers,
+                    headers=headers,
                     params=params,
                     timeout=self.timeout
                 )
@@ -92,6 +145,10 @@ class APIClient:
             else:
                 raise ValueError(f"Bilinmeyen HTTP metodu: {method}")
 
+            # Veri değişmedi: önbellekteki yanıtı kullan
+            if response.status_code == 304 and cached:
+                return copy.deepcopy(cached[1])
+
             # Status code kontrolü
             if response.status_code >= 400:
                 try:
@@ -105,7 +162,11 @@ class APIClient:
             if response.status_code == 204:  # No Content
                 return {}
 
-            return response.json()
+            data = response.json()
+            etag = response.headers.get("ETag")
+            if cache_key and etag:
+                self._etag_cache[cache_key] = (etag, copy.deepcopy(data))
+            return data
 
         except (ConnectionError, Timeout):
             raise APIError("🔴 Sunucuya bağlanılamıyor. Lütfen API sunucusunun çalıştığını kontrol edin.")
@@ -199,18 +260,183 @@ class APIClient:
         """İşlemi sil."""
         return self._request("DELETE", f"/api/transactions/{transaction_id}")
 
+    def get_changes(self, since: int = 0, limit: int = 500) -> Dict:
+        """
+        Son senkronizasyondan sonra değişen işlemleri al.
+
+        Args:
+            since: Son alınan sıra numarası (önceki yanıttaki next_since)
+            limit: En fazla değişiklik sayısı
+
+        Returns:
+            {"changes", "next_since", "has_more", "data_version"} sözlüğü
+        """
+        params = {"since": since, "limit": limit}
+        return self._request("GET", "/api/transactions/changes", params=params)
+
+    def get_digests(self, month: Optional[str] = None, day: Optional[str] = None) -> Dict:
+        """
+        İşlem özetlerini al (ay → gün → işlem).
+
+        Args:
+            month: "YYYY-MM" verilirse o ayın gün özetleri
+            day: "YYYY-MM-DD" verilirse o günün işlem özetleri
+
+        Returns:
+            {"level", "key", "digest", "count", "buckets"} sözlüğü
+        """
+        params = {k: v for k, v in (("month", month), ("day", day)) if v}
+        return self._request("GET", "/api/transactions/digests", params=params or None)
+
+    @staticmethod
+    def transaction_digest(transaction: Dict) -> str:
+        """
+        API'den alınmış bir işlemin satır özeti (sunucudaki ile aynı).
+
+        Kanonik biçim: anahtarları sıralı, boşluksuz JSON'un SHA-256'sı.
+        """
+        canonical = json.dumps(
+            transaction, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def combine_digests(digests: List[str]) -> str:
+        """Sıralı alt özetlerden gün/ay/kök özetini hesapla."""
+        combined = hashlib.sha256()
+        for digest in digests:
+            combined.update(digest.encode("ascii"))
+        return combined.hexdigest()
+
     # ========================================================================
     # PORTFOLIO ENDPOINTS
     # ========================================================================
 
-    def get_portfolio_summary(self) -> Dict:
-        """Portföy özeti al."""
-        return self._request("GET", "/api/transactions/portfolio/summary")
+    def get_portfolio_summary(self, max_stale: Optional[int] = None) -> Dict:
+        """
+        Portföy özeti al.
+
+        Args:
+            max_stale: Verilirse, güncel özet hesaplanırken en fazla bu kadar
+                saniye eski özet kabul edilir (yanıtta "stale": true olur).
+        """
+        extra_headers = {"Cache-Control": f"max-stale={max_stale}"} if max_stale else None
+        return self._request(
+            "GET", "/api/transactions/portfolio/summary", extra_headers=extra_headers
+        )
 
     def get_stock_summary(self, stock_symbol: str) -> Dict:
         """Hisse özeti al."""
         return self._request("GET", f"/api/transactions/portfolio/{stock_symbol}")
 
+    def get_dashboard(
+        self,
+        recent: int = 5,
+        chart_points: int = 60,
+        max_stale: Optional[int] = DASHBOARD_MAX_STALE,
+    ) -> Dict:
+        """
+        Ana sayfa verilerini tek istekte al.
+
+        Args:
+            recent: Son işlem sayısı
+            chart_points: Grafikteki en fazla nokta
+            max_stale: Güncel veri hesaplanırken en fazla bu kadar saniye
+                eski yanıt kabul edilir ("stale": true); None: sadece güncel
+
+        Returns:
+            {"cards", "holdings", "recent_transactions", "chart", "stale"} sözlüğü
+        """
+        params = {"recent": recent, "chart_points": chart_points}
+        extra_headers = {"Cache-Control": f"max-stale={max_stale}"} if max_stale else None
+        return self._request("GET", "/api/dashboard", params=params, extra_headers=extra_headers)
+
+    def get_portfolio_history(self, period: str = "1Y", points: int = 120) -> Dict:
+        """
+        Portföy değer grafiği serisini al.
+
+        Args:
+            period: Dönem (1G, 1H, 1A, 1Y)
+            points: En fazla nokta sayısı
+
+        Returns:
+            {"period", "interval", "total_points", "points"} sözlüğü
+        """
+        params = {"period": period, "points": points}
+        return self._request("GET", "/api/portfolio/history", params=params)
+
+    def batch_get(self, paths: List[str]) -> List[Dict]:
+        """
+        Birden fazla GET isteğini tek HTTP isteğinde gönder.
+
+        Args:
+            paths: API yolları (ör: ["/api/transactions/portfolio/THYAO"])
+
+        Returns:
+            Her yol için {"status", "headers", "body"} (aynı sırayla)
+        """
+        data = {"requests": [{"path": path} for path in paths]}
+        return self._request("POST", "/api/batch", data=data)["responses"]
+
+    def get_stock_summaries(self, stock_symbols: List[str]) -> Dict[str, Dict]:
+        """Birden fazla hissenin özetini tek istekte al (bulunamayanlar atlanır)."""
+        results = self.batch_get(
+            [f"/api/transactions/portfolio/{symbol}" for symbol in stock_symbols]
+        )
+        return {
+            symbol: result["body"]
+            for symbol, result in zip(stock_symbols, results)
+            if result["status"] == 200
+        }
+
+    # ========================================================================
+    # EVENT STREAM (SSE)
+    # ========================================================================
+
+    def stream_events(self, read_timeout: float = 60) -> Iterator[Dict]:
+        """
+        Değişiklik olaylarını dinle (GET /api/events).
+
+        Periyodik yenileme yerine kullanılır: "transactions_changed" veya
+        "resync" olayı geldiğinde ekran verisi yeniden yüklenir. Çağrı,
+        bağlantı açık kaldığı sürece bloklar; ayrı bir thread'de
+        çalıştırılmalıdır.
+
+        Args:
+            read_timeout: Sunucu ping'leri arasında beklenecek en fazla süre
+
+        Yields:
+            Olay sözlükleri (ör: {"type": "transactions_changed", "data_version": 5, ...})
+        """
+        url = f"{self.base_url}/api/events"
+        headers = {**self.headers, "Accept": "text/event-stream"}
+        try:
+            with requests.get(
+                url, headers=headers, stream=True, timeout=(self.timeout, read_timeout)
+            ) as response:
+                if response.status_code >= 400:
+                    raise APIError(f"{response.status_code}: Olay akışı açılamadı")
+
+                data_lines: List[str] = []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line is None:
+                        continue
+                    if not line:
+                        # Boş satır: olay tamamlandı
+                        if data_lines:
+                            yield json.loads("\n".join(data_lines))
+                            data_lines = []
+                        continue
+                    if line.startswith(":"):
+                        continue  # ping
+                    field, _, value = line.partition(":")
+                    if field == "data":
+                        data_lines.append(value.lstrip())
+        except (ConnectionError, Timeout):
+            raise APIError("🔴 Olay akışı bağlantısı koptu.")
+        except RequestException as e:
+            raise APIError(f"İstek hatası: {str(e)}")
+
     # ========================================================================
     # HEALTH ENDPOINTS
     # ========================================================================
@@ -63,7 +63,7 @@ class Application:
         if self.auth_window:
             self.auth_window.close()
 
-        self.main_window = MainWindow(self.api_client, self.session)
+        self.main_window = MainWindow(self.api_client, self.session, self.settings)
         self.main_window.logout_requested.connect(self._show_auth_window)
         self.main_window.show()
 
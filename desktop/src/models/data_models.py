@@ -75,6 +75,11 @@ class StockSummary:
     total_commission: float
     total_buy_quantity: float
     total_sell_quantity: float
+    last_price: Optional[float] = None
+    market_value: Optional[float] = None
+    unrealized_pnl: Optional[float] = None
+    unrealized_pnl_percent: Optional[float] = None
+    daily_pnl: Optional[float] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> 'StockSummary':
@@ -88,6 +93,11 @@ class StockSummary:
             total_commission=data['total_commission'],
             total_buy_quantity=data['total_buy_quantity'],
             total_sell_quantity=data['total_sell_quantity'],
+            last_price=data.get('last_price'),
+            market_value=data.get('market_value'),
+            unrealized_pnl=data.get('unrealized_pnl'),
+            unrealized_pnl_percent=data.get('unrealized_pnl_percent'),
+            daily_pnl=data.get('daily_pnl'),
         )
 
 
@@ -99,6 +109,9 @@ class PortfolioSummary:
     total_commission: float
     stock_count: int
     stocks: List[StockSummary]
+    total_market_value: Optional[float] = None
+    total_unrealized_pnl: Optional[float] = None
+    total_daily_pnl: Optional[float] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> 'PortfolioSummary':
@@ -109,4 +122,7 @@ class PortfolioSummary:
             total_commission=data['total_commission'],
             stock_count=data['stock_count'],
             stocks=[StockSummary.from_dict(stock) for stock in data['stocks']],
+            total_market_value=data.get('total_market_value'),
+            total_unrealized_pnl=data.get('total_unrealized_pnl'),
+            total_daily_pnl=data.get('total_daily_pnl'),
         )
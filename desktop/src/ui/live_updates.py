@@ -0,0 +1,114 @@
+"""
+Live Updates - Değişiklikte Ekran Yenileme
+============================================
+Ayarlara göre ekran verisini güncel tutar:
+
+- live_updates açıksa: Sunucunun olay akışı (GET /api/events) arka plan
+  thread'inde dinlenir; "transactions_changed" veya "resync" olayı
+  geldiğinde `changed` sinyali yayılır. Bağlantı koparsa artan aralıklarla
+  yeniden bağlanılır; yeniden bağlanınca veri sürümü değiştiyse (arada
+  kaçırılan olaylar) yine yenilenir.
+- live_updates kapalı, auto_refresh açıksa: refresh_interval saniyede bir
+  `changed` yayılır (polling).
+
+Art arda gelen olaylar tek bir yenilemede birleştirilir.
+"""
+
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src.api.client import APIClient, APIError
+
+# Yeniden bağlanma bekleme süreleri (saniye)
+RECONNECT_MIN_SECONDS = 1
+RECONNECT_MAX_SECONDS = 30
+# Art arda gelen olayları birleştirme süresi (ms)
+DEBOUNCE_MS = 300
+
+# Ekran verisini değiştiren olaylar
+CHANGE_EVENTS = ("transactions_changed", "resync")
+
+
+class LiveUpdates(QObject):
+    """Olay akışı veya polling ile değişiklik bildiren nesne."""
+
+    changed = pyqtSignal()
+    # Arka plan thread'inden ana thread'e olay iletimi (kuyruklu bağlantı)
+    _event_received = pyqtSignal()
+
+    def __init__(self, api_client: APIClient, settings, parent: Optional[QObject] = None):
+        """
+        Args:
+            api_client: API istemcisi
+            settings: Uygulama ayarları (live_updates, auto_refresh, refresh_interval)
+        """
+        super().__init__(parent)
+        self.api_client = api_client
+        self.settings = settings
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._data_version: Optional[int] = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.changed)
+        self._event_received.connect(self._debounce.start)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self.changed)
+
+    def start(self):
+        """Ayarlara göre olay akışını veya polling'i başlat."""
+        if self.settings.get('live_updates', True):
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._listen, name="live-updates", daemon=True
+            )
+            self._thread.start()
+        elif self.settings.get('auto_refresh', False):
+            interval = max(1, int(self.settings.get('refresh_interval', 5)))
+            self._poll_timer.start(interval * 1000)
+
+    def stop(self):
+        """
+        Dinlemeyi durdur.
+
+        Akış okuması bloklayıcı olduğundan thread bir sonraki olay veya
+        ping'de kendiliğinden çıkar; o ana kadar gelen olaylar yok sayılır.
+        """
+        self._stop.set()
+        self._poll_timer.stop()
+        self._debounce.stop()
+
+    def _listen(self):
+        """Olay akışını dinle; bağlantı koparsa yeniden bağlan (arka plan thread'i)."""
+        delay = RECONNECT_MIN_SECONDS
+        while not self._stop.is_set():
+            try:
+                for event in self.api_client.stream_events():
+                    if self._stop.is_set():
+                        return
+                    delay = RECONNECT_MIN_SECONDS
+                    self._handle(event)
+            except APIError as e:
+                print(f"Olay akışı: {e}")
+            self._stop.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    def _handle(self, event: dict):
+        """Tek bir olayı işle; ekran verisi değiştiyse yenileme iste."""
+        event_type = event.get("type")
+        version = event.get("data_version")
+        if event_type == "hello":
+            # Yeniden bağlantı: arada kaçırılan değişiklik varsa yenile
+            if self._data_version is not None and version != self._data_version:
+                self._event_received.emit()
+        elif event_type in CHANGE_EVENTS:
+            self._event_received.emit()
+        if version is not None:
+            self._data_version = version
@@ -6,7 +6,8 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from src.api.client import APIClient, APIError
-from src.utils.session import SessionManager
+from src.ui.live_updates import LiveUpdates
+from src.utils.session import AppSettings, SessionManager
 
 
 class MainWindow(QMainWindow):
@@ -14,11 +15,12 @@ class MainWindow(QMainWindow):
 
     logout_requested = pyqtSignal()
 
-    def __init__(self, api_client: APIClient, session: SessionManager):
+    def __init__(self, api_client: APIClient, session: SessionManager, settings: AppSettings):
         """
         Args:
             api_client: API istemcisi
             session: Oturum yöneticisi
+            settings: Uygulama ayarları (canlı güncelleme / otomatik yenileme)
         """
         print("DEBUG: MainWindow.__init__() başladı")
         super().__init__()
@@ -32,6 +34,11 @@ class MainWindow(QMainWindow):
         # İlk sayfayı aktif et
         self._switch_page("dashboard")
 
+        # Sunucuda veri değişince açık sayfayı yenile (SSE veya polling)
+        self.live_updates = LiveUpdates(api_client, settings, self)
+        self.live_updates.changed.connect(self._refresh_current_page)
+        self.live_updates.start()
+
     def init_ui(self):
         """UI'yi başlat - Advanced Modern Tasarım."""
         print("DEBUG: init_ui() başladı")
@@ -353,6 +360,9 @@ class MainWindow(QMainWindow):
         
         if page_id in page_map:
             self.stacked_widget.setCurrentIndex(page_map[page_id])
+            if page_id == "dashboard":
+                # Özet kartları her açılışta güncel fiyatlarla yenilenir
+                self.stacked_widget.currentWidget().refresh_data()
             
             # Menü butonlarını güncelle
             for btn in self.menu_buttons:
@@ -365,6 +375,12 @@ class MainWindow(QMainWindow):
                     btn.style().unpolish(btn)
                     btn.style().polish(btn)
 
+    def _refresh_current_page(self):
+        """Açık sayfanın verisini yenile (değişiklik olayı geldiğinde)."""
+        page = self.stacked_widget.currentWidget()
+        if hasattr(page, "refresh_data"):
+            page.refresh_data()
+
     def _create_header(self) -> QWidget:
         """Header oluştur - Daha narin ve kompakt."""
         header = QFrame()
@@ -442,5 +458,11 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
+            self.live_updates.stop()
             self.session.logout()
             self.logout_requested.emit()
+
+    def closeEvent(self, event):
+        """Pencere kapanırken olay akışını durdur."""
+        self.live_updates.stop()
+        super().closeEvent(event)
@@ -2,17 +2,22 @@
 Dashboard Page - Ana Dashboard Sayfası
 """
 
+from datetime import datetime
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QMessageBox, QScrollArea, 
     QFrame, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QDateTime
+from PyQt6.QtCore import Qt, QDateTime, QTimer
 from PyQt6.QtGui import QFont, QColor, QBrush
 
 from src.api.client import APIClient, APIError
 from src.models.data_models import Transaction
 
+# Bayat yanıt alındığında güncel verinin tekrar isteneceği süre (ms)
+STALE_RETRY_MS = 1000
+
 
 class DashboardPage(QWidget):
     """Dashboard sayfası widget'ı."""
@@ -26,6 +31,11 @@ class DashboardPage(QWidget):
         super().__init__()
         self.api_client = api_client
         self.session = session
+        self.card_values = {}  # Kart başlığı -> değer etiketi
+        self.period_buttons = {}  # Dönem kodu -> buton
+        self.chart_period = "1Y"
+        self.chart_axes = None
+        self.chart_canvas = None
         self.init_ui()
 
     def init_ui(self):
@@ -158,6 +168,7 @@ class DashboardPage(QWidget):
             value_label.setStyleSheet("color: #10b981;")
         else:
             value_label.setStyleSheet("color: #ffffff;")
+        self.card_values[title] = value_label
 
         content_layout.addWidget(title_label)
         content_layout.addWidget(value_label)
@@ -168,6 +179,44 @@ class DashboardPage(QWidget):
         card.setLayout(main_layout)
         return card
 
+    @staticmethod
+    def _format_tl(value: float, signed: bool = False) -> str:
+        """Tutarı "24,350 TL" / "+450 TL" biçiminde yaz."""
+        text = f"{value:+,.0f}" if signed else f"{value:,.0f}"
+        return f"{text} TL"
+
+    def refresh_data(self):
+        """Özet kartlarını backend'deki son fiyatlarla güncelle."""
+        try:
+            dashboard = self.api_client.get_dashboard(recent=0, chart_points=2)
+        except APIError as e:
+            print(f"Dashboard verisi alınamadı: {e}")
+            return
+        cards = dashboard["cards"]
+        if dashboard.get("stale"):
+            # Önceki sürüm gösterildi; sunucu güncelini arka planda hesaplıyor
+            QTimer.singleShot(STALE_RETRY_MS, self.refresh_data)
+
+        # Fiyat yoksa toplam portföy maliyet üzerinden gösterilir
+        total_value = cards.get("total_market_value")
+        if total_value is None:
+            total_value = cards["net_invested"]
+        self.card_values["Toplam Portföy"].setText(self._format_tl(total_value))
+
+        daily_pnl = cards.get("total_daily_pnl")
+        daily_label = self.card_values["Günlük Kar/Zarar"]
+        if daily_pnl is None:
+            daily_label.setText("-")
+            daily_label.setStyleSheet("color: #ffffff;")
+        else:
+            daily_label.setText(self._format_tl(daily_pnl, signed=True))
+            daily_label.setStyleSheet(
+                "color: #10b981;" if daily_pnl >= 0 else "color: #ef4444;"
+            )
+
+        self.card_values["Toplam Hisse"].setText(f"{cards['stock_count']} Adet")
+        self._load_chart(self.chart_period)
+
     def _create_chart_widget(self) -> QFrame:
         """Portföy grafiği - Daha kompakt."""
         frame = QFrame()
@@ -192,11 +241,11 @@ class DashboardPage(QWidget):
         title_label.setStyleSheet("color: #ffffff;")
         title_layout.addWidget(title_label)
 
-        info_label = QLabel("↑ +6,420 TL")
+        self.chart_info_label = QLabel("")
         info_font = QFont('Segoe UI', 9, QFont.Weight.Bold)
-        info_label.setFont(info_font)
-        info_label.setStyleSheet("color: #10b981;")
-        title_layout.addWidget(info_label)
+        self.chart_info_label.setFont(info_font)
+        self.chart_info_label.setStyleSheet("color: #10b981;")
+        title_layout.addWidget(self.chart_info_label)
 
         title_layout.addStretch()
 
@@ -206,7 +255,38 @@ class DashboardPage(QWidget):
         for period in ["1G", "1H", "1A", "1Y"]:
             btn = QPushButton(period)
             btn.setFixedSize(32, 22)
-            if period == "1Y":
+            btn.clicked.connect(lambda _, p=period: self._load_chart(p))
+            self.period_buttons[period] = btn
+            timeframe_layout.addWidget(btn)
+        self._style_period_buttons()
+        
+        title_layout.addLayout(timeframe_layout)
+        layout.addLayout(title_layout)
+
+        # Grafik (matplotlib)
+        try:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+            
+            figure = Figure(figsize=(8, 2), dpi=100, facecolor='transparent', edgecolor='none')
+            figure.subplots_adjust(left=0.04, right=0.96, top=0.90, bottom=0.15)
+
+            self.chart_axes = figure.add_subplot(111)
+            self.chart_canvas = FigureCanvas(figure)
+            self._draw_chart([])
+            layout.addWidget(self.chart_canvas)
+        except Exception as e:
+            error_label = QLabel("Grafik yüklenemedi")
+            error_label.setStyleSheet("color: #94a3b8;")
+            layout.addWidget(error_label)
+
+        frame.setLayout(layout)
+        return frame
+
+    def _style_period_buttons(self):
+        """Seçili dönemin butonunu vurgula."""
+        for period, btn in self.period_buttons.items():
+            if period == self.chart_period:
                 btn.setStyleSheet("""
                     QPushButton {
                         background-color: #3b82f6;
@@ -228,54 +308,65 @@ class DashboardPage(QWidget):
                         font-weight: 600;
                     }
                 """)
-            timeframe_layout.addWidget(btn)
-        
-        title_layout.addLayout(timeframe_layout)
-        layout.addLayout(title_layout)
 
-        # Grafik (matplotlib)
+    def _load_chart(self, period: str):
+        """Seçilen dönemin değer serisini backend'den al ve çiz."""
+        self.chart_period = period
+        self._style_period_buttons()
+        if self.chart_axes is None:
+            return
         try:
-            from matplotlib.figure import Figure
-            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-            
-            figure = Figure(figsize=(8, 2), dpi=100, facecolor='transparent', edgecolor='none')
-            figure.subplots_adjust(left=0.04, right=0.96, top=0.90, bottom=0.15)
-
-            ax = figure.add_subplot(111)
-            ax.set_facecolor('transparent')
+            points = self.api_client.get_portfolio_history(period=period)["points"]
+        except APIError as e:
+            print(f"Grafik verisi alınamadı: {e}")
+            return
+        self._draw_chart(points)
+
+        if len(points) >= 2:
+            change = points[-1]["value"] - points[0]["value"]
+            arrow = "↑" if change >= 0 else "↓"
+            self.chart_info_label.setText(f"{arrow} {self._format_tl(change, signed=True)}")
+            self.chart_info_label.setStyleSheet(
+                "color: #10b981;" if change >= 0 else "color: #ef4444;"
+            )
+        else:
+            self.chart_info_label.setText("")
 
-            # Sample data
-            x = list(range(30))
-            y = [20000 + i * 100 + (i % 3) * 200 for i in x]
+    def _draw_chart(self, points: list):
+        """Değer serisini grafiğe çiz."""
+        ax = self.chart_axes
+        ax.clear()
+        ax.set_facecolor('transparent')
 
+        if points:
+            x = list(range(len(points)))
+            y = [p["value"] for p in points]
             ax.plot(x, y, color='#22d3ee', linewidth=2, marker='o', markersize=3)
             ax.fill_between(x, y, alpha=0.1, color='#22d3ee')
-            ax.grid(True, alpha=0.1, color='rgba(255,255,255,0.05)', linestyle='-', linewidth=0.5)
-
-            # Styling
-            ax.set_xlabel('')
-            ax.set_ylabel('')
-            for label in ax.get_xticklabels():
-                label.set_color('#94a3b8')
-                label.set_fontsize(8)
-            for label in ax.get_yticklabels():
-                label.set_color('#94a3b8')
-                label.set_fontsize(8)
-
-            ax.spines['left'].set_color('#1e293b')
-            ax.spines['bottom'].set_color('#1e293b')
-            ax.spines['right'].set_visible(False)
-            ax.spines['top'].set_visible(False)
-
-            canvas = FigureCanvas(figure)
-            layout.addWidget(canvas)
-        except Exception as e:
-            error_label = QLabel("Grafik yüklenemedi")
-            error_label.setStyleSheet("color: #94a3b8;")
-            layout.addWidget(error_label)
-
-        frame.setLayout(layout)
-        return frame
+            # Eksende ilk, orta ve son noktanın tarihi
+            ticks = sorted({0, len(points) // 2, len(points) - 1})
+            fmt = "%H:%M" if self.chart_period == "1G" else "%d.%m"
+            ax.set_xticks(ticks)
+            ax.set_xticklabels([
+                datetime.fromisoformat(points[i]["time"]).strftime(fmt) for i in ticks
+            ])
+        ax.grid(True, alpha=0.1, color='rgba(255,255,255,0.05)', linestyle='-', linewidth=0.5)
+
+        # Styling
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        for label in ax.get_xticklabels():
+            label.set_color('#94a3b8')
+            label.set_fontsize(8)
+        for label in ax.get_yticklabels():
+            label.set_color('#94a3b8')
+            label.set_fontsize(8)
+
+        ax.spines['left'].set_color('#1e293b')
+        ax.spines['bottom'].set_color('#1e293b')
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+        self.chart_canvas.draw_idle()
 
     def _create_portfolio_table(self) -> QFrame:
         """Portföy özeti tablosu (9 sütunlu)."""
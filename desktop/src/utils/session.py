@@ -143,7 +143,8 @@ class AppSettings:
             'theme': 'light',  # light, dark
             'page_size': 20,
             'auto_refresh': True,
-            'refresh_interval': 5,  # saniye
+            'refresh_interval': 5,  # saniye (live_updates kapalıysa polling aralığı)
+            'live_updates': True,   # Sunucu olay akışı (SSE) ile sadece değişiklikte yenile
         }
 
         self.settings = self.defaults.copy()
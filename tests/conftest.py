@@ -8,8 +8,11 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.cache import get_cache
 from app.database import Base
 from app.main import app
+from app.services.price_service import prices
+from app.services.snapshot_service import snapshot_scheduler
 from fastapi.testclient import TestClient
 
 
@@ -49,13 +52,39 @@ def client(db_session: Session):
 
     from app.database import get_db
     app.dependency_overrides[get_db] = override_get_db
+    # Her test yeni bir veritabanı kullandığından (aynı kullanıcı ID'si ve
+    # veri sürümü tekrar oluşur) önbellek testler arasında temizlenir.
+    get_cache().clear()
+    prices.clear()
     
     with TestClient(app) as test_client:
         yield test_client
+    # Yazma sonrası ertelenmiş anlık görüntü oluşturma bir sonraki testin
+    # veritabanına dokunmamalı
+    snapshot_scheduler.cancel_all()
     
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def authenticated_client(client: TestClient, test_user_data):
+    """Giriş yapılmış test client'ı."""
+    # Kullanıcı oluştur ve giriş yap
+    client.post("/api/auth/register", json=test_user_data)
+    
+    login_response = client.post(
+        "/api/auth/login",
+        data={
+            "username": test_user_data["email"],
+            "password": test_user_data["password"]
+        }
+    )
+    
+    token = login_response.json()["access_token"]
+    client.headers = {"Authorization": f"Bearer {token}"}
+    return client
+
+
 @pytest.fixture
 def test_user_data():
     """Test kullanıcı verileri."""
@@ -79,3 +108,25 @@ def test_transaction_data():
         "commission": 12.50,
         "notes": "Test işlemi"
     }
+
+
+def trade(
+    client: TestClient,
+    symbol: str,
+    kind: str,
+    quantity: float,
+    price: float,
+    when: str,
+    commission: float = 0.0,
+) -> int:
+    """İstemcinin kullanıcısı adına işlem ekler ve işlem ID'sini döndürür."""
+    response = client.post("/api/transactions/", json={
+        "stock_symbol": symbol,
+        "transaction_type": kind,
+        "quantity": quantity,
+        "price_per_unit": price,
+        "commission": commission,
+        "transaction_date": when,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
@@ -0,0 +1,97 @@
+"""
+Geçmiş Tarihli Özet Testleri
+=============================
+Portföy ve hisse özetlerinde `as_of` parametresi: anlık görüntü + aralık
+taraması, geçmiş kapanışlarla değerleme ve indeks kullanımı.
+"""
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.history_store import PriceHistoryStore
+from app.services import portfolio_service
+from app.services.snapshot_service import build_snapshots
+from tests.conftest import trade
+
+
+def _seed(client: TestClient) -> int:
+    trade(client, "THYAO", "BUY", 10, 100, "2023-12-20T10:00:00")
+    trade(client, "ASELS", "BUY", 4, 50, "2023-12-28T14:00:00")
+    trade(client, "THYAO", "SELL", 5, 110, "2024-01-03T11:00:00")
+    trade(client, "SISE", "BUY", 100, 40, "2024-01-05T09:00:00")
+    return client.get("/api/auth/me").json()["id"]
+
+
+def test_summary_as_of_year_end(authenticated_client: TestClient, db_session, tmp_path, monkeypatch):
+    """Yıl sonu özeti sonraki işlemleri içermez ve o günün kapanışıyla değerlenir."""
+    user_id = _seed(authenticated_client)
+    store = PriceHistoryStore(tmp_path)
+    store.append("THYAO", ["2023-12-28", "2023-12-29", "2024-01-02"], {"close": [118.0, 120.0, 125.0]})
+    monkeypatch.setattr(portfolio_service, "history_store", store)
+
+    url = "/api/transactions/portfolio/summary?as_of=2023-12-31T23:59:59"
+    response = authenticated_client.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["as_of"] == "2023-12-31T23:59:59"
+    assert [s["stock_symbol"] for s in body["stocks"]] == ["ASELS", "THYAO"]
+    thyao = body["stocks"][1]
+    assert thyao["total_quantity"] == 10
+    assert thyao["last_price"] == 120.0 and thyao["daily_pnl"] == 20.0
+    assert body["stocks"][0]["market_value"] is None   # ASELS geçmişi yok
+    assert body["total_invested"] == 1200.0
+
+    # Anlık görüntülerden başlayan hesap aynı sonucu verir
+    build_snapshots(db_session, user_id, today=date(2024, 1, 10))
+    assert authenticated_client.get(url).json() == body
+
+    # Güncel özet değişmez ve as_of içermez
+    current = authenticated_client.get("/api/transactions/portfolio/summary").json()
+    assert current["as_of"] is None and current["stock_count"] == 3
+
+    etag = response.headers["ETag"]
+    assert authenticated_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert authenticated_client.get(url.replace("23:59:59", "23:59:58"),
+                                    headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_stock_summary_as_of(authenticated_client: TestClient, db_session):
+    """Hisse özeti as_of anına kadar (dahil) olan işlemlerden hesaplanır."""
+    user_id = _seed(authenticated_client)
+    build_snapshots(db_session, user_id, today=date(2024, 1, 4))
+
+    def quantity(as_of: str):
+        response = authenticated_client.get(f"/api/transactions/portfolio/THYAO?as_of={as_of}")
+        return response.json()["total_quantity"] if response.status_code == 200 else None
+
+    assert quantity("2023-12-20T09:59:59") is None
+    assert quantity("2023-12-20T10:00:00") == 10
+    assert quantity("2024-01-03T11:00:00") == 5
+    # Saat dilimli an UTC'ye çevrilir: 13:30+03:00 = 10:30 UTC
+    assert quantity("2024-01-03T13:30:00%2B03:00") == 10
+    response = authenticated_client.get("/api/transactions/portfolio/SISE?as_of=2024-01-04T00:00:00")
+    assert response.status_code == 404
+
+
+def test_as_of_uses_date_index(authenticated_client: TestClient, db_session, db_engine):
+    """İşlemler (user_id, transaction_date) indeksiyle aralık taranarak okunur."""
+    _seed(authenticated_client)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM transactions" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        authenticated_client.get("/api/transactions/portfolio/summary?as_of=2024-01-01T00:00:00")
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 1
+    statement, parameters = statements[0]
+    with db_engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    assert "ix_transactions_user_date" in " ".join(str(row) for row in plan)
@@ -0,0 +1,87 @@
+"""
+Batch Endpoint Testleri
+========================
+POST /api/batch: tek kimlik doğrulamayla birden fazla GET isteği.
+"""
+
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def serial_batches(monkeypatch):
+    """Testlerde tüm alt istekler aynı veritabanı oturumunu paylaşır."""
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 1)
+
+
+def test_batch_returns_results_in_order(authenticated_client: TestClient, test_transaction_data):
+    """Sonuçlar istek sırasıyla döner; hatalı alt istekler diğerlerini etkilemez."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    response = authenticated_client.post("/api/batch", json={"requests": [
+        {"path": "/api/transactions/portfolio/THYAO"},
+        {"path": "/api/transactions/portfolio/ASELS"},
+        {"path": "/api/transactions/?page_size=1"},
+        {"path": "/api/yok"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["responses"]
+
+    assert [r["status"] for r in results] == [200, 404, 200, 404]
+    assert results[0]["body"]["stock_symbol"] == "THYAO"
+    assert "etag" in results[0]["headers"]
+    assert results[2]["body"]["total_count"] == 1
+
+
+def test_batch_authenticates_once(
+    authenticated_client: TestClient, db_engine, test_transaction_data
+):
+    """Alt istekler kullanıcı sorgusunu tekrarlamaz."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    authenticated_client.post("/api/batch", json={"requests": [
+        {"path": "/api/transactions/portfolio/THYAO"},
+        {"path": "/api/transactions/portfolio/THYAO"},
+    ]})
+
+    user_queries = [sql for sql in statements if "FROM users" in sql]
+    assert len(user_queries) == 1
+
+
+def test_batch_passes_conditional_headers(authenticated_client: TestClient):
+    """Alt isteklerin If-None-Match başlığı iletilir."""
+    etag = authenticated_client.get("/api/transactions/").headers["etag"]
+    results = authenticated_client.post("/api/batch", json={"requests": [
+        {"path": "/api/transactions/", "headers": {"If-None-Match": etag}},
+    ]}).json()["responses"]
+
+    assert results[0]["status"] == 304
+    assert results[0]["body"] is None
+
+
+def test_batch_rejects_invalid_requests(authenticated_client: TestClient, monkeypatch):
+    """Sadece /api/ altındaki GET yolları, sınırlı sayıda."""
+    nested = authenticated_client.post("/api/batch", json={"requests": [{"path": "/api/batch"}]})
+    assert nested.status_code == 400
+
+    post = authenticated_client.post(
+        "/api/batch", json={"requests": [{"method": "POST", "path": "/api/transactions/"}]}
+    )
+    assert post.status_code == 422
+
+    monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 1)
+    too_many = authenticated_client.post("/api/batch", json={"requests": [
+        {"path": "/api/transactions/"}, {"path": "/api/transactions/"},
+    ]})
+    assert too_many.status_code == 400
+
+
+def test_batch_requires_auth(client: TestClient):
+    """Token olmadan erişilemez."""
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/transactions/"}]})
+    assert response.status_code == 401
@@ -0,0 +1,113 @@
+"""
+Önbellek Testleri
+==================
+LRU backend'i, portföy özeti önbelleğinin yazma işlemleriyle
+geçersiz kılınması ve stale-while-revalidate.
+"""
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from app.cache import MemoryCache, get_cache, summary_key
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """Kayıt sınırı aşılınca en az kullanılan kayıt atılır."""
+    cache = MemoryCache(max_entries=2, max_bytes=1024)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")          # a en son kullanılan oldu
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+
+
+def test_memory_cache_respects_byte_limit():
+    """Toplam boyut sınırı aşılmaz; sınırdan büyük değerler saklanmaz."""
+    cache = MemoryCache(max_entries=100, max_bytes=10)
+    cache.set("a", b"x" * 6)
+    cache.set("b", b"y" * 6)
+    cache.set("big", b"z" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"y" * 6
+    assert cache.get("big") is None
+    assert cache.size_bytes == 6
+
+    cache.delete("b")
+    assert cache.size_bytes == 0 and len(cache) == 0
+
+
+def test_summary_served_from_cache(
+    authenticated_client: TestClient, db_engine, test_transaction_data
+):
+    """İkinci istekte özet hesaplanmaz, önbellekten döner."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+    first = authenticated_client.get("/api/transactions/portfolio/summary")
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    second = authenticated_client.get("/api/transactions/portfolio/summary")
+
+    assert second.json() == first.json()
+    # Sadece kimlik doğrulama sorgusu (kullanıcı satırı) çalışır
+    assert len(statements) == 1
+
+
+def test_writes_invalidate_summary_cache(
+    authenticated_client: TestClient, test_transaction_data
+):
+    """Ekleme, güncelleme ve silme sonrası güncel özet döner."""
+    created = authenticated_client.post("/api/transactions/", json=test_transaction_data).json()
+    summary = authenticated_client.get("/api/transactions/portfolio/summary").json()
+    assert summary["stocks"][0]["total_quantity"] == 100
+    assert get_cache().get(summary_key(summary["user_id"], 1)) is not None
+
+    authenticated_client.put(f"/api/transactions/{created['id']}", json={"quantity": 5})
+    summary = authenticated_client.get("/api/transactions/portfolio/summary").json()
+    assert summary["stocks"][0]["total_quantity"] == 5
+    # Eski sürümün kaydı silindi
+    assert get_cache().get(summary_key(summary["user_id"], 1)) is None
+
+    authenticated_client.delete(f"/api/transactions/{created['id']}")
+    summary = authenticated_client.get("/api/transactions/portfolio/summary").json()
+    assert summary["stock_count"] == 0
+
+
+def test_stale_summary_served_while_revalidating(
+    authenticated_client: TestClient, test_transaction_data
+):
+    """max-stale ile önceki özet hemen döner, güncel özet arka planda hesaplanır."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+    authenticated_client.get("/api/transactions/portfolio/summary")
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    stale = authenticated_client.get(
+        "/api/transactions/portfolio/summary", headers={"Cache-Control": "max-stale=60"}
+    )
+    assert stale.status_code == 200
+    assert stale.json()["stale"] is True
+    assert stale.json()["stocks"][0]["total_quantity"] == 100
+    assert "age" in stale.headers
+    assert "etag" not in stale.headers
+
+    # Arka plan görevi güncel özeti önbelleğe yazdı
+    fresh = authenticated_client.get(
+        "/api/transactions/portfolio/summary", headers={"Cache-Control": "max-stale=60"}
+    )
+    assert fresh.json()["stale"] is False
+    assert fresh.json()["stocks"][0]["total_quantity"] == 200
+    assert "etag" in fresh.headers
+
+
+def test_stale_summary_requires_opt_in(authenticated_client: TestClient, test_transaction_data):
+    """max-stale gönderilmezse yazmadan sonra her zaman güncel özet döner."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+    authenticated_client.get("/api/transactions/portfolio/summary")
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    summary = authenticated_client.get("/api/transactions/portfolio/summary").json()
+    assert summary["stale"] is False
+    assert summary["stocks"][0]["total_quantity"] == 200
@@ -0,0 +1,159 @@
+"""
+Sıkıştırma Testleri
+====================
+Accept-Encoding anlaşması, eşik ve akış sıkıştırma testleri.
+"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, negotiate_encoding
+from app.http_cache import etag_headers, not_modified
+
+LARGE_ITEMS = [{"stock_symbol": f"SYM{i}", "total_quantity": i} for i in range(500)]
+
+
+@pytest.fixture
+def compression_client():
+    """Sıkıştırma middleware'li küçük bir uygulama."""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @test_app.get("/large")
+    def large():
+        return LARGE_ITEMS
+
+    @test_app.get("/versioned")
+    def versioned(request: Request):
+        cached = not_modified(request, '"v1"')
+        if cached:
+            return cached
+        return JSONResponse(LARGE_ITEMS, headers=etag_headers('"v1"'))
+
+    @test_app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @test_app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"0" * 5000, media_type="image/png")
+
+    @test_app.get("/stream")
+    def stream():
+        def rows():
+            for i in range(100):
+                yield f"{i},THYAO,100\n"
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    @test_app.get("/events")
+    def events():
+        return StreamingResponse(iter(["data: 1\n\n"]), media_type="text/event-stream")
+
+    with TestClient(test_app) as client:
+        yield client
+
+
+def test_negotiate_encoding_prefers_server_order():
+    """Eşit kalitede br > zstd > gzip tercih edilir, q=0 reddedilir."""
+    supported = ["br", "zstd", "gzip"]
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("br;q=0, gzip", supported) == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, zstd", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+
+
+def test_large_json_is_gzipped(compression_client):
+    """Eşik üstündeki JSON gzip ile sıkıştırılır."""
+    response = compression_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert response.json() == LARGE_ITEMS
+
+
+def test_compressed_response_has_weak_etag(compression_client):
+    """Sıkıştırılan gövde güçlü ETag'i paylaşmaz; 304 de Vary ile döner."""
+    plain = compression_client.get("/versioned", headers={"Accept-Encoding": "identity"})
+    assert plain.headers["etag"] == '"v1"'
+
+    compressed = compression_client.get("/versioned", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == 'W/"v1"'
+
+    again = compression_client.get("/versioned", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"],
+    })
+    assert again.status_code == 304
+    assert again.headers["etag"] == 'W/"v1"'
+    assert "accept-encoding" in again.headers["vary"].lower()
+
+    # Ham temsili (güçlü ETag) doğrulayan istemciye güçlü ETag döner
+    strong = compression_client.get("/versioned", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": '"v1"',
+    })
+    assert strong.status_code == 304 and strong.headers["etag"] == '"v1"'
+    assert "accept-encoding" in strong.headers["vary"].lower()
+
+
+def test_brotli_is_used_when_accepted(compression_client):
+    """İstemci Brotli kabul ediyorsa ve paket kuruluysa br kullanılır."""
+    pytest.importorskip("brotli")
+    response = compression_client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == LARGE_ITEMS
+
+
+def test_small_and_binary_responses_are_not_compressed(compression_client):
+    """Eşik altı yanıtlar ve resimler sıkıştırılmaz."""
+    for path in ("/small", "/image"):
+        response = compression_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_in_chunks(compression_client):
+    """StreamingResponse parça parça sıkıştırılır ve doğru çözülür."""
+    with compression_client.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+
+    expected = "".join(f"{i},THYAO,100\n" for i in range(100)).encode()
+    assert gzip.decompress(raw) == expected
+    assert zlib.decompress(raw, 31) == expected
+
+
+def test_event_stream_is_not_compressed(compression_client):
+    """SSE akışları olduğu gibi iletilir."""
+    response = compression_client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: 1\n\n"
+
+
+def test_app_compresses_large_responses(client):
+    """Ana uygulama büyük yanıtları sıkıştırır."""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["info"]["title"]
+
+
+def test_plain_text_response_threshold():
+    """Eşik değeri tam sınırda: minimum_size byte ve üstü sıkıştırılır."""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @test_app.get("/text")
+    def text():
+        return PlainTextResponse("x" * 10)
+
+    with TestClient(test_app) as client:
+        response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "x" * 10
@@ -0,0 +1,96 @@
+"""
+Korelasyon Testleri
+====================
+Eşli kovaryans/korelasyon, hisse ve matris önbellekleri ve
+/api/portfolio/correlation endpointi.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.history_store import PriceHistoryStore
+from app.services.correlation_service import covariance_matrix, pairwise_statistics
+from tests.conftest import trade
+
+
+def test_pairwise_statistics_match_numpy():
+    """Tam veride np.cov/np.corrcoef ile aynı; eksik veride çiftin ortak günleri."""
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0, 0.01, (120, 4))
+    mean, covariance, correlation, n = pairwise_statistics(returns)
+    assert np.allclose(covariance, np.cov(returns, rowvar=False))
+    assert np.allclose(correlation, np.corrcoef(returns, rowvar=False))
+    assert np.allclose(mean, returns.mean(axis=0))
+
+    returns[:100, 3] = np.nan
+    _, covariance, correlation, n = pairwise_statistics(returns, min_observations=10)
+    assert n[0, 3] == 20 and n[0, 1] == 120
+    assert correlation[0, 3] == pytest.approx(np.corrcoef(returns[100:, 0], returns[100:, 3])[0, 1])
+    assert covariance[1, 3] == pytest.approx(np.cov(returns[100:, 1], returns[100:, 3])[0, 1])
+
+    _, _, correlation, _ = pairwise_statistics(returns, min_observations=30)
+    assert np.isnan(correlation[0, 3]) and np.isnan(correlation[3, 3])
+
+
+def test_covariance_matrix_cache(tmp_path, monkeypatch):
+    """Aynı küme matristen, kesişen küme hisse önbelleğinden okunur."""
+    rng = np.random.default_rng(5)
+    days = np.busday_offset("2024-01-01", np.arange(200), roll="forward")
+    base = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(days)))
+    store = PriceHistoryStore(tmp_path)
+    store.append("THYAO", days, {"close": base})
+    store.append("PGSUS", days, {"close": base * 2})          # Birebir aynı getiri
+    store.append("ASELS", days, {"close": 100 * np.cumprod(1 + rng.normal(0, 0.02, len(days)))})
+
+    reads = []
+    original = store.closes
+
+    def counting_closes(symbol, *args):
+        reads.append(symbol)
+        return original(symbol, *args)
+
+    monkeypatch.setattr(store, "closes", counting_closes)
+    end = days[-1].item()
+
+    matrix = covariance_matrix(["thyao", "PGSUS"], window=60, day=end, store=store)
+    assert matrix.symbols == ["PGSUS", "THYAO"]
+    assert matrix.end == end
+    assert matrix.correlation[0, 1] == pytest.approx(1.0)
+    assert matrix.observations[0, 1] == 60
+    assert matrix.covariance[0, 0] == pytest.approx(matrix.covariance[1, 1])
+
+    again = covariance_matrix(["PGSUS", "THYAO"], window=60, day=end, store=store)
+    assert np.array_equal(again.covariance, matrix.covariance)
+    assert np.array_equal(again.mean, matrix.mean)
+    overlapping = covariance_matrix(["THYAO", "ASELS"], window=60, day=end, store=store)
+    assert sorted(reads) == ["ASELS", "PGSUS", "THYAO"]
+    assert abs(overlapping.correlation[0, 1]) < 0.5
+
+    # Yeni fiyatlar depo sürümünü değiştirir: yeniden okunur
+    store.append("THYAO", [days[-1] + 1], {"close": [base[-1]]})
+    covariance_matrix(["PGSUS", "THYAO"], window=60, day=end, store=store)
+    assert len(reads) == 5
+
+
+def test_correlation_endpoint(authenticated_client: TestClient):
+    """Üst üçgen formatı, geçmişi olmayan hisseler için None ve ETag ile 304."""
+    empty = authenticated_client.get("/api/portfolio/correlation")
+    assert empty.status_code == 200 and empty.json()["symbols"] == []
+
+    trade(authenticated_client, "THYAO", "BUY", 10, 10, "2024-01-02T10:00:00")
+    trade(authenticated_client, "ASELS", "BUY", 5, 10, "2024-01-02T10:00:00")
+    response = authenticated_client.get("/api/portfolio/correlation?window=60")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["format"] == "upper" and body["window"] == 60
+    assert body["symbols"] == ["ASELS", "THYAO"]
+    assert len(body["correlation"]) == len(body["covariance"]) == 3
+    assert body["correlation"] == [None, None, None]
+    assert body["observations"] == [0, 0, 0]
+
+    again = authenticated_client.get(
+        "/api/portfolio/correlation?window=60", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert again.status_code == 304
+    assert authenticated_client.get("/api/portfolio/correlation?window=5").status_code == 422
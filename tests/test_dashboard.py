@@ -0,0 +1,159 @@
+"""
+Dashboard Endpoint Testleri
+============================
+GET /api/dashboard: tek istekte kartlar, tablo, son işlemler ve grafik.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from app.cache import get_cache
+from app.models.user import User
+from app.services import dashboard_service
+
+
+def _add(client: TestClient, symbol: str, kind: str, quantity: float, price: float, day: str):
+    client.post("/api/transactions/", json={
+        "stock_symbol": symbol,
+        "transaction_type": kind,
+        "quantity": quantity,
+        "price_per_unit": price,
+        "commission": 1.0,
+        "transaction_date": f"{day}T10:00:00",
+    })
+
+
+def test_dashboard_payload(authenticated_client: TestClient):
+    """Tüm parçalar aynı veriden hesaplanır."""
+    _add(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02")
+    _add(authenticated_client, "ASELS", "BUY", 5, 40, "2024-01-03")
+    _add(authenticated_client, "THYAO", "SELL", 4, 110, "2024-01-03")
+
+    response = authenticated_client.get("/api/dashboard?recent=2")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["cards"] == {
+        "total_invested": 1200.0,
+        "net_invested": 760.0,
+        "total_commission": 3.0,
+        "stock_count": 2,
+        "transaction_count": 3,
+        # Fiyat yüklenmediğinde piyasa değerleri yoktur
+        "total_market_value": None,
+        "total_unrealized_pnl": None,
+        "total_daily_pnl": None,
+    }
+    assert [h["stock_symbol"] for h in data["holdings"]] == ["ASELS", "THYAO"]
+    assert data["holdings"][1]["total_quantity"] == 6
+    assert len(data["recent_transactions"]) == 2
+    assert data["recent_transactions"][0]["transaction_type"] == "SELL"
+    assert data["chart"] == [
+        {"date": "2024-01-02", "net_invested": 1000.0},
+        {"date": "2024-01-03", "net_invested": 760.0},
+    ]
+
+
+def test_dashboard_uses_single_snapshot_query(authenticated_client: TestClient, db_engine):
+    """Kimlik doğrulama dışında tek bir veri sorgusu çalışır."""
+    _add(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02")
+    _add(authenticated_client, "ASELS", "BUY", 5, 40, "2024-01-03")
+    # Fiyat önbelleği ilk istekte fiyat sürümünü okur
+    authenticated_client.get("/api/dashboard")
+    get_cache().clear()
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = authenticated_client.get("/api/dashboard")
+
+    assert response.status_code == 200
+    assert len(statements) == 2  # kullanıcı + işlemler
+
+    cached = authenticated_client.get(
+        "/api/dashboard", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+    # Aynı sürüm önbellekten gelir: sadece kimlik doğrulama sorgusu
+    statements.clear()
+    again = authenticated_client.get("/api/dashboard")
+    assert again.json() == response.json()
+    assert len(statements) == 1
+
+
+def test_concurrent_dashboard_loads_share_one_computation(
+    authenticated_client: TestClient, db_session, monkeypatch
+):
+    """Aynı sürüm için eşzamanlı istekler tek hesaplamayı bekler."""
+    _add(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02")
+    user = db_session.query(User).one()
+    get_cache().clear()
+
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    original = dashboard_service.build_dashboard
+
+    def slow_build(*args, **kwargs):
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(dashboard_service, "build_dashboard", slow_build)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(dashboard_service.get_dashboard_json, db_session, user)
+        started.wait(timeout=5)
+        followers = [
+            pool.submit(dashboard_service.get_dashboard_json, db_session, user) for _ in range(3)
+        ]
+        release.set()
+        results = [leader.result(timeout=5)] + [f.result(timeout=5) for f in followers]
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+
+
+def test_dashboard_stale_while_revalidate(authenticated_client: TestClient):
+    """Masaüstü istemcisinin gönderdiği max-stale ile önceki dashboard hemen döner."""
+    url = "/api/dashboard?recent=0&chart_points=2"
+    desktop_headers = {"Cache-Control": "max-stale=60"}
+    _add(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02")
+    first = authenticated_client.get(url, headers=desktop_headers)
+    assert first.json()["stale"] is False
+    _add(authenticated_client, "ASELS", "BUY", 5, 40, "2024-01-03")
+
+    stale = authenticated_client.get(url, headers=desktop_headers)
+    assert stale.status_code == 200
+    assert stale.json()["stale"] is True
+    assert stale.json()["cards"]["stock_count"] == 1
+    assert "age" in stale.headers
+    assert "etag" not in stale.headers
+
+    # Arka plan görevi güncel yanıtı önbelleğe yazdı
+    fresh = authenticated_client.get(url, headers=desktop_headers)
+    assert fresh.json()["stale"] is False
+    assert fresh.json()["cards"]["stock_count"] == 2
+    assert "etag" in fresh.headers
+
+    # max-stale olmadan yazmadan sonra her zaman güncel yanıt
+    _add(authenticated_client, "GARAN", "BUY", 1, 10, "2024-01-04")
+    assert authenticated_client.get(url).json()["cards"]["stock_count"] == 3
+
+
+def test_dashboard_chart_is_downsampled(authenticated_client: TestClient):
+    """Grafik serisi chart_points ile sınırlanır, son nokta korunur."""
+    for day in range(1, 11):
+        _add(authenticated_client, "THYAO", "BUY", 1, 10, f"2024-02-{day:02d}")
+
+    chart = authenticated_client.get("/api/dashboard?chart_points=4").json()["chart"]
+    assert len(chart) == 4
+    assert chart[0]["date"] == "2024-02-01"
+    assert chart[-1] == {"date": "2024-02-10", "net_invested": 100.0}
+
+
+def test_dashboard_requires_auth(client: TestClient):
+    """Token olmadan erişilemez."""
+    assert client.get("/api/dashboard").status_code == 401
@@ -0,0 +1,94 @@
+"""
+Olay Akışı Testleri
+====================
+Süreç içi pub/sub hub'ı ve SSE akış gövdesi.
+"""
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.events import EventHub, hub
+from app.routers.events import event_stream_body
+
+
+def test_publish_from_worker_thread_reaches_subscriber():
+    """Thread havuzundaki yazmaların olayları abonenin loop'una iletilir."""
+    events = EventHub()
+
+    async def scenario():
+        subscription = events.subscribe(7)
+        thread = threading.Thread(
+            target=events.publish, args=(7, {"type": "transactions_changed", "data_version": 3})
+        )
+        thread.start()
+        event = await subscription.get(timeout=2)
+        thread.join()
+        subscription.close()
+        return event
+
+    assert asyncio.run(scenario())["data_version"] == 3
+    assert events.subscriber_count(7) == 0
+
+
+def test_slow_subscriber_gets_resync():
+    """Kuyruk dolunca bekleyen olaylar atılır, tek bir resync gönderilir."""
+    events = EventHub(queue_size=2)
+
+    async def scenario():
+        subscription = events.subscribe(1)
+        for version in range(5):
+            events.publish(1, {"type": "transactions_changed", "data_version": version})
+        await asyncio.sleep(0)
+        received = []
+        while not subscription.queue.empty():
+            received.append(subscription.queue.get_nowait())
+        subscription.close()
+        return received
+
+    received = asyncio.run(scenario())
+    assert {"type": "resync"} in received
+    assert len(received) <= 2
+
+
+def test_stream_body_sends_hello_events_and_pings():
+    """Akış hello ile başlar, olayları iletir ve boşta ping gönderir."""
+    events = EventHub()
+
+    async def scenario():
+        subscription = events.subscribe(1)
+        stream = event_stream_body(subscription, data_version=4, heartbeat_seconds=0.01)
+        hello = await stream.__anext__()
+        ping = await stream.__anext__()
+        events.publish(1, {"type": "transactions_changed", "data_version": 5, "op": "create"})
+        change = await stream.__anext__()
+        await stream.aclose()
+        return hello, ping, change
+
+    hello, ping, change = asyncio.run(scenario())
+    assert hello.startswith("event: hello\nid: 4\n")
+    assert ping == ": ping\n\n"
+    assert change.startswith("event: transactions_changed\nid: 5\ndata: {")
+    assert events.subscriber_count(1) == 0
+
+
+def test_writes_publish_change_events(
+    authenticated_client: TestClient, test_transaction_data, monkeypatch
+):
+    """İşlem ekleme ve silme commit'ten sonra olay yayınlar."""
+    received = []
+    monkeypatch.setattr(hub, "publish", lambda user_id, event: received.append(event))
+
+    created = authenticated_client.post("/api/transactions/", json=test_transaction_data).json()
+    authenticated_client.delete(f"/api/transactions/{created['id']}")
+
+    assert [event["op"] for event in received] == ["insert", "delete"]
+    assert received[1]["transaction_id"] == created["id"]
+    assert received[1]["stock_symbol"] == "THYAO"
+    assert received[1]["data_version"] == 2
+
+
+def test_event_stream_requires_auth(client: TestClient):
+    """Token olmadan erişilemez."""
+    assert client.get("/api/events").status_code == 401
@@ -0,0 +1,171 @@
+"""
+Fiyat Geçmişi Deposu Testleri
+==============================
+Sütunsal memmap deposu: ekleme, tarih aralığı dilimleme, tail ve
+birleştirme (compaction).
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+
+from app.history_store import PriceHistoryStore, import_csv, import_daily_bars
+from app.models.price_bar import PriceBar
+
+
+def _days(start: str, count: int) -> np.ndarray:
+    return np.arange(np.datetime64(start), np.datetime64(start) + count)
+
+
+def _append(store: PriceHistoryStore, symbol: str, days: np.ndarray, base: float = 0.0) -> int:
+    closes = base + np.arange(len(days), dtype=float)
+    return store.append(symbol, days, {"close": closes, "volume": np.ones(len(days))})
+
+
+def test_range_read_is_zero_copy_slice(tmp_path):
+    """Ana segmentten okunan aralık memmap dilimidir ve sınırlar dahildir."""
+    store = PriceHistoryStore(tmp_path)
+    _append(store, "thyao", _days("2023-12-20", 30))
+    _append(store, "THYAO", _days("2024-01-19", 60), base=30)
+
+    history = store.read("THYAO", date(2024, 1, 1), date(2024, 2, 29))
+    assert history["date"][0] == np.datetime64("2024-01-01")
+    assert history["date"][-1] == np.datetime64("2024-02-29")
+    assert len(history["close"]) == 60
+    assert history["close"][0] == 12.0
+    assert np.isnan(history["open"]).all()
+    # Kopya yok: sonuç diske eşlenmiş dosyanın bir görünümü
+    assert isinstance(history["close"], np.memmap)
+    assert not history["close"].flags.writeable
+
+    # Depoda olmayan aylar ve boş aralıklar
+    assert len(store.read("THYAO", date(2020, 1, 1), date(2020, 6, 1))["close"]) == 0
+    assert len(store.read("THYAO", date(2024, 3, 18))["close"]) == 1
+    assert len(store.read("ASELS")["close"]) == 0
+    assert store.last_date("THYAO") == date(2024, 3, 18)
+    assert store.symbols() == ["THYAO"]
+
+
+def test_index_has_one_entry_per_month(tmp_path):
+    """Seyrek indeks her ayın ilk satırını tutar; eklemeler indeksi uzatır."""
+    store = PriceHistoryStore(tmp_path)
+    _append(store, "SISE", _days("2024-01-30", 3))   # Ocak + Şubat
+    _append(store, "SISE", _days("2024-02-02", 40))  # Şubat (devam) + Mart
+
+    index = np.fromfile(tmp_path / "SISE" / "index.i8", dtype="<i8").reshape(-1, 2)
+    months = index[:, 0].astype("datetime64[M]")
+    assert list(months.astype(str)) == ["2024-01", "2024-02", "2024-03"]
+    assert list(index[:, 1]) == [0, 2, 31]
+
+
+def test_out_of_order_rows_go_to_tail_until_compaction(tmp_path):
+    """Geçmişe dönük düzeltmeler okunur; compaction sonrası tekrar zero-copy."""
+    store = PriceHistoryStore(tmp_path)
+    _append(store, "ASELS", _days("2024-01-01", 10))
+    # 5 Ocak düzeltmesi ve daha eski bir gün
+    store.append("ASELS", ["2024-01-05", "2023-12-29"], {"close": [99.0, -1.0]})
+    store.append("ASELS", ["2024-01-05"], {"close": [100.0]})
+
+    merged = store.read("ASELS", date(2023, 12, 1), date(2024, 1, 6))
+    assert list(merged["close"]) == [-1.0, 0.0, 1.0, 2.0, 3.0, 100.0, 5.0]
+    assert not isinstance(merged["close"], np.memmap)
+
+    assert store.compact("ASELS") == 3
+    assert not (tmp_path / "ASELS" / "tail").exists()
+    compacted = store.read("ASELS", date(2023, 12, 1), date(2024, 1, 6))
+    assert list(compacted["close"]) == list(merged["close"])
+    assert isinstance(compacted["close"], np.memmap)
+    assert store.compact("ASELS") == 0
+
+    # Yeni bir örnek de aynı dosyaları okur
+    assert len(PriceHistoryStore(tmp_path).read("ASELS")["close"]) == 11
+
+
+def test_torn_append_is_ignored(tmp_path):
+    """Yarım kalmış eklemede satır sayısı en kısa sütundan belirlenir."""
+    store = PriceHistoryStore(tmp_path)
+    _append(store, "KCHOL", _days("2024-01-01", 5))
+    with (tmp_path / "KCHOL" / "close.f8").open("ab") as handle:
+        handle.write(np.array([42.0]).tobytes())
+
+    assert len(PriceHistoryStore(tmp_path).read("KCHOL")["close"]) == 5
+
+
+def test_import_csv(tmp_path):
+    """CSV satırları hisse bazında eklenir."""
+    feed = tmp_path / "gecmis.csv"
+    feed.write_text(
+        "date,stock_symbol,open,high,low,close,volume\n"
+        "2024-01-03,THYAO,10,11,9,10.5,1000\n"
+        "2024-01-02,THYAO,9,10,8,9.5,800\n"
+        "2024-01-02,ASELS,40,41,39,40.5,\n",
+        encoding="utf-8",
+    )
+    store = PriceHistoryStore(tmp_path / "store")
+    assert import_csv(store, feed) == 3
+
+    thyao = store.read("THYAO")
+    assert list(thyao["close"]) == [9.5, 10.5]
+    assert np.isnan(store.read("ASELS")["volume"][0])
+
+
+def test_import_daily_bars(tmp_path, db_session):
+    """price_bars'taki 1d çubukları İstanbul işlem gününe göre eklenir."""
+    for day, close in ((13, 10.0), (14, 11.0)):
+        db_session.add(PriceBar(
+            stock_symbol="THYAO", interval="1d", bucket_start=datetime(2024, 6, day - 1, 21),
+            open=close, high=close, low=close, close=close, volume=5, tick_count=1,
+        ))
+    db_session.commit()
+
+    store = PriceHistoryStore(tmp_path)
+    assert import_daily_bars(store, db_session) == 2
+    history = store.read("THYAO")
+    assert list(history["date"].astype(str)) == ["2024-06-13", "2024-06-14"]
+    # Tekrar çalıştırmak sadece yeni günleri ekler
+    assert import_daily_bars(store, db_session) == 0
+
+
+def test_import_daily_bars_waits_for_market_close(tmp_path, db_session):
+    """Gün içindeki kısmi çubuk eklenmez; kapanıştan sonra kesin çubuk eklenir."""
+    bar = PriceBar(
+        stock_symbol="THYAO", interval="1d", bucket_start=datetime(2024, 6, 13, 21),
+        open=10.0, high=10.5, low=9.8, close=10.2, volume=100, tick_count=3,
+    )
+    db_session.add(bar)
+    db_session.commit()
+    store = PriceHistoryStore(tmp_path)
+
+    # 14 Haziran 14:00 İstanbul: seans sürüyor
+    assert import_daily_bars(store, db_session, now=datetime(2024, 6, 14, 11)) == 0
+    assert store.last_date("THYAO") is None
+
+    # Kapanıştan sonra kesin çubuk
+    bar.close, bar.high, bar.volume = 11.0, 11.2, 900
+    db_session.commit()
+    assert import_daily_bars(store, db_session, now=datetime(2024, 6, 14, 16)) == 1
+    history = store.read("THYAO")
+    assert list(history["date"].astype(str)) == ["2024-06-14"]
+    assert list(history["close"]) == [11.0] and list(history["volume"]) == [900.0]
+    assert import_daily_bars(store, db_session, now=datetime(2024, 6, 14, 16)) == 0
+
+    # Kapanıştan sonra gelen düzeltme son günü günceller (tail, compact ile birleşir)
+    bar.close = 11.1
+    db_session.commit()
+    assert import_daily_bars(store, db_session, now=datetime(2024, 6, 15, 9)) == 1
+    assert list(store.read("THYAO")["close"]) == [11.1]
+    store.compact("THYAO")
+    assert list(store.read("THYAO")["close"]) == [11.1]
+
+
+def test_aligned_closes_forward_fill(tmp_path):
+    """Ortak eksende eksik günler önceki kapanışla, ilk kapanıştan öncesi NaN."""
+    store = PriceHistoryStore(tmp_path)
+    store.append("THYAO", ["2024-01-02", "2024-01-03", "2024-01-05"], {"close": [1.0, 2.0, 3.0]})
+    store.append("ASELS", ["2024-01-03", "2024-01-04"], {"close": [10.0, np.nan]})
+
+    days, closes = store.aligned_closes(["THYAO", "ASELS", "YOK"], date(2024, 1, 1))
+    assert list(days.astype(str)) == ["2024-01-02", "2024-01-03", "2024-01-05"]
+    assert closes[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(closes[0, 1]) and closes[1:, 1].tolist() == [10.0, 10.0]
+    assert np.isnan(closes[:, 2]).all()
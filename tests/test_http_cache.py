@@ -0,0 +1,76 @@
+"""
+ETag / Conditional GET Testleri
+================================
+Veri sürümünden türetilen ETag'ler ve 304 yanıtları.
+"""
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+
+def test_summary_returns_etag_and_304(authenticated_client: TestClient, test_transaction_data):
+    """Aynı ETag ile tekrar istenen özet 304 döner."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    first = authenticated_client.get("/api/transactions/portfolio/summary")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = authenticated_client.get(
+        "/api/transactions/portfolio/summary", headers={"If-None-Match": etag}
+    )
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+def test_write_changes_etag(authenticated_client: TestClient, test_transaction_data):
+    """Her yazma işlemi veri sürümünü artırır ve eski ETag geçersiz olur."""
+    created = authenticated_client.post("/api/transactions/", json=test_transaction_data).json()
+    etag = authenticated_client.get("/api/transactions/").headers["etag"]
+
+    authenticated_client.put(f"/api/transactions/{created['id']}", json={"quantity": 5})
+    response = authenticated_client.get("/api/transactions/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    etag = response.headers["etag"]
+    authenticated_client.delete(f"/api/transactions/{created['id']}")
+    response = authenticated_client.get("/api/transactions/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_count"] == 0
+
+
+def test_etag_depends_on_query_parameters(authenticated_client: TestClient):
+    """Farklı sayfa/filtre farklı ETag üretir."""
+    page1 = authenticated_client.get("/api/transactions/?page=1").headers["etag"]
+    page2 = authenticated_client.get("/api/transactions/?page=2").headers["etag"]
+    filtered = authenticated_client.get("/api/transactions/?stock_symbol=thyao").headers["etag"]
+
+    assert len({page1, page2, filtered}) == 3
+
+
+def test_not_modified_runs_only_auth_query(
+    authenticated_client: TestClient, db_engine, test_transaction_data
+):
+    """304 yanıtı için sadece kimlik doğrulama sorgusu çalışır."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+    etag = authenticated_client.get("/api/transactions/portfolio/summary").headers["etag"]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    try:
+        response = authenticated_client.get(
+            "/api/transactions/portfolio/summary", headers={"If-None-Match": etag}
+        )
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert "FROM users" in statements[0]
@@ -0,0 +1,93 @@
+"""
+Logging Testleri
+=================
+Kuyruk tabanlı logging pipeline'ı, JSON formatı ve örnekleme testleri.
+"""
+
+import json
+import logging
+import logging.handlers
+import subprocess
+import sys
+from pathlib import Path
+
+from app import logger as logger_module
+
+from app.logger import (
+    JsonFormatter,
+    SamplingFilter,
+    get_logger,
+    logger,
+    parse_sampling,
+    start_logging,
+    stop_logging,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _record(name: str, level: int, msg: str = "mesaj") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_logger_only_enqueues():
+    """Uygulama logger'ına sadece QueueHandler bağlıdır (diske yazma yok)."""
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+    assert get_logger("x").parent is not None
+
+
+def test_json_formatter_outputs_json_line():
+    """JSON formatter tek satırlık, ayrıştırılabilir çıktı üretir."""
+    record = _record("finans_takip.test", logging.INFO, "işlem eklendi 🚀")
+    line = JsonFormatter().format(record)
+
+    assert "\n" not in line
+    payload = json.loads(line)
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "finans_takip.test"
+    assert payload["message"] == "işlem eklendi 🚀"
+
+
+def test_sampling_filter_drops_noisy_info_but_keeps_warnings():
+    """Örnekleme sadece DEBUG/INFO kayıtlarına uygulanır."""
+    sampling = SamplingFilter({"finans_takip.noisy": 0.0})
+
+    assert not sampling.filter(_record("finans_takip.noisy", logging.INFO))
+    assert not sampling.filter(_record("finans_takip.noisy.child", logging.DEBUG))
+    assert sampling.filter(_record("finans_takip.noisy", logging.WARNING))
+    assert sampling.filter(_record("finans_takip.other", logging.INFO))
+
+
+def test_parse_sampling():
+    """Örnekleme ayarı ayrıştırılır ve oranlar [0, 1] aralığına sıkıştırılır."""
+    assert parse_sampling("a.b=0.1, c=2") == {"a.b": 0.1, "c": 1.0}
+    assert parse_sampling("") == {}
+
+
+def test_import_does_not_start_listener():
+    """app.logger import'u arka plan thread'i başlatmaz."""
+    code = (
+        "import threading, app.logger as l; "
+        "assert l._listener is None, 'listener'; "
+        "assert threading.active_count() == 1, threading.enumerate()"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_listener_start_stop_is_idempotent():
+    """start_logging aynı listener'ı döndürür; durdurulunca ilk kayıtta yeniden başlar."""
+    listener = start_logging()
+    assert start_logging() is listener
+    assert listener._thread is not None
+
+    stop_logging()
+    stop_logging()
+    assert logger_module._listener is None
+    assert listener._thread is None
+
+    get_logger("test").debug("listener yeniden başlar")
+    assert logger_module._listener is not None
@@ -0,0 +1,84 @@
+"""
+Metrik Testleri
+================
+/metrics endpointi ve route şablonu bazında metrik toplama testleri.
+"""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.metrics import Counter, Histogram
+
+
+def _metric_value(body: str, prefix: str) -> float:
+    """Verilen önekle başlayan metrik satırının değerini döndürür."""
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_endpoint_prometheus_format(client: TestClient):
+    """/metrics Prometheus metin formatında yanıt döner."""
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert "# TYPE http_requests_in_flight gauge" in response.text
+
+
+def test_metrics_use_route_template(client: TestClient, test_user_data, test_transaction_data):
+    """Metrikler ham path yerine route şablonu ile etiketlenir."""
+    client.post("/api/auth/register", json=test_user_data)
+    token = client.post(
+        "/api/auth/login",
+        data={"username": test_user_data["email"], "password": test_user_data["password"]},
+    ).json()["access_token"]
+    client.headers = {"Authorization": f"Bearer {token}"}
+
+    prefix = 'http_requests_total{method="GET",route="/api/transactions/{transaction_id}",status="200"}'
+    before = _metric_value(client.get("/metrics").text, prefix)
+
+    transaction_id = client.post("/api/transactions/", json=test_transaction_data).json()["id"]
+    client.get(f"/api/transactions/{transaction_id}")
+    client.get("/api/transactions/portfolio/summary")
+
+    body = client.get("/metrics").text
+    assert _metric_value(body, prefix) == before + 1
+    assert f"/api/transactions/{transaction_id}\"" not in body
+    assert 'route="/api/transactions/portfolio/summary"' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/transactions/portfolio/summary",le="+Inf"}' in body
+
+
+def test_counter_sums_thread_shards():
+    """Farklı thread'lerden yapılan artışlar kayıpsız toplanır."""
+    counter = Counter("test_counter", "test", ("kind",))
+
+    def worker():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert counter.values()[("a",)] == 4000
+
+
+def test_histogram_buckets_are_cumulative():
+    """Histogram kovaları kümülatif olarak yazılır."""
+    histogram = Histogram("test_latency", "test", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("/x",), 0.05)
+    histogram.observe(("/x",), 0.5)
+    histogram.observe(("/x",), 5.0)
+
+    lines = histogram.render()
+    assert 'test_latency_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'test_latency_bucket{route="/x",le="1"} 2' in lines
+    assert 'test_latency_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'test_latency_count{route="/x"} 3' in lines
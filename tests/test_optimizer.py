@@ -0,0 +1,88 @@
+"""
+Optimizasyon Testleri
+======================
+Kısıt kümesine izdüşüm, analitik çözümü bilinen portföyler, ağırlık
+sınırı ve /api/portfolio/optimize endpointi.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.optimizer_service import efficient_frontier, project_capped_simplex
+
+
+def test_projection_onto_capped_simplex():
+    """İzdüşüm toplamı 1'dir, sınırlara uyar ve kümedeki noktayı değiştirmez."""
+    projected = project_capped_simplex(np.array([[0.5, 0.4, 0.3, -1.0]]), cap=0.4)
+    assert projected[0] == pytest.approx([0.4, 0.35, 0.25, 0.0])
+
+    rng = np.random.default_rng(11)
+    points = rng.normal(0, 0.3, (50, 30))
+    projected = project_capped_simplex(points, cap=0.1)
+    assert np.allclose(projected.sum(axis=1), 1.0)
+    assert projected.min() >= 0 and projected.max() <= 0.1 + 1e-12
+    assert np.allclose(project_capped_simplex(projected, cap=0.1), projected)
+
+
+def test_two_asset_analytical_solutions():
+    """İlişkisiz iki hisse: min varyans σ2²/(σ1²+σ2²), max Sharpe ∝ Σ⁻¹μ."""
+    covariance = np.diag([0.1 ** 2, 0.2 ** 2])
+    expected = np.array([0.05, 0.10])
+    frontier = efficient_frontier(covariance, expected)
+    assert frontier.min_variance == pytest.approx([0.8, 0.2], abs=1e-6)
+    assert frontier.max_sharpe == pytest.approx([2 / 3, 1 / 3], abs=1e-3)
+    # Risksiz getiriyle: ∝ Σ⁻¹(μ - rf)
+    with_rate = efficient_frontier(covariance, expected, risk_free=0.03)
+    assert with_rate.max_sharpe == pytest.approx([2 / 3.75, 1.75 / 3.75], abs=1e-3)
+    # Sınır artan getiri ve volatiliteyle; en uçta en yüksek getirili hisse
+    assert np.all(np.diff(frontier.returns) >= -1e-12)
+    assert np.all(np.diff(frontier.volatility) >= -1e-12)
+    assert frontier.weights[-1] == pytest.approx([0.0, 1.0], abs=1e-6)
+
+    capped = efficient_frontier(covariance, expected, cap=0.6)
+    assert capped.min_variance == pytest.approx([0.6, 0.4], abs=1e-6)
+    assert capped.weights[-1] == pytest.approx([0.4, 0.6], abs=1e-6)
+    with pytest.raises(ValueError):
+        efficient_frontier(covariance, expected, cap=0.4)
+
+
+def test_large_universe_respects_constraints():
+    """200 hisse: ağırlıklar sınırlı; min varyans sınırın en düşük volatilitesi."""
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0.0004, 0.02, (252, 200)) + rng.normal(0, 0.01, (252, 1))
+    covariance = np.cov(returns, rowvar=False) * 252
+    frontier = efficient_frontier(covariance, returns.mean(axis=0) * 252, cap=0.05)
+    assert np.allclose(frontier.weights.sum(axis=1), 1.0)
+    assert frontier.weights.max() <= 0.05 + 1e-12 and frontier.weights.min() >= 0
+    variance = frontier.min_variance @ covariance @ frontier.min_variance
+    assert np.sqrt(variance) == pytest.approx(frontier.volatility.min())
+    # Eşit ağırlıktan daha düşük varyans
+    equal = np.full(200, 1 / 200)
+    assert variance < equal @ covariance @ equal
+
+
+def test_optimize_endpoint(authenticated_client: TestClient):
+    """Geçmişi olmayan hisseler dışarıda kalır; parametreler doğrulanır."""
+    for symbol in ("THYAO", "ASELS"):
+        response = authenticated_client.post("/api/transactions/", json={
+            "stock_symbol": symbol,
+            "transaction_type": "BUY",
+            "quantity": 10,
+            "price_per_unit": 10,
+            "transaction_date": "2024-01-02T10:00:00",
+        })
+        assert response.status_code == 201
+
+    response = authenticated_client.get("/api/portfolio/optimize?max_weight=0.5")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["symbols"] == [] and body["excluded"] == ["ASELS", "THYAO"]
+    assert body["min_variance"] is None and body["frontier"] == []
+
+    again = authenticated_client.get(
+        "/api/portfolio/optimize?max_weight=0.5", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert again.status_code == 304
+    assert authenticated_client.get("/api/portfolio/optimize?max_weight=0").status_code == 422
+    assert authenticated_client.get("/api/portfolio/optimize?points=1").status_code == 422
@@ -0,0 +1,134 @@
+"""
+Portföy Değer Geçmişi Testleri
+===============================
+Adet x fiyat matrisinden değer serisi, LTTB seyreltme ve
+/api/portfolio/history endpointi.
+"""
+
+from datetime import datetime
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.history_store import PriceHistoryStore
+from app.models.price_bar import PriceBar
+from app.services.history_service import lttb_indices, portfolio_history
+from app.services.price_service import upsert_prices
+from tests.conftest import trade
+
+
+def _user_id(client: TestClient) -> int:
+    return client.get("/api/auth/me").json()["id"]
+
+
+def test_lttb_keeps_extremes_and_endpoints():
+    """Seyreltilmiş seri ilk/son noktayı ve belirgin tepe/dipleri korur."""
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[500] = 10.0
+    keep = lttb_indices(x, y, 50)
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 500 in keep
+    assert list(lttb_indices(x[:10], y[:10], 50)) == list(range(10))
+    assert list(lttb_indices(x, y, 2)) == [0, 999]
+
+
+def test_daily_values_from_positions_and_history(authenticated_client: TestClient, db_session, tmp_path):
+    """Değer = kümülatif adet x günün kapanışı; kapanış yoksa işlem fiyatı."""
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2024-06-03T10:00:00")
+    trade(authenticated_client, "ASELS", "BUY", 4, 50, "2024-06-04T11:00:00")
+    trade(authenticated_client, "THYAO", "SELL", 5, 110, "2024-06-06T15:00:00")
+
+    store = PriceHistoryStore(tmp_path)
+    store.append("THYAO", ["2024-06-03", "2024-06-04", "2024-06-06"],
+                 {"close": [101.0, 104.0, 112.0]})
+
+    history = portfolio_history(
+        db_session, _user_id(authenticated_client), "1H",
+        now=datetime(2024, 6, 7, 12), store=store,
+    )
+    assert history["interval"] == "D" and history["total_points"] == 5
+    points = {p["time"].date().isoformat(): p for p in history["points"]}
+    # Seri ilk işlem gününden başlar
+    assert sorted(points) == ["2024-06-03", "2024-06-04", "2024-06-05", "2024-06-06", "2024-06-07"]
+    assert points["2024-06-03"]["value"] == 1010.0
+    # ASELS için geçmiş yok: işlem fiyatı (50) kullanılır
+    assert points["2024-06-04"]["value"] == 10 * 104 + 4 * 50
+    # 5 Haziran kapanışı yok: önceki günün kapanışı taşınır
+    assert points["2024-06-05"]["value"] == 10 * 104 + 4 * 50
+    assert points["2024-06-06"]["value"] == 5 * 112 + 4 * 50
+    assert points["2024-06-06"]["net_invested"] == 1000 + 200 - 550
+
+    # Son nokta güncel piyasa fiyatıyla değerlenir
+    upsert_prices(db_session, [{"stock_symbol": "ASELS", "last_price": 60.0}])
+    latest = portfolio_history(
+        db_session, _user_id(authenticated_client), "1H",
+        now=datetime(2024, 6, 7, 12), store=store,
+    )
+    assert latest["points"][-1]["value"] == 5 * 112 + 4 * 60
+
+
+def test_intraday_values_use_hourly_bars(authenticated_client: TestClient, db_session, tmp_path):
+    """1G: saatlik noktalar 1h çubuklarının kapanışıyla değerlenir."""
+    trade(authenticated_client, "SISE", "BUY", 100, 40, "2024-06-13T09:30:00")
+    for hour, close in ((7, 41.0), (9, 43.0)):
+        db_session.add(PriceBar(
+            stock_symbol="SISE", interval="1h", bucket_start=datetime(2024, 6, 14, hour),
+            open=close, high=close, low=close, close=close, volume=1, tick_count=1,
+        ))
+    db_session.commit()
+
+    history = portfolio_history(
+        db_session, _user_id(authenticated_client), "1G",
+        now=datetime(2024, 6, 14, 10, 15), store=PriceHistoryStore(tmp_path),
+    )
+    assert history["interval"] == "h" and history["total_points"] == 25
+    values = {p["time"]: p["value"] for p in history["points"]}
+    assert values[datetime(2024, 6, 13, 10)] == 4000.0
+    assert values[datetime(2024, 6, 14, 7)] == 4100.0
+    assert values[datetime(2024, 6, 14, 8)] == 4100.0
+    assert values[datetime(2024, 6, 14, 10)] == 4300.0
+
+
+def test_intraday_daily_close_applies_after_market_close(
+    authenticated_client: TestClient, db_session, tmp_path
+):
+    """1G: günün kapanışı piyasa kapanmadan önceki saatlerde kullanılmaz (ileriye bakma yok)."""
+    trade(authenticated_client, "SISE", "BUY", 100, 40, "2024-06-13T09:30:00")
+    store = PriceHistoryStore(tmp_path)
+    store.append("SISE", ["2024-06-13", "2024-06-14"], {"close": [45.0, 50.0]})
+
+    history = portfolio_history(
+        db_session, _user_id(authenticated_client), "1G",
+        now=datetime(2024, 6, 14, 17, 30), store=store,
+    )
+    values = {p["time"]: p["value"] for p in history["points"]}
+    # 14 Haziran 13:00 İstanbul (10:00 UTC): seans sürüyor, önceki günün kapanışı
+    assert values[datetime(2024, 6, 14, 10)] == 4500.0
+    assert values[datetime(2024, 6, 14, 15)] == 4500.0
+    # Kapanış (18:10 İstanbul, 15:10 UTC) sonrası günün kapanışı
+    assert values[datetime(2024, 6, 14, 16)] == 5000.0
+
+
+def test_history_endpoint(authenticated_client: TestClient):
+    """Endpoint seyreltilmiş seriyi ve ETag'i döndürür; dönem doğrulanır."""
+    empty = authenticated_client.get("/api/portfolio/history")
+    assert empty.status_code == 200 and empty.json()["points"] == []
+
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2020-01-01T10:00:00")
+    response = authenticated_client.get("/api/portfolio/history?period=1Y&points=20")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["period"] == "1Y" and body["total_points"] == 366
+    assert len(body["points"]) == 20
+    assert {p["value"] for p in body["points"]} == {1000.0}
+
+    etag = response.headers["ETag"]
+    again = authenticated_client.get(
+        "/api/portfolio/history?period=1Y&points=20", headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+
+    assert authenticated_client.get("/api/portfolio/history?period=5Y").status_code == 422
+    assert authenticated_client.get("/api/portfolio/history?points=1").status_code == 422
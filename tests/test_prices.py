@@ -0,0 +1,107 @@
+"""
+Piyasa Fiyatı Testleri
+=======================
+Fiyat dosyası okuma, toplu upsert, fiyat önbelleği ve portföy özetindeki
+piyasa değeri / kar-zarar alanları.
+"""
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from app.services.price_service import PriceCache, read_price_feed, upsert_prices
+
+
+def _buy(client: TestClient, symbol: str, quantity: float, price: float):
+    client.post("/api/transactions/", json={
+        "stock_symbol": symbol,
+        "transaction_type": "BUY",
+        "quantity": quantity,
+        "price_per_unit": price,
+    })
+
+
+def test_read_price_feed_csv_and_json(tmp_path):
+    """CSV ve JSON dosyaları aynı satırlara çevrilir."""
+    csv_file = tmp_path / "fiyatlar.csv"
+    csv_file.write_text(
+        "stock_symbol,last_price,previous_close,stock_name,price_time\n"
+        "thyao,262.75,258,Türk Hava Yolları,2024-06-14T18:10:00\n"
+        "ASELS,\"61,40\",,,\n",
+        encoding="utf-8",
+    )
+    json_file = tmp_path / "fiyatlar.json"
+    json_file.write_text('{"prices": [{"symbol": "SISE", "price": 48.5}]}', encoding="utf-8")
+
+    rows = read_price_feed(csv_file)
+    assert [row["stock_symbol"] for row in rows] == ["THYAO", "ASELS"]
+    assert rows[0]["previous_close"] == 258.0
+    assert rows[0]["price_time"].hour == 18
+    assert rows[1]["last_price"] == 61.4 and rows[1]["previous_close"] is None
+
+    assert read_price_feed(json_file) == [{
+        "stock_symbol": "SISE",
+        "stock_name": None,
+        "last_price": 48.5,
+        "previous_close": None,
+        "price_time": None,
+    }]
+
+
+def test_summary_includes_market_value(authenticated_client: TestClient, db_session):
+    """Fiyatı olan hisseler için piyasa değeri ve kar/zarar hesaplanır."""
+    _buy(authenticated_client, "THYAO", 10, 100)
+    _buy(authenticated_client, "ASELS", 5, 40)
+    before = authenticated_client.get("/api/transactions/portfolio/summary")
+    assert before.json()["total_market_value"] is None
+
+    upsert_prices(db_session, [
+        {"stock_symbol": "THYAO", "last_price": 120.0, "previous_close": 115.0},
+    ])
+
+    response = authenticated_client.get("/api/transactions/portfolio/summary")
+    # Yeni fiyat sürümü yeni ETag demektir
+    assert response.headers["etag"] != before.headers["etag"]
+    data = response.json()
+    thyao = next(s for s in data["stocks"] if s["stock_symbol"] == "THYAO")
+    asels = next(s for s in data["stocks"] if s["stock_symbol"] == "ASELS")
+    assert thyao["market_value"] == 1200.0
+    assert thyao["unrealized_pnl"] == 200.0
+    assert thyao["unrealized_pnl_percent"] == 20.0
+    assert thyao["daily_pnl"] == 50.0
+    assert asels["market_value"] is None
+    assert data["total_market_value"] == 1200.0
+    assert data["total_daily_pnl"] == 50.0
+
+    stock = authenticated_client.get("/api/transactions/portfolio/THYAO").json()
+    assert stock["last_price"] == 120.0
+
+    cards = authenticated_client.get("/api/dashboard").json()["cards"]
+    assert cards["total_unrealized_pnl"] == 200.0
+
+
+def test_upsert_updates_existing_prices(db_session):
+    """Aynı hisse tekrar yüklendiğinde satır güncellenir, sürüm artar."""
+    cache = PriceCache(ttl_seconds=60)
+    first = upsert_prices(db_session, [
+        {"stock_symbol": "THYAO", "last_price": 100.0},
+        {"stock_symbol": "ASELS", "last_price": 40.0},
+    ])
+    assert cache.quotes(db_session, ["THYAO", "SISE"])["THYAO"].last_price == 100.0
+
+    second = upsert_prices(db_session, [{"stock_symbol": "THYAO", "last_price": 105.0}])
+    assert second == first + 1
+    # TTL dolmadan önbellek eski fiyatı döndürür
+    assert cache.quotes(db_session, ["THYAO"])["THYAO"].last_price == 100.0
+
+    statements = []
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    cache.invalidate()
+    quotes = cache.quotes(db_session, ["THYAO", "ASELS"])
+
+    assert quotes["THYAO"].last_price == 105.0
+    assert quotes["ASELS"].last_price == 40.0
+    assert cache.last_epoch == second
+    # Sürüm kontrolü + sadece yeni sürümün satırları
+    assert len(statements) == 2
+    assert "epoch >" in statements[1]
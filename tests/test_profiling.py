@@ -0,0 +1,72 @@
+"""
+Profilleme Testleri
+====================
+İsteğe bağlı istek profilleme middleware'i testleri.
+"""
+
+import json
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.config import settings
+from app.main import app as main_app
+
+
+@pytest.fixture
+def profiled_app(monkeypatch, tmp_path):
+    """Admin token ile profilleme açık küçük bir uygulama."""
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_TOKEN", "gizli-token")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "profiles_dir", tmp_path)
+
+    test_app = FastAPI()
+    test_app.add_middleware(profiling.ProfilingMiddleware)
+
+    @test_app.get("/slow/{item_id}")
+    def slow(item_id: int, request: Request):
+        request.state.user_id = 42
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"item_id": item_id}
+
+    return test_app
+
+
+def test_profiling_disabled_by_default():
+    """Ayar yoksa middleware ana uygulamaya eklenmez (sıfır maliyet)."""
+    assert not profiling.is_enabled()
+    assert all(
+        m.cls is not profiling.ProfilingMiddleware for m in main_app.user_middleware
+    )
+
+
+def test_admin_header_writes_speedscope_profile(profiled_app, tmp_path):
+    """Doğru admin başlığı ile istek profillenir ve speedscope dosyası yazılır."""
+    with TestClient(profiled_app) as client:
+        response = client.get("/slow/7", headers={"X-Profile-Token": "gizli-token"})
+
+    assert response.status_code == 200
+    files = list(tmp_path.glob("*.speedscope.json"))
+    assert len(files) == 1
+    assert "_GET_slow-item-id_user42" in files[0].name
+
+    profile = json.loads(files[0].read_text(encoding="utf-8"))
+    sampled = profile["profiles"][0]
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"]) > 0
+    frame_names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert "slow" in frame_names
+
+
+def test_wrong_or_missing_header_is_not_profiled(profiled_app, tmp_path):
+    """Başlık yoksa veya token yanlışsa profil yazılmaz."""
+    with TestClient(profiled_app) as client:
+        client.get("/slow/1")
+        client.get("/slow/2", headers={"X-Profile-Token": "yanlis"})
+
+    assert list(tmp_path.glob("*.speedscope.json")) == []
@@ -0,0 +1,104 @@
+"""
+Getiri Testleri
+================
+Bilinen nakit akışlarıyla XIRR, günlük değerlemelerden TWR ve
+/api/portfolio/performance endpointi.
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.history_store import PriceHistoryStore
+from app.services.returns_service import portfolio_performance, time_weighted_return, xirr
+from tests.conftest import trade
+
+
+def _days(*days: str) -> list:
+    dates = np.array(days, dtype="datetime64[D]")
+    return list((dates - dates[0]).astype(float))
+
+
+def test_xirr_reference_cash_flows():
+    """Excel XIRR belgesindeki örnek ve basit referanslar, tek çağrıda."""
+    excel = _days("2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01")
+    rates = xirr(
+        [excel, [0, 365, 0, 0, 0], [0, 730, 0, 0, 0], [0, 1, 2, 0, 0]],
+        [
+            [-10000, 2750, 4250, 3250, 2750],
+            [-1000, 1100, 0, 0, 0],     # 1 yılda %10
+            [-1000, 250, 0, 0, 0],      # 2 yılda %75 kayıp
+            [-100, -100, -100, 0, 0],   # Hep negatif: çözüm yok
+        ],
+    )
+    assert rates[0] == pytest.approx(0.373362535, abs=1e-8)
+    assert rates[1] == pytest.approx(0.10, abs=1e-12)
+    assert rates[2] == pytest.approx(-0.5, abs=1e-10)
+    assert np.isnan(rates[3])
+
+
+def test_xirr_extreme_rates_fall_back_to_bisection():
+    """Newton'un ıraksadığı çok yüksek getiri de aralık taramasıyla bulunur."""
+    rates = xirr([[0, 3]], [[-100, 200]])
+    assert (1 + rates[0]) ** (3 / 365) == pytest.approx(2.0, rel=1e-9)
+
+
+def test_twr_ignores_cash_flow_timing():
+    """Gün içi alış (F_t) günlük getiriden çıkarılır; boş günler atlanır."""
+    # 100 -> 110 (%10), ardından 100 TL alış ve değer 220 (%9,09)
+    values = np.array([0.0, 100.0, 110.0, 220.0])
+    invested = np.array([0.0, 100.0, 100.0, 200.0])
+    assert time_weighted_return(values, invested) == pytest.approx(1.1 * 120 / 110 - 1)
+    assert time_weighted_return(values[:1], invested[:1]) is None
+
+
+def test_portfolio_performance(authenticated_client: TestClient, db_session, tmp_path):
+    """Komisyonlu akışlar, hisse bazında XIRR ve bugünkü piyasa değeri."""
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2023-06-01T10:00:00", commission=5)
+    trade(authenticated_client, "ASELS", "BUY", 4, 50, "2023-06-01T11:00:00")
+    trade(authenticated_client, "ASELS", "SELL", 4, 60, "2023-12-01T11:00:00")
+    user_id = authenticated_client.get("/api/auth/me").json()["id"]
+
+    store = PriceHistoryStore(tmp_path)
+    store.append("THYAO", ["2023-06-01", "2024-05-31"], {"close": [100.0, 121.0]})
+    result = portfolio_performance(db_session, user_id, now=datetime(2024, 5, 31, 12), store=store)
+
+    assert result["start"] == date(2023, 6, 1)
+    stocks = {s["stock_symbol"]: s for s in result["stocks"]}
+    # 365 gün: -1005 -> 1210
+    assert stocks["THYAO"]["xirr_percent"] == round((1210 / 1005 - 1) * 100, 2)
+    assert stocks["THYAO"]["market_value"] == 1210.0
+    assert stocks["ASELS"]["market_value"] == 0.0
+    assert stocks["ASELS"]["profit"] == 40.0
+    assert stocks["ASELS"]["xirr_percent"] == round((1.2 ** (365 / 183) - 1) * 100, 2)
+
+    portfolio = result["portfolio"]
+    assert portfolio["market_value"] == 1210.0
+    assert portfolio["profit"] == 1210 + 240 - 1005 - 200
+    # ASELS satış günü: (1000 + 240) / 1200; son gün THYAO kapanışı 121
+    assert portfolio["twr_percent"] == round((1240 / 1200 * 1.21 - 1) * 100, 2)
+    assert portfolio["twr_annualized_percent"] == portfolio["twr_percent"]
+    assert min(portfolio["xirr_percent"], stocks["THYAO"]["xirr_percent"]) > 0
+
+
+def test_performance_endpoint(authenticated_client: TestClient):
+    """Boş portföy, hesaplanan getiri ve ETag ile 304."""
+    empty = authenticated_client.get("/api/portfolio/performance")
+    assert empty.status_code == 200
+    assert empty.json()["portfolio"] is None and empty.json()["stocks"] == []
+
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2020-01-01T10:00:00")
+    response = authenticated_client.get("/api/portfolio/performance")
+    assert response.status_code == 200
+    body = response.json()
+    # Fiyat değişmedi: getiri sıfır
+    assert body["portfolio"]["xirr_percent"] == 0.0
+    assert body["portfolio"]["twr_percent"] == 0.0
+    assert body["stocks"][0]["stock_symbol"] == "THYAO"
+
+    again = authenticated_client.get(
+        "/api/portfolio/performance", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert again.status_code == 304
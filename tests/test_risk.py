@@ -0,0 +1,113 @@
+"""
+Risk Analizi Testleri
+======================
+Vektörel ölçüler (kayan volatilite, maksimum düşüş, beta, VaR),
+pozisyonlardan portföy riski ve /api/portfolio/risk endpointi.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.history_store import PriceHistoryStore
+from app.services.history_service import DEFAULT_HISTORY_POINTS
+from app.services.risk_service import (
+    beta,
+    max_drawdown,
+    portfolio_returns,
+    portfolio_risk,
+    rolling_volatility,
+    value_at_risk,
+)
+from tests.conftest import trade
+
+
+def test_measures_match_reference_formulas():
+    """Kümülatif toplamlı kayan volatilite, düşüş, beta ve VaR referanslarla aynı."""
+    rng = np.random.default_rng(7)
+    benchmark = rng.normal(0, 0.01, 300)
+    returns = np.column_stack([2 * benchmark, rng.normal(0, 0.02, 300)])
+    returns[:50, 1] = np.nan  # Geç başlayan hisse
+
+    rolling = rolling_volatility(returns, 20)
+    assert rolling.shape == (281, 2)
+    expected = np.std(returns[-20:, 0], ddof=1) * np.sqrt(252)
+    assert rolling[-1, 0] == pytest.approx(expected, rel=1e-9)
+    assert np.isnan(rolling[49, 1]) and np.isfinite(rolling[50, 1])
+
+    assert beta(returns, benchmark)[0] == pytest.approx(2.0)
+
+    historical, parametric = value_at_risk(returns, 0.95)
+    assert historical[1] == pytest.approx(-np.quantile(returns[50:, 1], 0.05))
+    assert parametric[0] == pytest.approx(
+        -(returns[:, 0].mean() - 1.6448536 * returns[:, 0].std(ddof=1)), rel=1e-6
+    )
+
+    levels = np.array([[100.0, np.nan], [120.0, 10.0], [90.0, 12.0], [130.0, 6.0]])
+    assert list(max_drawdown(levels)) == pytest.approx([-0.25, -0.5])
+
+
+def test_portfolio_returns_weight_by_previous_value():
+    """Portföy getirisi önceki günkü değerle ağırlıklıdır; geç başlayan hisse sıçrama yapmaz."""
+    closes = np.array([[100.0, np.nan], [110.0, 50.0], [110.0, 60.0]])
+    returns = portfolio_returns(closes, np.array([1.0, 2.0]))
+    assert returns[0] == pytest.approx(0.10)
+    assert returns[1] == pytest.approx(20 / 210)
+
+
+def test_portfolio_risk(authenticated_client: TestClient, db_session, tmp_path):
+    """Bugünkü adetler, endekse göre beta ve TL VaR."""
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02T10:00:00")
+    trade(authenticated_client, "ASELS", "BUY", 5, 40, "2024-01-02T10:00:00")
+    trade(authenticated_client, "ASELS", "SELL", 5, 45, "2024-03-01T10:00:00")
+    user_id = authenticated_client.get("/api/auth/me").json()["id"]
+
+    rng = np.random.default_rng(1)
+    days = np.arange(np.datetime64("2024-01-02"), np.datetime64("2024-06-29"))
+    index = 1000 * np.cumprod(1 + rng.normal(0, 0.01, len(days)))
+    store = PriceHistoryStore(tmp_path)
+    store.append("XU100", days, {"close": index})
+    store.append("THYAO", days, {"close": index / 10})  # Endeksle birebir: beta 1
+    store.append("ASELS", days, {"close": np.full(len(days), 40.0)})
+
+    result = portfolio_risk(
+        db_session, user_id, days=365, window=20, now=datetime(2024, 6, 28, 12), store=store
+    )
+    assert result["benchmark"] == "XU100"
+    assert result["as_of"].isoformat() == "2024-06-28"
+    # Satılan ASELS listelenmez; portföy = THYAO
+    assert [s["stock_symbol"] for s in result["stocks"]] == ["THYAO"]
+    thyao, portfolio = result["stocks"][0], result["portfolio"]
+    assert portfolio["market_value"] == round(index[-1], 2)
+    assert portfolio["beta"] == thyao["beta"] == 1.0
+    assert portfolio["max_drawdown_percent"] == thyao["max_drawdown_percent"] < 0
+    assert portfolio["var_historical"] == pytest.approx(
+        portfolio["var_historical_percent"] / 100 * portfolio["market_value"], abs=0.1
+    )
+    # Kayan seri (159 nokta) LTTB ile seyreltilir
+    assert len(result["rolling_volatility"]) == DEFAULT_HISTORY_POINTS
+    assert result["rolling_volatility"][-1]["day"].isoformat() == "2024-06-28"
+
+
+def test_risk_endpoint(authenticated_client: TestClient):
+    """Boş portföy, geçmişsiz hisse, ETag ile 304 ve parametre doğrulama."""
+    empty = authenticated_client.get("/api/portfolio/risk")
+    assert empty.status_code == 200 and empty.json()["portfolio"] is None
+
+    trade(authenticated_client, "THYAO", "BUY", 10, 100, "2024-01-02T10:00:00")
+    response = authenticated_client.get("/api/portfolio/risk?days=90&window=10&confidence=0.99")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["window"] == 10 and body["confidence"] == 0.99
+    assert body["stocks"][0]["stock_symbol"] == "THYAO"
+    assert body["stocks"][0]["volatility_percent"] is None
+
+    again = authenticated_client.get(
+        "/api/portfolio/risk?days=90&window=10&confidence=0.99",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert again.status_code == 304
+    assert authenticated_client.get("/api/portfolio/risk?window=1").status_code == 422
+    assert authenticated_client.get("/api/portfolio/risk?confidence=1.5").status_code == 422
@@ -0,0 +1,45 @@
+"""
+Serileştirme Testleri
+======================
+Doğrudan oluşturulan yanıt sözlüklerinin Pydantic şemalarıyla aynı
+JSON'u ürettiğini doğrular.
+"""
+
+from datetime import datetime
+
+import orjson
+
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.transaction import PortfolioSummary, TransactionResponse
+from app.services.portfolio_service import transaction_to_dict
+
+
+def test_transaction_dict_matches_response_schema():
+    """transaction_to_dict çıktısı TransactionResponse ile aynı JSON'u verir."""
+    transaction = Transaction(
+        id=1,
+        user_id=1,
+        stock_symbol="THYAO",
+        stock_name="Türk Hava Yolları",
+        transaction_type=TransactionType.BUY,
+        quantity=100.0,
+        price_per_unit=245.5,
+        total_amount=24550.0,
+        commission=12.5,
+        transaction_date=datetime(2024, 1, 15, 10, 30, 0, 123456),
+        notes=None,
+        created_at=datetime(2024, 1, 15, 10, 31, 0),
+    )
+
+    expected = TransactionResponse.model_validate(transaction).model_dump(mode="json")
+    assert orjson.loads(orjson.dumps(transaction_to_dict(transaction))) == expected
+
+
+def test_default_response_class_is_orjson(authenticated_client, test_transaction_data):
+    """Okuma endpointleri orjson ile kodlanmış geçerli JSON döndürür."""
+    authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    response = authenticated_client.get("/api/transactions/portfolio/summary")
+    assert response.status_code == 200
+    summary = PortfolioSummary.model_validate(response.json())
+    assert summary.stocks[0].stock_symbol == "THYAO"
@@ -0,0 +1,70 @@
+"""
+Single-Flight Testleri
+=======================
+Eşzamanlı aynı hesaplamaların tek bir çalıştırmada birleştirilmesi.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.singleflight import SINGLEFLIGHT_CALLS_TOTAL, SingleFlight
+
+
+def _run_concurrently(group: SingleFlight, key, fn, callers: int):
+    """callers adet thread'i aynı anahtarla başlatır ve sonuçları döndürür."""
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(group.run, "test_fn", key, fn) for _ in range(callers)]
+        return [future.result(timeout=5) for future in futures]
+
+
+def test_concurrent_callers_share_one_computation():
+    """Lider hesaplarken gelen çağrılar aynı sonucu bekler."""
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return {"total": 42}
+
+    before = SINGLEFLIGHT_CALLS_TOTAL.values().get(("test_fn", "coalesced"), 0)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(group.run, "test_fn", (1, 7), compute)
+        started.wait(timeout=5)
+        followers = [pool.submit(group.run, "test_fn", (1, 7), compute) for _ in range(4)]
+        # Takipçiler beklemeye başlasın, sonra lideri serbest bırak
+        while SINGLEFLIGHT_CALLS_TOTAL.values().get(("test_fn", "coalesced"), 0) < before + 4:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result(timeout=5)] + [f.result(timeout=5) for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    """Farklı kullanıcı/sürüm anahtarları birleştirilmez."""
+    group = SingleFlight()
+    assert group.run("test_fn", (1, 1), lambda: "a") == "a"
+    assert group.run("test_fn", (1, 2), lambda: "b") == "b"
+    # Tamamlanmış hesaplama saklanmaz; aynı anahtar tekrar çalışır
+    assert group.run("test_fn", (1, 1), lambda: "c") == "c"
+
+
+def test_errors_propagate_and_are_not_cached():
+    """Liderin hatası çağırana iletilir; sonraki çağrı yeniden hesaplar."""
+    group = SingleFlight()
+
+    def fail():
+        raise ValueError("hesaplama hatası")
+
+    with pytest.raises(ValueError):
+        group.run("test_fn", (1, 1), fail)
+    assert _run_concurrently(group, (1, 1), lambda: 5, callers=3) == [5, 5, 5]
@@ -0,0 +1,163 @@
+"""
+Günlük Anlık Görüntü Testleri
+==============================
+Anlık görüntü oluşturma, yazma işlemlerinde geçersiz kılma, tutarlılık
+kontrolü ve anlık görüntüden başlayan geçmiş hesapları.
+"""
+
+import time
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.services.history_service import portfolio_history
+from app.services.snapshot_service import (
+    SnapshotScheduler,
+    build_snapshots,
+    check_snapshots,
+    encode_positions,
+    load_transactions,
+    positions_as_of,
+    rebuild_snapshots,
+    replay,
+)
+from tests.conftest import trade
+
+TODAY = date(2024, 6, 10)
+
+
+def _seed(client: TestClient) -> int:
+    trade(client, "THYAO", "BUY", 10, 100, "2024-06-03T10:00:00", commission=1.5)
+    trade(client, "ASELS", "BUY", 4, 50, "2024-06-03T14:00:00", commission=1.5)
+    trade(client, "THYAO", "SELL", 5, 110, "2024-06-05T11:00:00", commission=1.5)
+    trade(client, "THYAO", "BUY", 2, 105, "2024-06-10T09:00:00", commission=1.5)  # bugün: anlık görüntü yok
+    return client.get("/api/auth/me").json()["id"]
+
+
+def _snapshot_days(db, user_id: int):
+    return list(db.execute(
+        select(PortfolioSnapshot.snapshot_date)
+        .where(PortfolioSnapshot.user_id == user_id)
+        .order_by(PortfolioSnapshot.snapshot_date)
+    ).scalars())
+
+
+def test_build_writes_completed_trading_days(authenticated_client: TestClient, db_session):
+    """İşlem yapılan ve tamamlanmış her gün için tek anlık görüntü yazılır."""
+    user_id = _seed(authenticated_client)
+    assert build_snapshots(db_session, user_id, today=TODAY) == 2
+    assert _snapshot_days(db_session, user_id) == [date(2024, 6, 3), date(2024, 6, 5)]
+    assert check_snapshots(db_session, user_id) == []
+    # Artımlı: yeni gün yoksa bir şey yazılmaz
+    assert build_snapshots(db_session, user_id, today=TODAY) == 0
+    assert build_snapshots(db_session, user_id, today=date(2024, 6, 11)) == 1
+
+    # Anlık görüntüden başlayan hesap tam oynatmayla aynı
+    as_of = datetime(2024, 6, 10, 12)
+    full = replay({}, load_transactions(db_session, user_id, until=as_of))
+    assert positions_as_of(db_session, user_id, as_of) == full
+    assert positions_as_of(db_session, user_id, datetime(2024, 6, 4))["THYAO"].quantity == 10
+    assert positions_as_of(db_session, user_id, datetime(2024, 6, 2)) == {}
+
+
+def test_writes_invalidate_from_transaction_day(authenticated_client: TestClient, db_session):
+    """Geçmişe dönük yazma, o günden itibaren anlık görüntüleri siler."""
+    user_id = _seed(authenticated_client)
+    build_snapshots(db_session, user_id, today=TODAY)
+
+    # 4 Haziran'a geriye dönük işlem: 5 Haziran anlık görüntüsü geçersiz
+    backdated = trade(authenticated_client, "SISE", "BUY", 100, 40, "2024-06-04T10:00:00", commission=1.5)
+    db_session.expire_all()
+    assert _snapshot_days(db_session, user_id) == [date(2024, 6, 3)]
+
+    # Tarihi güncellemek eski ve yeni günün küçüğünden itibaren siler
+    build_snapshots(db_session, user_id, today=TODAY)
+    authenticated_client.put(
+        f"/api/transactions/{backdated}", json={"transaction_date": "2024-06-01T10:00:00"}
+    )
+    db_session.expire_all()
+    assert _snapshot_days(db_session, user_id) == []
+
+    build_snapshots(db_session, user_id, today=TODAY)
+    authenticated_client.delete(f"/api/transactions/{backdated}")
+    db_session.expire_all()
+    assert _snapshot_days(db_session, user_id) == []
+    assert build_snapshots(db_session, user_id, today=TODAY) == 2
+    assert check_snapshots(db_session, user_id) == []
+
+
+def test_checker_detects_drift_and_rebuild_fixes(authenticated_client: TestClient, db_session):
+    """Tam oynatmayla uyuşmayan anlık görüntüler raporlanır; rebuild düzeltir."""
+    user_id = _seed(authenticated_client)
+    build_snapshots(db_session, user_id, today=TODAY)
+
+    positions = positions_as_of(db_session, user_id, datetime(2024, 6, 3, 23))
+    positions["THYAO"].buy_quantity += 1
+    db_session.execute(
+        update(PortfolioSnapshot)
+        .where(PortfolioSnapshot.snapshot_date == date(2024, 6, 3))
+        .values(positions=encode_positions(positions))
+    )
+    db_session.commit()
+    assert check_snapshots(db_session, user_id) == ["2024-06-03: THYAO.buy_quantity: 11.0 != 10.0"]
+
+    assert rebuild_snapshots(db_session, user_id, today=TODAY) == 2
+    assert check_snapshots(db_session, user_id) == []
+
+
+def test_stale_build_is_discarded(authenticated_client: TestClient, db_session):
+    """Okuma ile commit arasında veri sürümü değişirse hiçbir şey yazılmaz."""
+    user_id = _seed(authenticated_client)
+    from app.services import snapshot_service
+
+    original = snapshot_service.load_transactions
+
+    def racing_load(db, *args, **kwargs):
+        rows = original(db, *args, **kwargs)
+        # Oluşturma sırasında başka bir oturum yazma yapar
+        trade(authenticated_client, "KCHOL", "BUY", 1, 150, "2024-06-07T10:00:00", commission=1.5)
+        return rows
+
+    snapshot_service.load_transactions = racing_load
+    try:
+        assert build_snapshots(db_session, user_id, today=TODAY) == 0
+    finally:
+        snapshot_service.load_transactions = original
+    assert _snapshot_days(db_session, user_id) == []
+
+
+def test_scheduler_debounces_builds(authenticated_client: TestClient, db_session, db_engine):
+    """Art arda yazmalar tek bir ertelenmiş oluşturmaya dönüşür."""
+    user_id = _seed(authenticated_client)
+    scheduler = SnapshotScheduler(0.05)
+    calls = []
+    from app.services import snapshot_service
+
+    original = snapshot_service.build_snapshots
+    snapshot_service.build_snapshots = lambda db, uid: calls.append(uid) or original(db, uid, TODAY)
+    try:
+        for _ in range(5):
+            scheduler.schedule(db_engine, user_id)
+        time.sleep(0.3)
+    finally:
+        snapshot_service.build_snapshots = original
+    assert calls == [user_id]
+    db_session.expire_all()
+    assert len(_snapshot_days(db_session, user_id)) == 2
+
+
+def test_history_chart_starts_from_snapshot(authenticated_client: TestClient, db_session, tmp_path):
+    """Grafik anlık görüntüden başlasa da tam oynatmayla aynı seriyi verir."""
+    from app.history_store import PriceHistoryStore
+
+    user_id = _seed(authenticated_client)
+    store = PriceHistoryStore(tmp_path)
+    now = datetime(2024, 6, 10, 12)
+    without = portfolio_history(db_session, user_id, "1G", now=now, store=store)
+
+    build_snapshots(db_session, user_id, today=TODAY)
+    with_snapshot = portfolio_history(db_session, user_id, "1G", now=now, store=store)
+    assert with_snapshot == without
+    assert with_snapshot["points"][-1]["value"] == 7 * 105 + 4 * 50
@@ -0,0 +1,131 @@
+"""
+Senkronizasyon Testleri
+========================
+Değişiklik akışı (GET /api/transactions/changes) ve aralık özetleri
+(GET /api/transactions/digests).
+"""
+
+import hashlib
+import json
+
+from fastapi.testclient import TestClient
+
+from app.services.sync_service import combine_digests
+
+
+def _changes(client: TestClient, since: int = 0, limit: int = 500) -> dict:
+    response = client.get(f"/api/transactions/changes?since={since}&limit={limit}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_change_feed_reports_inserts_updates_and_deletes(
+    authenticated_client: TestClient, test_transaction_data
+):
+    """Her işlem için son değişiklik döner; silmeler tombstone olarak kalır."""
+    first = authenticated_client.post("/api/transactions/", json=test_transaction_data).json()
+    second = authenticated_client.post("/api/transactions/", json=test_transaction_data).json()
+
+    feed = _changes(authenticated_client)
+    assert [(c["seq"], c["op"]) for c in feed["changes"]] == [(1, "insert"), (2, "insert")]
+    assert feed["next_since"] == 2 and feed["data_version"] == 2
+
+    authenticated_client.put(f"/api/transactions/{first['id']}", json={"quantity": 7})
+    authenticated_client.delete(f"/api/transactions/{second['id']}")
+
+    feed = _changes(authenticated_client, since=2)
+    assert [(c["transaction_id"], c["op"]) for c in feed["changes"]] == [
+        (first["id"], "update"),
+        (second["id"], "delete"),
+    ]
+    assert feed["changes"][0]["transaction"]["quantity"] == 7
+    assert feed["changes"][1]["transaction"] is None
+
+    # Baştan senkronize eden istemci her işlemi bir kez görür
+    assert len(_changes(authenticated_client)["changes"]) == 2
+
+
+def test_change_feed_pages_by_sequence(authenticated_client: TestClient, test_transaction_data):
+    """limit aşıldığında has_more ile sonraki sayfa next_since'ten istenir."""
+    for _ in range(3):
+        authenticated_client.post("/api/transactions/", json=test_transaction_data)
+
+    page = _changes(authenticated_client, limit=2)
+    assert page["has_more"] is True
+    assert [c["seq"] for c in page["changes"]] == [1, 2]
+
+    page = _changes(authenticated_client, since=page["next_since"], limit=2)
+    assert page["has_more"] is False
+    assert [c["seq"] for c in page["changes"]] == [3]
+
+    empty = _changes(authenticated_client, since=3)
+    assert empty["changes"] == [] and empty["next_since"] == 3
+
+
+def test_change_feed_is_not_shadowed_by_detail_route(authenticated_client: TestClient):
+    """/changes, /{transaction_id} rotasıyla çakışmaz."""
+    response = authenticated_client.get("/api/transactions/changes")
+    assert response.status_code == 200
+    assert response.json()["changes"] == []
+
+
+def _add(client: TestClient, day: str, quantity: float = 1):
+    return client.post("/api/transactions/", json={
+        "stock_symbol": "THYAO",
+        "stock_name": "Türk Hava Yolları",
+        "transaction_type": "BUY",
+        "quantity": quantity,
+        "price_per_unit": 245.5,
+        "transaction_date": f"{day}T10:00:00",
+    }).json()
+
+
+def _canonical_digest(transaction: dict) -> str:
+    """İstemci tarafı satır özeti (masaüstü istemcisindeki ile aynı)."""
+    canonical = json.dumps(transaction, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def test_digest_tree_drills_down(authenticated_client: TestClient):
+    """Ay → gün → satır özetleri birbiriyle tutarlıdır."""
+    _add(authenticated_client, "2024-01-02")
+    second = _add(authenticated_client, "2024-01-02")
+    _add(authenticated_client, "2024-02-10")
+
+    root = authenticated_client.get("/api/transactions/digests").json()
+    assert root["level"] == "month" and root["count"] == 3
+    assert [(b["key"], b["count"]) for b in root["buckets"]] == [("2024-01", 2), ("2024-02", 1)]
+    assert root["digest"] == combine_digests(b["digest"] for b in root["buckets"])
+
+    january = authenticated_client.get("/api/transactions/digests?month=2024-01").json()
+    assert january["digest"] == root["buckets"][0]["digest"]
+    assert [b["key"] for b in january["buckets"]] == ["2024-01-02"]
+
+    day = authenticated_client.get("/api/transactions/digests?day=2024-01-02").json()
+    assert day["level"] == "row"
+    assert day["digest"] == january["buckets"][0]["digest"]
+    assert day["buckets"][1]["key"] == str(second["id"])
+    # İstemci aynı satır özetini API yanıtından hesaplayabilir
+    detail = authenticated_client.get(f"/api/transactions/{second['id']}").json()
+    assert day["buckets"][1]["digest"] == _canonical_digest(detail)
+
+
+def test_digest_changes_only_in_modified_bucket(authenticated_client: TestClient):
+    """Bir işlemin güncellenmesi sadece kendi ayının özetini değiştirir."""
+    first = _add(authenticated_client, "2024-01-02")
+    _add(authenticated_client, "2024-02-10")
+    before = authenticated_client.get("/api/transactions/digests").json()
+
+    authenticated_client.put(f"/api/transactions/{first['id']}", json={"quantity": 3})
+    after = authenticated_client.get("/api/transactions/digests").json()
+
+    assert after["digest"] != before["digest"]
+    assert after["buckets"][0]["digest"] != before["buckets"][0]["digest"]
+    assert after["buckets"][1]["digest"] == before["buckets"][1]["digest"]
+
+
+def test_digest_rejects_ambiguous_scope(authenticated_client: TestClient):
+    """month ve day birlikte verilemez; ay formatı doğrulanır."""
+    both = authenticated_client.get("/api/transactions/digests?month=2024-01&day=2024-01-02")
+    assert both.status_code == 400
+    assert authenticated_client.get("/api/transactions/digests?month=2024-13").status_code == 422
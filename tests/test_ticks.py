@@ -0,0 +1,150 @@
+"""
+Fiyat Akışı Testleri
+=====================
+Tick ayrıştırma, OHLCV çubuk toplama, toplu yazım ve dosya / soket
+kaynakları.
+"""
+
+import socket
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.instrument_price import InstrumentPrice
+from app.models.price_bar import PriceBar
+from app.services.tick_service import (
+    BarAggregator,
+    FileTickSource,
+    SocketTickSource,
+    TickIngestor,
+    parse_ticks,
+)
+
+
+def _ts(hour: int, minute: int, second: int = 0) -> float:
+    return datetime(2024, 6, 14, hour, minute, second, tzinfo=timezone.utc).timestamp()
+
+
+def _lines(ticks) -> bytes:
+    return "".join(f"{s},{p},{v},{t}\n" for s, p, v, t in ticks).encode()
+
+
+def test_parse_ticks_skips_bad_lines():
+    """Hatalı satırlar atlanır, semboller büyük harfe çevrilir."""
+    ticks = parse_ticks([b"thyao,10.5,100,1718355600", b"bozuk", b"", b"ASELS,x,1,2"])
+    assert ticks == [("THYAO", 10.5, 100.0, 1718355600.0)]
+
+
+def test_aggregator_builds_ohlcv_bars():
+    """Tick'ler 1m / 1h / 1d çubuklarına toplanır."""
+    aggregator = BarAggregator()
+    aggregator.add([
+        ("THYAO", 10.0, 100, _ts(7, 0, 5)),
+        ("THYAO", 12.0, 50, _ts(7, 0, 30)),
+        ("THYAO", 9.0, 10, _ts(7, 0, 59)),
+        ("THYAO", 11.0, 40, _ts(7, 1, 0)),
+        # 21:30 UTC = 00:30 İstanbul: yeni işlem günü
+        ("THYAO", 13.0, 1, _ts(21, 30)),
+    ])
+    rows, last = aggregator.drain()
+    bars = {(r["interval"], r["bucket_start"]): r for r in rows}
+
+    minute = bars[("1m", datetime(2024, 6, 14, 7, 0))]
+    assert (minute["open"], minute["high"], minute["low"], minute["close"]) == (10, 12, 9, 9)
+    assert minute["volume"] == 160 and minute["tick_count"] == 3
+
+    hour = bars[("1h", datetime(2024, 6, 14, 7, 0))]
+    assert (hour["close"], hour["tick_count"]) == (11, 4)
+
+    # Günlük çubuklar İstanbul gece yarısında (21:00 UTC) başlar
+    day = bars[("1d", datetime(2024, 6, 13, 21, 0))]
+    assert (day["open"], day["high"], day["low"], day["close"]) == (10, 12, 9, 11)
+    assert bars[("1d", datetime(2024, 6, 14, 21, 0))]["close"] == 13
+
+    assert last["THYAO"] == (13.0, datetime(2024, 6, 14, 21, 30))
+    assert len(aggregator) == 0
+
+
+def test_ingestor_merges_partial_bars(db_engine, tmp_path):
+    """Farklı yazımlardaki kısmi çubuklar veritabanında birleştirilir."""
+    session_factory = sessionmaker(bind=db_engine)
+    feed = tmp_path / "ticks.csv"
+    feed.write_bytes(_lines([
+        ("THYAO", 10.0, 100, _ts(7, 0, 5)),
+        ("ASELS", 40.0, 10, _ts(7, 0, 6)),
+    ]))
+    TickIngestor(session_factory).run(FileTickSource(feed))
+
+    feed.write_bytes(_lines([
+        ("THYAO", 12.0, 50, _ts(7, 0, 30)),
+        ("THYAO", 9.0, 10, _ts(7, 0, 40)),
+    ]))
+    stats = TickIngestor(session_factory).run(FileTickSource(feed))
+    assert stats.ticks == 2 and stats.bars_written == 3
+
+    with session_factory() as db:
+        bar = db.get(PriceBar, ("THYAO", "1m", datetime(2024, 6, 14, 7, 0)))
+        assert (bar.open, bar.high, bar.low, bar.close) == (10, 12, 9, 9)
+        assert (bar.volume, bar.tick_count) == (160, 3)
+        assert db.query(PriceBar).count() == 6
+        # Son fiyatlar gün içi değerleme için güncellenir
+        assert db.get(InstrumentPrice, "THYAO").last_price == 9.0
+
+
+def test_out_of_order_ticks_follow_tick_time(db_engine, tmp_path):
+    """Geç gelen eski tick'ler open'ı düzeltir, close ve son fiyatı geri almaz."""
+    aggregator = BarAggregator()
+    aggregator.add([
+        ("THYAO", 101.0, 1, _ts(7, 0, 30)),
+        ("THYAO", 100.0, 1, _ts(7, 0, 10)),
+    ])
+    rows, last = aggregator.drain()
+    minute = next(r for r in rows if r["interval"] == "1m")
+    assert (minute["open"], minute["close"]) == (100, 101)
+    assert last["THYAO"] == (101.0, datetime(2024, 6, 14, 7, 0, 30))
+
+    session_factory = sessionmaker(bind=db_engine)
+    feed = tmp_path / "ticks.csv"
+    feed.write_bytes(_lines([("THYAO", 105.0, 1, _ts(7, 0, 50))]))
+    TickIngestor(session_factory).run(FileTickSource(feed))
+
+    # Eski bir dosyanın yeniden oynatılması
+    feed.write_bytes(_lines([
+        ("THYAO", 99.0, 1, _ts(7, 0, 5)),
+        ("THYAO", 98.0, 1, _ts(7, 0, 20)),
+    ]))
+    TickIngestor(session_factory).run(FileTickSource(feed))
+
+    with session_factory() as db:
+        bar = db.get(PriceBar, ("THYAO", "1m", datetime(2024, 6, 14, 7, 0)))
+        assert (bar.open, bar.high, bar.low, bar.close) == (99, 105, 98, 105)
+        assert bar.open_time == datetime(2024, 6, 14, 7, 0, 5)
+        assert bar.close_time == datetime(2024, 6, 14, 7, 0, 50)
+        price = db.get(InstrumentPrice, "THYAO")
+        assert (price.last_price, price.price_time) == (105.0, datetime(2024, 6, 14, 7, 0, 50))
+
+
+def test_socket_source(db_engine):
+    """Tick'ler TCP bağlantısından okunur; satırlar parçalara bölünebilir."""
+    payload = _lines([("SISE", 48.0 + i / 100, 1, _ts(8, 0, i)) for i in range(50)])
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            # Satır sınırına denk gelmeyen parçalar halinde gönder
+            for start in range(0, len(payload), 37):
+                conn.sendall(payload[start:start + 37])
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ingestor = TickIngestor(sessionmaker(bind=db_engine), queue_size=1, update_prices=False)
+    stats = ingestor.run(SocketTickSource("127.0.0.1", port, timeout=5))
+
+    assert stats.ticks == 50
+    with sessionmaker(bind=db_engine)() as db:
+        bar = db.get(PriceBar, ("SISE", "1m", datetime(2024, 6, 14, 8, 0)))
+        assert bar.tick_count == 50 and bar.close == 48.49
+        assert db.get(InstrumentPrice, "SISE") is None
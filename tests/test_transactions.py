@@ -8,25 +8,6 @@ import pytest
 from fastapi.testclient import TestClient
 
 
-@pytest.fixture
-def authenticated_client(client: TestClient, test_user_data):
-    """Giriş yapılmış test client'ı."""
-    # Kullanıcı oluştur ve giriş yap
-    client.post("/api/auth/register", json=test_user_data)
-    
-    login_response = client.post(
-        "/api/auth/login",
-        data={
-            "username": test_user_data["email"],
-            "password": test_user_data["password"]
-        }
-    )
-    
-    token = login_response.json()["access_token"]
-    client.headers = {"Authorization": f"Bearer {token}"}
-    return client
-
-
 def test_create_transaction(authenticated_client: TestClient, test_transaction_data):
     """Yeni işlem oluştur."""
     response = authenticated_client.post(